@@ -0,0 +1,135 @@
+import asyncio
+import io
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+# Categories, genres, title list and detail, review and comment lists.
+PUBLIC_READS = re.compile(
+    r'^/api/v1/(categories/|genres/|titles/(\d+/)?'
+    r'|titles/\d+/reviews/(\d+/comments/)?)$')
+READ_METHODS = ('GET', 'HEAD')
+
+
+def is_public_read(scope):
+    return (scope['method'] in READ_METHODS
+            and PUBLIC_READS.match(scope['path']) is not None)
+
+
+def build_environ(scope, body):
+    """Translate an ASGI HTTP scope into a WSGI environ."""
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', ''),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1] or 80),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': (scope.get('client') or ('', 0))[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', ()):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            name = f'HTTP_{name}'
+        if name in environ:
+            value = f'{environ[name]},{value}'
+        environ[name] = value
+    return environ
+
+
+class ASGIHandler:
+    """Serve the Django 2.2 WSGI application to an ASGI server.
+
+    The event loop only accepts connections and moves bytes, so a slow
+    or idle client costs a coroutine instead of a worker. Views are
+    blocking ORM code and run in bounded thread pools: public reads get
+    ``ASGI_READ_THREADS`` of their own, everything else shares
+    ``ASGI_THREADS``, so writes and the admin cannot starve the
+    catalogue. Each pool thread keeps its own persistent database
+    connection.
+    """
+
+    def __init__(self, wsgi_application):
+        self.wsgi_application = wsgi_application
+        self.read_pool = ThreadPoolExecutor(
+            settings.ASGI_READ_THREADS, thread_name_prefix='asgi-read')
+        self.pool = ThreadPoolExecutor(
+            settings.ASGI_THREADS, thread_name_prefix='asgi')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self.http(scope, receive, send)
+        else:
+            raise ValueError(f"Unsupported ASGI scope {scope['type']}")
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.read_pool.shutdown(wait=True)
+                self.pool.shutdown(wait=True)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def read_body(self, receive):
+        chunks = []
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return None
+            chunks.append(message.get('body', b''))
+            if not message.get('more_body'):
+                return b''.join(chunks)
+
+    async def http(self, scope, receive, send):
+        body = await self.read_body(receive)
+        if body is None:
+            return
+        pool = self.read_pool if is_public_read(scope) else self.pool
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            pool, self.run_wsgi, build_environ(scope, body), send, loop)
+
+    def run_wsgi(self, environ, send, loop):
+        """Run the WSGI application in a pool thread, streaming its output."""
+        def send_sync(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        started = {}
+
+        def start_response(status, headers, exc_info=None):
+            started['start'] = {
+                'type': 'http.response.start',
+                'status': int(status.split(' ', 1)[0]),
+                'headers': [(name.lower().encode('latin-1'),
+                             value.encode('latin-1'))
+                            for name, value in headers],
+            }
+
+        response = self.wsgi_application(environ, start_response)
+        try:
+            send_sync(started.pop('start'))
+            for chunk in response:
+                if chunk:
+                    send_sync({'type': 'http.response.body', 'body': chunk,
+                               'more_body': True})
+            send_sync({'type': 'http.response.body', 'body': b''})
+        finally:
+            if hasattr(response, 'close'):
+                response.close()
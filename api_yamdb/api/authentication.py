@@ -0,0 +1,115 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (AuthenticationFailed,
+                                                 InvalidToken)
+from rest_framework_simplejwt.settings import api_settings
+from reviews.models import User
+from reviews.versions import bump_instance_version, get_instance_version
+
+from .metrics import USER_CACHE_LOOKUPS
+
+# The password hash stays out of the cache; it is loaded on access.
+SNAPSHOT_FIELDS = tuple(field.attname for field in User._meta.concrete_fields
+                        if field.attname != 'password')
+
+
+class UserCache:
+    """Bounded LRU of user snapshots that expire after ``timeout`` seconds.
+
+    Every entry remembers the shared version of its user. A snapshot is
+    served only while that version is unchanged, so a user saved in one
+    worker is reloaded in all of them on their next request.
+    """
+
+    def __init__(self, maxsize, timeout):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, pk, version):
+        with self.lock:
+            entry = self.entries.get(pk)
+            if (entry is None or entry[0] != version
+                    or entry[1] < time.monotonic()):
+                self.misses += 1
+                return None
+            self.entries.move_to_end(pk)
+            self.hits += 1
+            return entry[2]
+
+    def set(self, pk, version, values):
+        with self.lock:
+            self.entries[pk] = (
+                version, time.monotonic() + self.timeout, values)
+            self.entries.move_to_end(pk)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, pk):
+        with self.lock:
+            self.entries.pop(pk, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'size': len(self.entries)}
+
+
+user_cache = UserCache(settings.USER_CACHE_SIZE, settings.USER_CACHE_TIMEOUT)
+
+
+def invalidate_user(pk):
+    """Drop ``pk`` from the user cache of every worker."""
+    bump_instance_version(User, pk)
+    user_cache.invalidate(pk)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """``JWTAuthentication`` that does not query the user on every request.
+
+    Users are kept in the per-process ``user_cache`` and rebuilt from the
+    snapshot with ``from_db()``, so each request still gets its own
+    instance. ``reviews.User`` saves and deletes invalidate the entry
+    (see ``api/signals.py``); queryset ``update()`` calls must call
+    ``invalidate_user()`` themselves.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            pk = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _('Token contained no recognizable user identification'))
+
+        version = get_instance_version(User, pk)
+        values = user_cache.get(pk, version)
+        USER_CACHE_LOOKUPS.labels('miss' if values is None else 'hit').inc()
+        if values is None:
+            # From the primary: a lagging replica would cache the old
+            # row under the new version.
+            values = (User.objects.using(DEFAULT_DB_ALIAS).filter(pk=pk)
+                      .values_list(*SNAPSHOT_FIELDS).first())
+            if values is None:
+                raise AuthenticationFailed(
+                    _('User not found'), code='user_not_found')
+            user_cache.set(pk, version, values)
+
+        user = User.from_db(DEFAULT_DB_ALIAS, SNAPSHOT_FIELDS, values)
+        if not user.is_active:
+            raise AuthenticationFailed(
+                _('User is inactive'), code='user_inactive')
+        return user
@@ -0,0 +1,84 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+from reviews.versions import get_versions
+
+from .replicas import use_primary, written_recently
+
+CACHE_HEADER = 'X-Cache'
+
+
+def get_role(user):
+    if not user.is_authenticated:
+        return 'anonymous'
+    if user.is_superuser:
+        return 'superuser'
+    return user.role
+
+
+class ResponseCacheMixin:
+    """Cache the GET responses of read actions.
+
+    The cache key covers the host, path, query string and role of the
+    user, plus the current versions of ``cache_dependencies``; any write
+    to one of those models moves readers to a fresh key. Entries are
+    served for ``RESPONSE_CACHE_TIMEOUT`` seconds and then, for another
+    ``RESPONSE_CACHE_STALE_TIMEOUT`` seconds, served stale to everyone
+    but the single request that refreshes them.
+    """
+    cache_dependencies = ()
+
+    def get_response_cache_key(self, request, versions):
+        params = sorted(request.query_params.lists())
+        raw = '|'.join(map(str, (
+            request.get_host(), request.path, params,
+            get_role(request.user), versions)))
+        return 'response:' + hashlib.md5(raw.encode()).hexdigest()
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        versions = get_versions(*self.cache_dependencies)
+        key = self.get_response_cache_key(request, versions)
+        entry = cache.get(key)
+        now = time.time()
+        if entry is not None:
+            data, fresh_until = entry
+            if now < fresh_until:
+                return self.cache_hit(data, 'HIT')
+            lock_timeout = settings.RESPONSE_CACHE_STALE_TIMEOUT
+            if not cache.add(key + ':refresh', 1, timeout=lock_timeout):
+                return self.cache_hit(data, 'STALE')
+
+        if written_recently(versions):
+            # A lagging replica could miss the write this key is for.
+            use_primary()
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            fresh = settings.RESPONSE_CACHE_TIMEOUT
+            stale = settings.RESPONSE_CACHE_STALE_TIMEOUT
+            cache.set(key, (response.data, now + fresh),
+                      timeout=fresh + stale)
+            cache.delete(key + ':refresh')
+        response[CACHE_HEADER] = 'MISS'
+        return response
+
+    def cache_hit(self, data, state):
+        response = Response(data)
+        response[CACHE_HEADER] = state
+        return response
+
+
+class CachedListMixin(ResponseCacheMixin):
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+
+class CachedRetrieveMixin(ResponseCacheMixin):
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,72 @@
+import json
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils import timezone
+
+# Only these bodies are captured; others are replayed without a body.
+TEXT_CONTENT_TYPES = ('application/json',
+                      'application/x-www-form-urlencoded')
+
+
+class TrafficCaptureMiddleware:
+    """Append a sample of incoming requests to a JSONL capture file.
+
+    Off unless ``TRAFFIC_CAPTURE_FILE`` is set. Each line holds what
+    ``replay_traffic`` needs to send the request again: method, path,
+    query string, body and the id of the authenticated user (never the
+    token). Paths under ``TRAFFIC_CAPTURE_EXCLUDE`` are not recorded, so
+    confirmation codes and admin sessions stay out of the file.
+    """
+
+    def __init__(self, get_response):
+        if not settings.TRAFFIC_CAPTURE_FILE:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.path = settings.TRAFFIC_CAPTURE_FILE
+        self.rate = settings.TRAFFIC_CAPTURE_RATE
+        self.lock = threading.Lock()
+
+    def should_capture(self, request):
+        return (random.random() < self.rate
+                and not request.path.startswith(
+                    tuple(settings.TRAFFIC_CAPTURE_EXCLUDE)))
+
+    def get_body(self, request):
+        content_type = request.content_type or ''
+        length = int(request.META.get('CONTENT_LENGTH') or 0)
+        if (not length or length > settings.TRAFFIC_CAPTURE_MAX_BODY
+                or not content_type.startswith(TEXT_CONTENT_TYPES)):
+            return ''
+        # Reading request.body here keeps it readable for the view.
+        return request.body.decode('utf-8', errors='replace')
+
+    def __call__(self, request):
+        if not self.should_capture(request):
+            return self.get_response(request)
+
+        body = self.get_body(request)
+        started = time.perf_counter()
+        response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        # DRF stores the user it authenticated on the Django request.
+        user = getattr(request, 'user', None)
+        record = {
+            'time': timezone.now().isoformat(),
+            'method': request.method,
+            'path': request.path,
+            'query': request.META.get('QUERY_STRING', ''),
+            'content_type': request.content_type if body else '',
+            'body': body,
+            'user_id': user.pk if user is not None else None,
+            'status': response.status_code,
+            'duration_ms': round(duration * 1000, 3),
+        }
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self.lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line)
+        return response
@@ -0,0 +1,67 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def modified_at(model, **lookups):
+    """Return the ``modified`` timestamp of the ``model`` row ``lookups`` find.
+
+    Malformed lookup values, such as a non-numeric id from the URL, fail
+    when the filter is built; they give ``None`` as well, so the regular
+    handler answers 404.
+    """
+    try:
+        return (model.objects.filter(**lookups).order_by()
+                .values_list('modified', flat=True).first())
+    except (TypeError, ValueError):
+        return None
+
+
+class ConditionalGetMixin:
+    """Answer unchanged GETs with ``304 Not Modified``.
+
+    Viewsets implement ``get_last_modified()`` as a cheap lookup of the
+    change-tracking timestamp that covers the requested resource, and
+    may add more validator inputs in ``get_etag_extra()``. The lookup
+    runs before the queryset and serializers; ``None`` means the
+    resource does not exist and the regular handler answers.
+    """
+
+    def get_last_modified(self):
+        raise NotImplementedError
+
+    def get_etag_extra(self):
+        return ()
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        last_modified = self.get_last_modified()
+        if last_modified is None:
+            return handler(request, *args, **kwargs)
+
+        raw = repr((request.get_full_path(), last_modified.isoformat(),
+                    self.get_etag_extra()))
+        etag = quote_etag(hashlib.md5(raw.encode()).hexdigest())
+        timestamp = int(last_modified.timestamp())
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(timestamp)
+        return response
+
+
+class ConditionalListMixin(ConditionalGetMixin):
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs)
+
+
+class ConditionalRetrieveMixin(ConditionalGetMixin):
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,44 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.signals import request_finished, request_started
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+def check_connections(**kwargs):
+    """Ping the persistent connections this thread is about to reuse.
+
+    Django (before 4.1) hands a kept connection to the next request as
+    is, so one dropped by the server, a proxy or a failover fails that
+    request. Connections idle for ``CONN_HEALTH_CHECK_IDLE`` seconds or
+    more are checked with ``SELECT 1`` and closed when dead; the first
+    query then opens a fresh one. Connections past ``CONN_MAX_AGE`` are
+    already closed by Django's own ``close_old_connections``.
+    """
+    now = time.monotonic()
+    for connection in connections.all():
+        if connection.connection is None:
+            continue
+        released_at = getattr(connection, 'released_at', None)
+        if (released_at is not None
+                and now - released_at < settings.CONN_HEALTH_CHECK_IDLE):
+            continue
+        if not connection.is_usable():
+            logger.info('Dropping dead connection to %s', connection.alias)
+            connection.close()
+
+
+def mark_released(**kwargs):
+    now = time.monotonic()
+    for connection in connections.all():
+        if connection.connection is not None:
+            connection.released_at = now
+
+
+# Connected after django.db's close_old_connections, so expired
+# connections are gone before the survivors are checked.
+request_started.connect(check_connections)
+request_finished.connect(mark_released)
@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.urls import reverse
+from jobs.queue import enqueue
+from rest_framework import status
+from rest_framework.response import Response
+from reviews.deletion import DELETERS, is_large
+
+from .serializers import JobSerializer
+
+
+class BulkDestroyMixin:
+    """Delete with ``reviews.deletion`` instead of Django's collector.
+
+    The collector loads every review and comment of the object before
+    deleting them. Here they go in chunked DELETEs: right away when
+    there are few, otherwise in a ``bulk_delete`` job, answered with
+    ``202 Accepted`` and the job to poll. ``BULK_DELETE = False``
+    switches back to the collector.
+    """
+
+    def destroy(self, request, *args, **kwargs):
+        if not settings.BULK_DELETE:
+            return super().destroy(request, *args, **kwargs)
+        instance = self.get_object()
+        model = type(instance)
+        if not is_large(model, instance.pk):
+            DELETERS[model](instance.pk)
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        job = enqueue('bulk_delete', model=model._meta.label_lower,
+                      pk=instance.pk)
+        url = request.build_absolute_uri(
+            reverse('api:job-detail', kwargs={'pk': job.pk}))
+        return Response(JobSerializer(job).data,
+                        status=status.HTTP_202_ACCEPTED,
+                        headers={'Location': url})
@@ -0,0 +1,77 @@
+from functools import partial
+
+from django.core.cache import cache
+from django.db.models import F
+from django_filters import ChoiceFilter, MultipleChoiceFilter, OrderingFilter
+from django_filters.constants import EMPTY_VALUES
+from reviews.versions import get_versions
+
+SLUG_CHOICES_KEY = 'slug-choices:{}:{}'
+
+
+def get_slug_choices(model):
+    """Return ``(slug, slug)`` choices for every row of ``model``.
+
+    The list is cached under the model version, so it is rebuilt once
+    after each write to the model instead of on every request.
+    """
+    key = SLUG_CHOICES_KEY.format(
+        model._meta.label_lower, *get_versions(model))
+    choices = cache.get(key)
+    if choices is None:
+        slugs = model._default_manager.order_by('slug').values_list(
+            'slug', flat=True)
+        choices = [(slug, slug) for slug in slugs]
+        cache.set(key, choices)
+    return choices
+
+
+class SlugChoicesMixin:
+    """Validate filter values against the slugs of ``choices_model``.
+
+    Choices are passed to the form field as a callable, which Django only
+    evaluates when a value has to be validated, so requests that do not
+    use the filter never build the choice list.
+    """
+
+    def __init__(self, *args, choices_model, **kwargs):
+        self.choices_model = choices_model
+        super().__init__(*args, **kwargs)
+
+    @property
+    def field(self):
+        self.extra['choices'] = partial(get_slug_choices, self.choices_model)
+        return super().field
+
+
+class SlugChoiceFilter(SlugChoicesMixin, ChoiceFilter):
+    pass
+
+
+class SlugMultipleChoiceFilter(SlugChoicesMixin, MultipleChoiceFilter):
+    pass
+
+
+class IndexedOrderingFilter(OrderingFilter):
+    """``OrderingFilter`` that keeps to the ``(field, id)`` indexes.
+
+    The primary key breaks ties in the direction of the last parameter,
+    so pages never overlap and both directions read one index. Rows with
+    a NULL value go last whichever way a nullable field is sorted.
+    """
+
+    def get_ordering_value(self, param):
+        descending = param.startswith('-')
+        name = self.param_map[param.lstrip('-')]
+        if not self.model._meta.get_field(name).null:
+            return f'-{name}' if descending else name
+        if descending:
+            return F(name).desc(nulls_last=True)
+        return F(name).asc(nulls_last=True)
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        ordering = [self.get_ordering_value(param) for param in value]
+        ordering.append('-pk' if value[-1].startswith('-') else 'pk')
+        return qs.order_by(*ordering)
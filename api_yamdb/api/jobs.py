@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from jobs.queue import job
+
+
+@job('send_confirmation_email', batch=True)
+def send_confirmation_emails(payloads):
+    messages = [
+        EmailMessage('Confirmation code',
+                     (f"User {payload['username']}!"
+                      f"Your confirmation code is {payload['code']}"),
+                     settings.EMAIL_SENDER, [payload['email'], ])
+        for payload in payloads
+    ]
+    with get_connection() as connection:
+        connection.send_messages(messages)
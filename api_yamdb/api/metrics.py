@@ -0,0 +1,114 @@
+import os
+import time
+from contextlib import ExitStack
+
+from django.db import connections
+from django.http import HttpResponse
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY,
+                               CollectorRegistry, Counter, Histogram,
+                               generate_latest, multiprocess)
+
+# With PROMETHEUS_MULTIPROC_DIR set (see the Dockerfile) every gunicorn
+# worker writes its samples to mmap files in that directory and the
+# /metrics view sums them up, whichever worker serves the scrape.
+MULTIPROCESS = ('PROMETHEUS_MULTIPROC_DIR' in os.environ
+                or 'prometheus_multiproc_dir' in os.environ)
+
+LABELS = ('view', 'method', 'status')
+
+REQUEST_DURATION = Histogram(
+    'yamdb_http_request_duration_seconds',
+    'Time spent producing the response',
+    LABELS)
+DB_QUERIES = Histogram(
+    'yamdb_http_db_queries',
+    'Database queries run per request',
+    LABELS,
+    buckets=(0, 1, 2, 3, 4, 5, 8, 13, 21, 34, 55, 100, float('inf')))
+DB_DURATION = Histogram(
+    'yamdb_http_db_duration_seconds',
+    'Time spent in database queries per request',
+    LABELS)
+RESPONSE_SIZE = Histogram(
+    'yamdb_http_response_size_bytes',
+    'Size of non-streaming response bodies',
+    LABELS,
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304,
+             float('inf')))
+USER_CACHE_LOOKUPS = Counter(
+    'yamdb_user_cache_lookups',
+    'Authenticated user lookups by result of the per-process cache',
+    ('result',))
+
+
+def view_name(func, method):
+    """Return the ``TitleViewSet.list``-style name of a resolved view."""
+    cls = getattr(func, 'cls', None)
+    if cls is None:
+        return f'{func.__module__}.{func.__name__}'
+    action = getattr(func, 'actions', {}).get(method.lower())
+    if action is None:
+        return cls.__name__
+    return f'{cls.__name__}.{action}'
+
+
+def get_view_name(request):
+    match = request.resolver_match
+    if match is None:
+        return 'unmatched'
+    return view_name(match.func, request.method)
+
+
+class QueryCounter:
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+class MetricsMiddleware:
+    """Record latency, query count, query time and size of every response.
+
+    Samples are labelled by view, so ``TitleViewSet.list`` and
+    ``TitleViewSet.retrieve`` are told apart although both are ``GET``.
+    Streaming responses are timed up to their first byte and have no
+    size sample.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = QueryCounter()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(queries))
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        labels = (get_view_name(request), request.method,
+                  str(response.status_code))
+        REQUEST_DURATION.labels(*labels).observe(duration)
+        DB_QUERIES.labels(*labels).observe(queries.count)
+        DB_DURATION.labels(*labels).observe(queries.duration)
+        if not response.streaming:
+            RESPONSE_SIZE.labels(*labels).observe(len(response.content))
+        return response
+
+
+def metrics(request):
+    registry = REGISTRY
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return HttpResponse(generate_latest(registry),
+                        content_type=CONTENT_TYPE_LATEST)
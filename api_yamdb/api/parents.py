@@ -0,0 +1,20 @@
+from django.shortcuts import get_object_or_404
+
+
+class ParentObjectMixin:
+    """Resolve the object a nested route belongs to once per request.
+
+    ``parent_lookups`` maps lookups on ``parent_model`` to URL kwargs.
+    The view instance lives for a single request, so ``get_parent()``
+    is shared by the queryset, the conditional GET check, the create
+    hooks and the serializers (through ``context['view']``).
+    """
+    parent_model = None
+    parent_lookups = {}
+
+    def get_parent(self):
+        if not hasattr(self, '_parent'):
+            self._parent = get_object_or_404(self.parent_model, **{
+                lookup: self.kwargs[kwarg]
+                for lookup, kwarg in self.parent_lookups.items()})
+        return self._parent
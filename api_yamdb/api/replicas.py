@@ -0,0 +1,180 @@
+import logging
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.utils import DatabaseError
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PIN_KEY = 'db-pin:{}'
+
+# Routing decision of the request handled by the current thread.
+state = threading.local()
+
+# Seconds behind the primary, 0 when every received WAL is replayed.
+POSTGRES_LAG_SQL = (
+    'SELECT COALESCE(CASE WHEN pg_last_wal_receive_lsn() '
+    '= pg_last_wal_replay_lsn() THEN 0 ELSE EXTRACT(EPOCH FROM '
+    'now() - pg_last_xact_replay_timestamp()) END, 0)')
+
+
+class ReplicaHealth:
+    """Per-process record of which replicas answered their last check.
+
+    A replica is checked at most every ``REPLICA_CHECK_INTERVAL`` seconds;
+    it is healthy when it answers and, on PostgreSQL, lags less than
+    ``REPLICA_MAX_LAG`` seconds behind the primary.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checked = {}
+
+    def check(self, alias):
+        connection = connections[alias]
+        try:
+            with connection.cursor() as cursor:
+                if connection.vendor == 'postgresql':
+                    cursor.execute(POSTGRES_LAG_SQL)
+                    lag = cursor.fetchone()[0]
+                else:
+                    cursor.execute('SELECT 1')
+                    lag = 0
+        except DatabaseError as exc:
+            connection.close()
+            logger.warning('Replica %s is unavailable: %s', alias, exc)
+            return False
+        if lag > settings.REPLICA_MAX_LAG:
+            logger.warning('Replica %s lags %.1fs behind', alias, lag)
+            return False
+        return True
+
+    def is_healthy(self, alias):
+        now = time.monotonic()
+        with self.lock:
+            checked_at, healthy = self.checked.get(alias, (None, False))
+            if (checked_at is not None
+                    and now - checked_at < settings.REPLICA_CHECK_INTERVAL):
+                return healthy
+        healthy = self.check(alias)
+        with self.lock:
+            self.checked[alias] = (now, healthy)
+        return healthy
+
+    def reset(self):
+        with self.lock:
+            self.checked.clear()
+
+
+health = ReplicaHealth()
+
+
+def choose_replica():
+    healthy = [alias for alias in settings.DATABASE_REPLICAS
+               if health.is_healthy(alias)]
+    return random.choice(healthy) if healthy else DEFAULT_DB_ALIAS
+
+
+def use_primary():
+    """Send the remaining reads of the current request to the primary."""
+    state.alias = DEFAULT_DB_ALIAS
+
+
+def written_recently(versions):
+    """Tell whether any model version is younger than the replica lag.
+
+    Versions are the nanosecond timestamps of the last write, see
+    ``reviews.versions``.
+    """
+    horizon = time.time_ns() - settings.REPLICA_MAX_LAG * 10 ** 9
+    return any(version > horizon for version in versions)
+
+
+def token_user_id(request):
+    """Return the user id of the request's JWT without a database query."""
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = header and authentication.get_raw_token(header)
+    if not raw_token:
+        return None
+    try:
+        token = authentication.get_validated_token(raw_token)
+    except (InvalidToken, TokenError):
+        return None
+    return token.get(api_settings.USER_ID_CLAIM)
+
+
+def pin_to_primary(user_id):
+    cache.set(PIN_KEY.format(user_id), True,
+              timeout=settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned(request):
+    user_id = token_user_id(request)
+    return user_id is not None and cache.get(PIN_KEY.format(user_id))
+
+
+class ReplicaRouter:
+    """Send reads of safe API requests to a healthy replica.
+
+    Outside such requests (writes, the admin, management commands) every
+    query goes to the primary. A request reads from a single replica, so
+    its queries see one consistent snapshot.
+    """
+
+    def db_for_read(self, model, **hints):
+        if not getattr(state, 'use_replicas', False):
+            return DEFAULT_DB_ALIAS
+        if state.alias is None:
+            state.alias = choose_replica()
+        return state.alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
+
+
+class ReplicaRoutingMiddleware:
+    """Decide per request whether ``ReplicaRouter`` may use replicas.
+
+    After a successful write the author is pinned to the primary for
+    ``REPLICA_PIN_SECONDS``, so they read their own writes even while
+    the replicas catch up.
+    """
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state.alias = None
+        state.use_replicas = (request.method in SAFE_METHODS
+                              and request.path.startswith('/api/')
+                              and not is_pinned(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            state.use_replicas = False
+            state.alias = None
+
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            # DRF stores the user it authenticated on the Django request.
+            user = getattr(request, 'user', None)
+            if user is not None and user.is_authenticated:
+                pin_to_primary(user.pk)
+        return response
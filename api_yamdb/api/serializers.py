@@ -1,6 +1,8 @@
 import datetime as dt
 
-from django.shortcuts import get_object_or_404
+from django.conf import settings
+from django.db import IntegrityError
+from jobs.models import Job
 from rest_framework import serializers, validators
 from rest_framework.relations import SlugRelatedField
 from reviews.models import Category, Comment, Genre, Review, Title, User
@@ -45,14 +47,23 @@ class GenreSerializer(serializers.ModelSerializer):
 class TitleReadSerializer(serializers.ModelSerializer):
 
     rating = serializers.IntegerField(read_only=True)
+    # one score per review, so the rating counter counts the reviews
+    reviews_count = serializers.IntegerField(source='rating_count',
+                                             read_only=True)
     genre = GenreSerializer(many=True)
     category = CategorySerializer()
 
     class Meta:
-        fields = '__all__'
+        fields = ('id', 'name', 'year', 'rating', 'reviews_count',
+                  'description', 'genre', 'category')
         model = Title
 
 
+class LeaderboardSerializer(serializers.Serializer):
+    limit = serializers.IntegerField(
+        min_value=1, max_value=settings.LEADERBOARD_MAX_SIZE, default=10)
+
+
 class TitleWriteSerializer(serializers.ModelSerializer):
 
     rating = serializers.IntegerField(read_only=True)
@@ -65,7 +76,8 @@ class TitleWriteSerializer(serializers.ModelSerializer):
         queryset=Category.objects.all())
 
     class Meta:
-        fields = '__all__'
+        fields = ('id', 'name', 'year', 'rating', 'description',
+                  'genre', 'category')
         model = Title
 
     def validate_year(self, value):
@@ -156,22 +168,36 @@ class ReviewSerializer(serializers.ModelSerializer):
             'text',
             'author',
             'score',
-            'pub_date',)
+            'pub_date',
+            'comments_count',)
         model = Review
-        read_only_fields = ('pub_date',)
-
-    def validate(self, data):
-
-        if self.context['request'].method == 'POST':
-            title_id = self.context['view'].kwargs.get('title_id')
-            title = get_object_or_404(Title, pk=title_id)
-            author_slug = self.context['request'].user
-            author = get_object_or_404(User, username=author_slug)
-            if title.reviews.filter(author=author).exists():
-                raise validators.ValidationError(
-                    {'detail': 'Пользователь может создать только один отзыв '
-                               'для каждого произведения'})
-        return data
+        read_only_fields = ('pub_date', 'comments_count')
+
+    def create(self, validated_data):
+        # The only_one_author constraint rejects a second review of the
+        # same title, which saves a lookup on every successful POST.
+        try:
+            return super().create(validated_data)
+        except IntegrityError as error:
+            if not self.is_duplicate(error, validated_data):
+                raise
+            raise validators.ValidationError(
+                {'detail': 'Пользователь может создать только один отзыв '
+                           'для каждого произведения'})
+
+    def is_duplicate(self, error, validated_data):
+        """Whether ``error`` is the only_one_author constraint failing.
+
+        PostgreSQL names the constraint; elsewhere look for the review.
+        Any other failure, such as a title deleted meanwhile, is not a
+        duplicate.
+        """
+        diag = getattr(error.__cause__, 'diag', None)
+        if diag is not None:
+            return diag.constraint_name == 'only_one_author'
+        return Review.objects.filter(
+            title=validated_data['title'],
+            author=validated_data['author']).exists()
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -182,3 +208,10 @@ class CommentSerializer(serializers.ModelSerializer):
     class Meta:
         fields = ('id', 'text', 'author', 'pub_date')
         model = Comment
+
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        fields = ('id', 'name', 'status', 'attempts', 'last_error',
+                  'created', 'modified')
+        model = Job
@@ -0,0 +1,17 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from reviews.models import User
+
+from .authentication import invalidate_user
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_written(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
+    # Again after commit, in case another request cached the old row
+    # before this transaction finished.
+    transaction.on_commit(partial(invalidate_user, instance.pk))
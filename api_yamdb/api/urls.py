@@ -1,9 +1,9 @@
-from django.urls import include, path
+from django.urls import include, path, re_path
 from rest_framework.routers import DefaultRouter
 
 from .views import (CategoryViewSet, CommentViewSet, GenreViewSet,
-                    ReviewViewSet, TitleViewSet, UserViewSet, auth_signup,
-                    obtain_token)
+                    JobViewSet, ReviewViewSet, TitleViewSet, UserViewSet,
+                    auth_signup, export_table, obtain_token)
 
 app_name = 'api'
 
@@ -17,6 +17,7 @@ router.register(
 router.register('categories', CategoryViewSet)
 router.register('genres', GenreViewSet)
 router.register('titles', TitleViewSet)
+router.register('jobs', JobViewSet)
 router.register(
     r'titles/(?P<title_id>[\d]+)/reviews',
     ReviewViewSet,
@@ -30,4 +31,6 @@ auth_patterns = [
 urlpatterns = [
     path('v1/', include(router.urls)),
     path('v1/auth/', include(auth_patterns)),
+    re_path(r'^v1/export/(?P<table>titles|reviews|comments)'
+            r'\.(?P<file_format>ndjson|csv)$', export_table),
 ]
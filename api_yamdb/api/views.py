@@ -1,30 +1,46 @@
-from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db.models import Avg
-from django.shortcuts import get_object_or_404
-from django_filters import (AllValuesFilter, AllValuesMultipleFilter,
-                            FilterSet, NumberFilter)
+from django.http import StreamingHttpResponse
+from django_filters import CharFilter, FilterSet, NumberFilter
 from django_filters.rest_framework import DjangoFilterBackend
+from jobs.models import Job
+from jobs.queue import enqueue
 from rest_framework import filters, mixins, permissions, status, viewsets
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.exceptions import PermissionDenied
+from rest_framework.generics import get_object_or_404
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import (AllowAny, IsAuthenticated,
                                         IsAuthenticatedOrReadOnly)
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
+from reviews.export import FORMATS, export
 from reviews.models import Category, Comment, Genre, Review, Title, User
-
+from reviews.models.title import SCORE_BUCKETS
+from reviews.ratings import get_score_stats
+from reviews.search import search_titles
+from reviews.versions import get_versions
+
+from .cache import CachedListMixin, CachedRetrieveMixin
+from .conditional import (ConditionalListMixin, ConditionalRetrieveMixin,
+                          modified_at)
+from .deletion import BulkDestroyMixin
+from .filters import (IndexedOrderingFilter, SlugChoiceFilter,
+                      SlugMultipleChoiceFilter)
+from .pagination import PubDatePagination
+from .parents import ParentObjectMixin
 from .permissions import AccessToReview, AdminOrSuperUser
+from .rows import (ReviewRowsMixin, TitleGenres, TitleRowsMixin,
+                   leaderboard_row)
 from .serializers import (CategorySerializer, CommentSerializer,
                           GenreSerializer, GetTokenSerializer,
+                          JobSerializer, LeaderboardSerializer,
                           ReviewSerializer, TitleReadSerializer,
                           TitleWriteSerializer, UserProfileSerializer,
                           UserSerializer, UserSignupSerializer)
 
 
-class NameSlugBaseViewSet(viewsets.GenericViewSet,
+class NameSlugBaseViewSet(CachedListMixin,
+                          viewsets.GenericViewSet,
                           mixins.CreateModelMixin,
                           mixins.DestroyModelMixin,
                           mixins.ListModelMixin):
@@ -43,18 +59,30 @@ class NameSlugBaseViewSet(viewsets.GenericViewSet,
 class CategoryViewSet(NameSlugBaseViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    cache_dependencies = (Category,)
 
 
 class GenreViewSet(NameSlugBaseViewSet):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    cache_dependencies = (Genre,)
 
 
 class TitleFilter(FilterSet):
-    category = AllValuesFilter(field_name='category__slug')
-    genre = AllValuesMultipleFilter(field_name='genre__slug')
-    name = AllValuesFilter(field_name='name', lookup_expr='istartswith')
+    category = SlugChoiceFilter(field_name='category__slug',
+                                choices_model=Category)
+    genre = SlugMultipleChoiceFilter(field_name='genre__slug',
+                                     choices_model=Genre)
+    name = CharFilter(field_name='name', lookup_expr='istartswith')
     year = NumberFilter(field_name='year')
+    search = CharFilter(method='filter_search')
+    # Stored columns only, each backed by a (column, id) index
+    ordering = IndexedOrderingFilter(fields=(
+        ('rating', 'rating'),
+        ('year', 'year'),
+        ('rating_count', 'review_count'),
+        ('name', 'name'),
+    ))
 
     class Meta:
         model = Title
@@ -62,17 +90,25 @@ class TitleFilter(FilterSet):
             'category',
             'genre',
             'name',
-            'year',)
+            'year',
+            'search',
+            'ordering',)
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(BulkDestroyMixin, ConditionalRetrieveMixin,
+                   CachedListMixin, CachedRetrieveMixin,
+                   TitleRowsMixin, viewsets.ModelViewSet):
 
-    queryset = (Title.objects.all().annotate(rating=Avg('reviews__score'))
-                .order_by('name'))
+    queryset = (Title.objects.select_related('category')
+                .prefetch_related('genre').order_by('name', 'pk'))
     permission_classes = (permissions.AllowAny,)
     http_method_names = ['get', 'post', 'patch', 'delete']
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
+    cache_dependencies = (Title, Category, Genre)
 
     def get_permissions(self):
         if self.action in ['create', 'destroy', 'partial_update']:
@@ -84,6 +120,38 @@ class TitleViewSet(viewsets.ModelViewSet):
             return TitleReadSerializer
         return TitleWriteSerializer
 
+    def get_last_modified(self):
+        return modified_at(Title, pk=self.kwargs['pk'])
+
+    @action(methods=['get'], detail=False)
+    def leaderboard(self, request):
+        return self.cached_response(self.get_leaderboard, request)
+
+    def get_leaderboard(self, request):
+        params = LeaderboardSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        # Reads down the weighted_rating indexes and stops after limit
+        # rows, whatever the size of the catalogue.
+        queryset = self.filter_queryset(
+            Title.objects.filter(weighted_rating__isnull=False))
+        rows = queryset.order_by('-weighted_rating', 'pk').values(
+            *self.values_fields, 'weighted_rating',
+            genres=TitleGenres())[:params.validated_data['limit']]
+        return Response([leaderboard_row(row) for row in rows])
+
+    @action(methods=['get'], detail=True)
+    def stats(self, request, pk=None):
+        return self.cached_response(self.get_stats, request, pk=pk)
+
+    def get_stats(self, request, pk):
+        title = get_object_or_404(
+            Title.objects.only('pk', *SCORE_BUCKETS), pk=pk)
+        return Response(get_score_stats(title))
+
+    def get_etag_extra(self):
+        # Nested category and genres are not covered by Title.modified.
+        return get_versions(Category, Genre)
+
 
 @api_view(['POST'])
 @permission_classes((AllowAny, ))
@@ -101,11 +169,11 @@ def auth_signup(request):
     new_user.confirmation_code = token
     new_user.save()
 
-    recip_email = serializer.data['email']
-    send_mail('Confirmation code',
-              (f"User {serializer.data['username']}!"
-               f"Your confirmation code is {token}"),
-              settings.EMAIL_SENDER, [recip_email, ])
+    # delivered by the run_worker command, see api/jobs.py
+    enqueue('send_confirmation_email',
+            username=serializer.data['username'],
+            email=serializer.data['email'],
+            code=token)
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -131,7 +199,17 @@ def obtain_token(request):
     return Response(token_data, status=status.HTTP_200_OK)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+@api_view(['GET'])
+@permission_classes((AdminOrSuperUser, ))
+def export_table(request, table, file_format):
+    response = StreamingHttpResponse(
+        export(table, file_format), content_type=FORMATS[file_format])
+    response['Content-Disposition'] = (
+        f'attachment; filename="{table}.{file_format}"')
+    return response
+
+
+class UserViewSet(BulkDestroyMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = (AdminOrSuperUser, )
@@ -163,14 +241,26 @@ class UserViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class JobViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
+    permission_classes = (AdminOrSuperUser, )
+
+
+class ReviewViewSet(ParentObjectMixin,
+                    ConditionalListMixin, ConditionalRetrieveMixin,
+                    CachedListMixin, CachedRetrieveMixin,
+                    ReviewRowsMixin, viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
     permission_classes = (permissions.AllowAny,)
+    pagination_class = PubDatePagination
+    cache_dependencies = (Review,)
     http_method_names = ['get', 'post', 'patch', 'delete']
+    parent_model = Title
+    parent_lookups = {'pk': 'title_id'}
 
     def get_queryset(self):
-        title = get_object_or_404(Title, pk=self.kwargs.get('title_id'))
-        return title.reviews.all()
+        return self.get_parent().reviews.select_related('author')
 
     def get_permissions(self):
         if self.action == 'create':
@@ -181,28 +271,33 @@ class ReviewViewSet(viewsets.ModelViewSet):
         return super().get_permissions()
 
     def perform_create(self, serializer):
-        title = get_object_or_404(Title, pk=self.kwargs.get('title_id'))
         serializer.save(
             author=self.request.user,
-            title=title)
+            title=self.get_parent())
+
+    def get_last_modified(self):
+        # Every review write also touches Title.modified.
+        if self.action == 'list':
+            return self.get_parent().modified
+        return modified_at(Review, pk=self.kwargs['pk'],
+                           title_id=self.kwargs['title_id'])
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ParentObjectMixin,
+                     ConditionalListMixin, ConditionalRetrieveMixin,
+                     viewsets.ModelViewSet):
     serializer_class = CommentSerializer
     permission_classes = (IsAuthenticatedOrReadOnly, )
-    pagination_class = PageNumberPagination
+    pagination_class = PubDatePagination
+    parent_model = Review
+    parent_lookups = {'pk': 'review_id', 'title_id': 'title_id'}
 
     def get_queryset(self):
-        review_id = self.kwargs['review_id']
-        title_id = self.kwargs['title_id']
-        review = get_object_or_404(Review, pk=review_id, title__id=title_id)
-        return Comment.objects.filter(review=review)
+        return Comment.objects.filter(
+            review=self.get_parent()).select_related('author')
 
     def perform_create(self, serializer):
-        review_id = self.kwargs['review_id']
-        title_id = self.kwargs['title_id']
-        review = get_object_or_404(Review, pk=review_id, title__id=title_id)
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author=self.request.user, review=self.get_parent())
 
     def perform_update(self, serializer):
         if (serializer.instance.author != self.request.user
@@ -217,3 +312,11 @@ class CommentViewSet(viewsets.ModelViewSet):
                          or self.request.user.is_moderator)):
             raise PermissionDenied('Удаление чужого контента запрещено!')
         super(CommentViewSet, self).perform_destroy(serializer)
+
+    def get_last_modified(self):
+        # Every comment write also touches Review.modified.
+        if self.action == 'list':
+            return self.get_parent().modified
+        return modified_at(Comment, pk=self.kwargs['pk'],
+                           review_id=self.kwargs['review_id'],
+                           review__title_id=self.kwargs['title_id'])
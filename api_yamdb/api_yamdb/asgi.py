@@ -0,0 +1,18 @@
+"""
+ASGI config for YaMDb project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+Django 2.2 has no ASGI handler of its own, so the WSGI application is
+wrapped in ``api.asgi.ASGIHandler``. Serve it with uvicorn workers::
+
+    gunicorn api_yamdb.asgi:application -k uvicorn.workers.UvicornWorker
+"""
+
+import os
+
+from api.asgi import ASGIHandler
+from django.core.wsgi import get_wsgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+application = ASGIHandler(get_wsgi_application())
@@ -0,0 +1,132 @@
+"""PostgreSQL backend that takes its connections from an in-process pool.
+
+With threaded gunicorn workers every thread would otherwise keep its own
+persistent connection. Here the threads of a process share at most
+``POOL['size']`` connections per database: Django opens one per request
+(``CONN_MAX_AGE`` is 0) and closing it gives it back to the pool.
+Enabled with ``DB_POOL_SIZE``, see settings.
+"""
+import threading
+import time
+
+from django.db.backends.postgresql import base
+from psycopg2 import extensions
+
+Database = base.Database
+
+
+class ConnectionPool:
+    """Thread-safe pool of raw psycopg2 connections.
+
+    ``acquire`` waits up to ``timeout`` seconds for a free slot. Idle
+    connections older than ``max_lifetime`` are closed instead of being
+    reused, and those idle for ``check_idle`` seconds are pinged first.
+    """
+
+    def __init__(self, size, timeout, max_lifetime, check_idle):
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.check_idle = check_idle
+        self.slots = threading.BoundedSemaphore(size)
+        self.lock = threading.Lock()
+        self.idle = []
+        self.created = {}
+
+    def acquire(self, connect):
+        if not self.slots.acquire(timeout=self.timeout):
+            raise Database.OperationalError(
+                f'No free pooled connection after {self.timeout}s')
+        try:
+            while True:
+                with self.lock:
+                    raw, released_at = (self.idle.pop() if self.idle
+                                        else (None, None))
+                if raw is None:
+                    raw = connect()
+                    self.created[id(raw)] = time.monotonic()
+                    return raw
+                if self.is_alive(raw, released_at):
+                    return raw
+                self.discard(raw)
+        except BaseException:
+            self.slots.release()
+            raise
+
+    def release(self, raw):
+        try:
+            if self.is_expired(raw):
+                self.discard(raw)
+                return
+            if (raw.get_transaction_status()
+                    != extensions.TRANSACTION_STATUS_IDLE):
+                raw.rollback()
+            with self.lock:
+                self.idle.append((raw, time.monotonic()))
+        except Database.Error:
+            self.discard(raw)
+        finally:
+            self.slots.release()
+
+    def is_expired(self, raw):
+        created = self.created.get(id(raw), 0)
+        return (raw.closed
+                or time.monotonic() - created >= self.max_lifetime)
+
+    def is_alive(self, raw, released_at):
+        if self.is_expired(raw):
+            return False
+        if time.monotonic() - released_at < self.check_idle:
+            return True
+        try:
+            with raw.cursor() as cursor:
+                cursor.execute('SELECT 1')
+        except Database.Error:
+            return False
+        return True
+
+    def discard(self, raw):
+        self.created.pop(id(raw), None)
+        try:
+            raw.close()
+        except Database.Error:
+            pass
+
+    def close_all(self):
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for raw, _ in idle:
+            self.discard(raw)
+
+
+pools = {}
+pools_lock = threading.Lock()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    @property
+    def pool(self):
+        with pools_lock:
+            if self.alias not in pools:
+                pools[self.alias] = ConnectionPool(
+                    **self.settings_dict['POOL'])
+            return pools[self.alias]
+
+    def get_new_connection(self, conn_params):
+        connection = self.pool.acquire(
+            lambda: Database.connect(**conn_params))
+        # As in the base class; a pooled connection may come back with
+        # the isolation level of its previous user.
+        options = self.settings_dict['OPTIONS']
+        try:
+            self.isolation_level = options['isolation_level']
+        except KeyError:
+            self.isolation_level = connection.isolation_level
+        else:
+            if self.isolation_level != connection.isolation_level:
+                connection.set_session(isolation_level=self.isolation_level)
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            self.pool.release(self.connection)
@@ -26,16 +26,20 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'rest_framework',
     'django_filters',
+    'jobs.apps.JobsConfig',
 ]
 
 MIDDLEWARE = [
+    'api.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'api.replicas.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.capture.TrafficCaptureMiddleware',
 ]
 
 ROOT_URLCONF = 'api_yamdb.urls'
@@ -59,6 +63,11 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
+# Threads running the views under ASGI (api_yamdb.asgi): public reads
+# have a pool of their own, every other request shares the second one.
+ASGI_READ_THREADS = int(os.getenv('ASGI_READ_THREADS', default=8))
+ASGI_THREADS = int(os.getenv('ASGI_THREADS', default=4))
+
 
 # Database
 
@@ -69,10 +78,90 @@ DATABASES = {
         'USER': os.getenv('POSTGRES_USER', default='postgres'),
         'PASSWORD': os.getenv('POSTGRES_PASSWORD', default='password'),
         'HOST': os.getenv('DB_HOST', default='db'),
-        'PORT': os.getenv('DB_PORT', default='5432')
+        'PORT': os.getenv('DB_PORT', default='5432'),
+        # Each worker thread keeps its connection for this many seconds,
+        # then reconnects; 0 connects on every request.
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', default=600)),
+    }
+}
+
+# Kept connections idle this long are pinged before a request reuses them.
+CONN_HEALTH_CHECK_IDLE = int(os.getenv('DB_CONN_HEALTH_CHECK_IDLE',
+                                       default=10))
+
+# For threaded workers (GUNICORN_THREADS > 1): the threads of a process
+# share DB_POOL_SIZE PostgreSQL connections per database, recycled after
+# DB_CONN_MAX_AGE seconds. Off when 0.
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', default=0))
+if (DB_POOL_SIZE
+        and DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql'):
+    DATABASES['default'].update(
+        ENGINE='api_yamdb.postgresql_pool',
+        CONN_MAX_AGE=0,
+        POOL={
+            'size': DB_POOL_SIZE,
+            'timeout': int(os.getenv('DB_POOL_TIMEOUT', default=10)),
+            'max_lifetime': DATABASES['default']['CONN_MAX_AGE'],
+            'check_idle': CONN_HEALTH_CHECK_IDLE,
+        })
+
+# Read replicas share the credentials of the primary and differ by host
+# (DB_REPLICA_HOSTS="replica1:5432,replica2") or by database name
+# (DB_REPLICA_NAMES, e.g. two local SQLite files for development).
+REPLICA_HOSTS = [host for host in os.getenv(
+    'DB_REPLICA_HOSTS', default='').split(',') if host]
+REPLICA_NAMES = [name for name in os.getenv(
+    'DB_REPLICA_NAMES', default='').split(',') if name]
+for number in range(max(len(REPLICA_HOSTS), len(REPLICA_NAMES))):
+    replica = dict(DATABASES['default'], TEST={'MIRROR': 'default'})
+    if number < len(REPLICA_HOSTS):
+        host, _, port = REPLICA_HOSTS[number].partition(':')
+        replica.update(HOST=host, PORT=port or replica['PORT'])
+    if number < len(REPLICA_NAMES):
+        replica['NAME'] = REPLICA_NAMES[number]
+    DATABASES[f'replica{number + 1}'] = replica
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['api.replicas.ReplicaRouter']
+# How long an author reads from the primary after a write
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', default=10))
+# Replicas further behind are taken out of rotation
+REPLICA_MAX_LAG = int(os.getenv('REPLICA_MAX_LAG', default=5))
+REPLICA_CHECK_INTERVAL = 5
+
+
+# Cache
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            default='django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.getenv(
+            'CACHE_LOCATION', default='/var/tmp/yamdb_cache'),
+        # Culling drops random entries, version keys and db-pin:* keys
+        # included, and runs inside the request that hit the limit.
+        # Response keys multiply per query string, role and version, so
+        # Django's default of 300 entries would cull all the time; once
+        # at the limit, drop a tenth rather than a third of the cache.
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES',
+                                         default=200000)),
+            'CULL_FREQUENCY': 10,
+        },
     }
 }
 
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', default=60))
+RESPONSE_CACHE_STALE_TIMEOUT = int(
+    os.getenv('RESPONSE_CACHE_STALE_TIMEOUT', default=30))
+
+# Sampled request log for the replay_traffic command; off when empty.
+TRAFFIC_CAPTURE_FILE = os.getenv('TRAFFIC_CAPTURE_FILE', default='')
+TRAFFIC_CAPTURE_RATE = float(os.getenv('TRAFFIC_CAPTURE_RATE', default=0.01))
+TRAFFIC_CAPTURE_MAX_BODY = 64 * 1024
+TRAFFIC_CAPTURE_EXCLUDE = ('/api/v1/auth/', '/admin/', '/metrics')
+
 
 # Password validation
 
@@ -125,7 +214,7 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
@@ -136,5 +225,34 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Leaderboard prior: every title starts as if it had RATING_PRIOR_WEIGHT
+# scores of RATING_PRIOR_MEAN. Run rebuild_histograms after changing it.
+RATING_PRIOR_MEAN = float(os.getenv('RATING_PRIOR_MEAN', default=5.5))
+RATING_PRIOR_WEIGHT = float(os.getenv('RATING_PRIOR_WEIGHT', default=10))
+LEADERBOARD_MAX_SIZE = 100
+
+# Title and review lists built from .values() rows instead of
+# serializers, see api/rows.py
+FAST_READ_PATH = os.getenv('FAST_READ_PATH', default='1') == '1'
+
+# Titles and users are deleted with chunked DELETEs of their reviews and
+# comments, in a bulk_delete job when that is more than
+# DELETE_ASYNC_THRESHOLD rows, see reviews/deletion.py
+BULK_DELETE = os.getenv('BULK_DELETE', default='1') == '1'
+DELETE_CHUNK_SIZE = 500
+DELETE_ASYNC_THRESHOLD = int(os.getenv('DELETE_ASYNC_THRESHOLD',
+                                       default=5000))
+
+# Per-process cache of authenticated users, see api/authentication.py
+USER_CACHE_SIZE = 1024
+USER_CACHE_TIMEOUT = 300
+
+JOBS_BATCH_SIZE = 50
+JOBS_MAX_ATTEMPTS = 5
+JOBS_RETRY_DELAY = 10
+JOBS_MAX_RETRY_DELAY = 3600
+JOBS_LEASE = 300
+JOBS_POLL_INTERVAL = 1
+
 DOMAIN_NAME = "yamdb"
 EMAIL_SENDER = "admin@" + DOMAIN_NAME + ".com"
@@ -0,0 +1,24 @@
+import os
+import shutil
+
+# Read by gunicorn from the working directory on start.
+
+MULTIPROC_DIR = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+
+workers = int(os.environ.get('GUNICORN_WORKERS', 1))
+# More than one thread switches to the gthread worker; pair it with
+# DB_POOL_SIZE to bound the database connections of each worker.
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+
+
+def on_starting(server):
+    # Samples of a previous run would be summed into the new ones.
+    if MULTIPROC_DIR:
+        shutil.rmtree(MULTIPROC_DIR, ignore_errors=True)
+        os.makedirs(MULTIPROC_DIR)
+
+
+def child_exit(server, worker):
+    if MULTIPROC_DIR:
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
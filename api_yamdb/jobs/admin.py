@@ -0,0 +1,11 @@
+from django.contrib import admin
+from jobs.models import Job
+
+
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'attempts', 'run_at', 'created',)
+    list_filter = ('status', 'name',)
+    readonly_fields = ('created', 'modified',)
+
+
+admin.site.register(Job, JobAdmin)
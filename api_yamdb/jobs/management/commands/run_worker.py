@@ -0,0 +1,32 @@
+import time
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from jobs.queue import run_pending
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Exit once no job is due')
+        parser.add_argument('--batch-size', type=int,
+                            default=settings.JOBS_BATCH_SIZE)
+        parser.add_argument('--sleep', type=float,
+                            default=settings.JOBS_POLL_INTERVAL)
+
+    def handle(self, *args, **kwargs):
+        processed = 0
+        try:
+            while True:
+                claimed = run_pending(kwargs['batch_size'])
+                processed += claimed
+                if claimed:
+                    continue
+                if kwargs['once']:
+                    break
+                time.sleep(kwargs['sleep'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(f'Processed {processed} jobs')
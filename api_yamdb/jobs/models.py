@@ -0,0 +1,70 @@
+import json
+
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    STATUSES = (
+        (PENDING, 'pending'),
+        (RUNNING, 'running'),
+        (DONE, 'done'),
+        (FAILED, 'failed'),
+    )
+
+    name = models.CharField(
+        max_length=100,
+        verbose_name='Имя задачи')
+
+    payload = models.TextField(
+        default='{}',
+        verbose_name='Аргументы задачи в JSON')
+
+    status = models.CharField(
+        choices=STATUSES,
+        max_length=10,
+        default=PENDING,
+        verbose_name='Статус')
+
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Число попыток')
+
+    run_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Время следующей попытки')
+
+    locked_until = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name='Задача занята обработчиком до')
+
+    last_error = models.TextField(
+        blank=True,
+        verbose_name='Последняя ошибка')
+
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата и время создания')
+
+    modified = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата и время изменения')
+
+    @property
+    def arguments(self):
+        return json.loads(self.payload)
+
+    def __str__(self):
+        return f'{self.name}#{self.pk} ({self.status})'
+
+    class Meta:
+        ordering = ['run_at']
+        indexes = [
+            models.Index(fields=['status', 'run_at']),
+        ]
@@ -0,0 +1,179 @@
+import json
+import logging
+import threading
+import traceback
+from collections import defaultdict, namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from jobs.models import Job
+
+logger = logging.getLogger(__name__)
+
+Handler = namedtuple('Handler', 'func batch max_attempts')
+
+registry = {}
+
+# Jobs the handler running in this thread was called for, see renew_lease()
+running = threading.local()
+
+
+def job(name, batch=False, max_attempts=None):
+    """Register the decorated function as the handler of ``name`` jobs.
+
+    A regular handler is called with the keyword arguments given to
+    :func:`enqueue`. A ``batch`` handler is called once with the list of
+    argument dicts of all claimed jobs of that name, so it can share one
+    connection between them; if it raises, the whole batch is retried.
+    """
+    def decorator(func):
+        registry[name] = Handler(
+            func, batch, max_attempts or settings.JOBS_MAX_ATTEMPTS)
+        return func
+    return decorator
+
+
+def enqueue(name, **arguments):
+    if name not in registry:
+        raise KeyError(f'Unknown job {name!r}')
+    return Job.objects.create(name=name, payload=json.dumps(arguments))
+
+
+def get_retry_delay(attempts):
+    delay = settings.JOBS_RETRY_DELAY * 2 ** (attempts - 1)
+    return timedelta(seconds=min(delay, settings.JOBS_MAX_RETRY_DELAY))
+
+
+def get_max_attempts(name):
+    handler = registry.get(name)
+    return handler.max_attempts if handler else settings.JOBS_MAX_ATTEMPTS
+
+
+def get_lease_end():
+    return timezone.now() + timedelta(seconds=settings.JOBS_LEASE)
+
+
+def claim(limit):
+    """Lease up to ``limit`` due jobs to the calling worker.
+
+    Jobs whose lease ran out while ``running`` belong to a worker that
+    died and are claimed again, unless they have used up their attempts:
+    a job that kills its worker never gets to ``fail()``, so it fails
+    here.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = Job.objects.filter(
+            Q(status=Job.PENDING, run_at__lte=now)
+            | Q(status=Job.RUNNING, locked_until__lt=now)
+        ).order_by('run_at')
+        if connection.features.has_select_for_update_skip_locked:
+            jobs = jobs.select_for_update(skip_locked=True)
+        jobs = list(jobs[:limit])
+        exhausted = {job.pk for job in jobs if job.status == Job.RUNNING
+                     and job.attempts >= get_max_attempts(job.name)}
+        Job.objects.filter(pk__in=exhausted).update(
+            status=Job.FAILED, locked_until=None,
+            last_error='Lease expired on the last attempt')
+        jobs = [job for job in jobs if job.pk not in exhausted]
+        Job.objects.filter(pk__in=[job.pk for job in jobs]).update(
+            status=Job.RUNNING,
+            attempts=F('attempts') + 1,
+            locked_until=get_lease_end())
+    for job in jobs:
+        job.status = Job.RUNNING
+        job.attempts += 1
+    return jobs
+
+
+def start(jobs):
+    """Lease ``jobs`` anew right before running them.
+
+    The lease taken by ``claim()`` covers the wait behind the rest of
+    the batch; a job that another worker reclaimed meanwhile has more
+    attempts than this worker saw and is left to that worker.
+    """
+    with transaction.atomic():
+        current = Job.objects.filter(
+            pk__in=[job.pk for job in jobs], status=Job.RUNNING)
+        if connection.features.has_select_for_update:
+            current = current.select_for_update()
+        attempts = dict(current.values_list('pk', 'attempts'))
+        jobs = [job for job in jobs if attempts.get(job.pk) == job.attempts]
+        Job.objects.filter(pk__in=[job.pk for job in jobs]).update(
+            locked_until=get_lease_end())
+    return jobs
+
+
+def renew_lease():
+    """Extend the lease of the jobs being run by the calling thread.
+
+    Long handlers call this between steps so that no other worker
+    reclaims their job; outside of a job it does nothing.
+    """
+    jobs = getattr(running, 'jobs', ())
+    if jobs:
+        Job.objects.filter(
+            pk__in=[job.pk for job in jobs], status=Job.RUNNING).update(
+                locked_until=get_lease_end())
+
+
+def finish(jobs):
+    Job.objects.filter(pk__in=[job.pk for job in jobs]).update(
+        status=Job.DONE, locked_until=None, last_error='')
+
+
+def fail(jobs, max_attempts, error):
+    now = timezone.now()
+    for job in jobs:
+        if job.attempts >= max_attempts:
+            job.status = Job.FAILED
+        else:
+            job.status = Job.PENDING
+            job.run_at = now + get_retry_delay(job.attempts)
+        job.locked_until = None
+        job.last_error = error
+        job.save(update_fields=(
+            'status', 'run_at', 'locked_until', 'last_error', 'modified'))
+
+
+def execute(handler, jobs):
+    jobs = start(jobs)
+    if not jobs:
+        return
+    running.jobs = jobs
+    try:
+        if handler.batch:
+            handler.func([job.arguments for job in jobs])
+        else:
+            for job in jobs:
+                handler.func(**job.arguments)
+    except Exception:
+        logger.exception('Job %s failed', jobs[0].name)
+        fail(jobs, handler.max_attempts, traceback.format_exc())
+    else:
+        finish(jobs)
+    finally:
+        running.jobs = ()
+
+
+def run_pending(limit=None):
+    """Run one batch of due jobs and return how many were claimed."""
+    jobs = claim(limit or settings.JOBS_BATCH_SIZE)
+    by_name = defaultdict(list)
+    for job in jobs:
+        by_name[job.name].append(job)
+    for name, group in by_name.items():
+        handler = registry.get(name)
+        if handler is None:
+            fail(group, 0, f'Unknown job {name!r}')
+        elif handler.batch:
+            execute(handler, group)
+        else:
+            # Retry failed jobs one by one, not the whole group.
+            for job in group:
+                execute(handler, [job])
+    return len(jobs)
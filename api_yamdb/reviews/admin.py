@@ -22,7 +22,8 @@ class UserAdmin(admin.ModelAdmin):
 
 class TitleAdmin(admin.ModelAdmin):
     fields = ('name', 'year', 'description', 'genre', 'category',)
-    list_display = ('name', 'year', 'description', 'get_genres', 'category',)
+    list_display = ('name', 'year', 'description', 'get_genres', 'category',
+                    'rating',)
     empty_value_display = '-пусто-'
     list_editable = ('description', 'category')
 
@@ -0,0 +1,33 @@
+from django.db import connection
+from django.utils import timezone
+from reviews.models.comment import Comment
+from reviews.models.review import Review
+
+# One grouped pass over the comments of a range of reviews; only rows
+# whose stored count is off are written, so their ETags alone change.
+REBUILD_SQL = '''
+UPDATE {review} SET comments_count = counts.total, modified = %s
+FROM (
+    SELECT r.id, COUNT(c.id) AS total
+    FROM {review} r LEFT JOIN {comment} c ON c.{review_id} = r.id
+    WHERE r.id > %s AND r.id <= %s
+    GROUP BY r.id
+) AS counts
+WHERE {review}.id = counts.id AND {review}.comments_count <> counts.total
+'''
+
+
+def rebuild_review_range(after_id, last_id):
+    """Recount the comments of ``after_id < pk <= last_id`` reviews.
+
+    Returns the number of repaired reviews; bump the Review version
+    when done.
+    """
+    quote = connection.ops.quote_name
+    sql = REBUILD_SQL.format(
+        review=quote(Review._meta.db_table),
+        comment=quote(Comment._meta.db_table),
+        review_id=Comment._meta.get_field('review').column)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [timezone.now(), after_id, last_id])
+        return cursor.rowcount
@@ -0,0 +1,166 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from jobs.queue import renew_lease
+from reviews.models.comment import Comment
+from reviews.models.review import Review
+from reviews.models.title import Title
+from reviews.models.user import User
+from reviews.ratings import remove_scores
+from reviews.versions import bump_version
+
+
+def delete_rows(model, pks, fields=('id',)):
+    """DELETE rows by primary key without loading them or sending signals.
+
+    Returns ``fields`` of the rows this statement deleted, which leaves
+    out rows someone else deleted since ``pks`` were read (``RETURNING``
+    needs SQLite 3.35 or later).
+    """
+    if not pks:
+        return []
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'DELETE FROM {} WHERE {} IN ({}) RETURNING {}'.format(
+                quote(model._meta.db_table),
+                quote(model._meta.pk.column),
+                ', '.join(['%s'] * len(pks)),
+                ', '.join(quote(model._meta.get_field(name).column)
+                          for name in fields)),
+            pks)
+        return cursor.fetchall()
+
+
+def delete_in_chunks(queryset, fields=('id',), after_delete=None,
+                     chunk_size=None):
+    """Delete the rows of ``queryset``, ``chunk_size`` per transaction.
+
+    Each chunk deletes up to ``chunk_size`` rows by primary key and
+    passes ``fields`` of the rows it actually deleted to ``after_delete``
+    inside the same transaction, so counters fixed there stay in step
+    with the deletes even when another worker deletes the same rows.
+    Signals are not sent. Returns the number of deleted rows.
+    """
+    chunk_size = chunk_size or settings.DELETE_CHUNK_SIZE
+    pks = queryset.order_by().values_list('pk', flat=True)
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            chunk = list(pks[:chunk_size])
+            rows = delete_rows(queryset.model, chunk, fields)
+            if rows and after_delete is not None:
+                after_delete(rows)
+        # a bulk_delete job keeps its lease while it makes progress
+        renew_lease()
+        deleted += len(rows)
+        if len(chunk) < chunk_size:
+            return deleted
+
+
+def remove_comments(rows):
+    """Take ``(pk, review_id)`` deleted comments off their reviews."""
+    removed = defaultdict(int)
+    for _, review_id in rows:
+        removed[review_id] += 1
+    by_number = defaultdict(list)
+    for review_id, number in removed.items():
+        by_number[number].append(review_id)
+    for number, review_ids in by_number.items():
+        Review.objects.filter(pk__in=review_ids).update(
+            modified=timezone.now(),
+            comments_count=F('comments_count') - number)
+
+
+def remove_reviews(rows):
+    """Take ``(pk, title_id, score)`` deleted reviews off their titles."""
+    remove_scores((title_id, score) for _, title_id, score in rows)
+
+
+def delete_reviews(reviews, chunk_size=None):
+    """Delete ``reviews`` and their comments, keeping ratings right."""
+    deleted = 0
+    fields = ('id', 'title', 'score')
+    while True:
+        pks = list(reviews.order_by().values_list(
+            'pk', flat=True)[:chunk_size or settings.DELETE_CHUNK_SIZE])
+        if not pks:
+            return deleted
+        # comments of a deleted review need no counter update
+        deleted += delete_in_chunks(
+            Comment.objects.filter(review_id__in=pks),
+            chunk_size=chunk_size)
+        with transaction.atomic():
+            rows = delete_rows(Review, pks, fields)
+            remove_reviews(rows)
+        renew_lease()
+        deleted += len(rows)
+
+
+def delete_title(pk, chunk_size=None):
+    """Delete a title, its reviews and their comments in chunks.
+
+    The rows that remain after the chunks, the title and its genre
+    links, go through ``Model.delete()`` as usual, so the title signals
+    still run. Returns the number of deleted rows, 0 if there was no
+    such title.
+    """
+    if not Title.objects.filter(pk=pk).exists():
+        return 0
+    deleted = delete_in_chunks(
+        Comment.objects.filter(review__title_id=pk), chunk_size=chunk_size)
+    deleted += delete_in_chunks(
+        Review.objects.filter(title_id=pk), chunk_size=chunk_size)
+    bump_version(Review, Comment)
+    return deleted + Title.objects.filter(pk=pk).delete()[0]
+
+
+def delete_user(pk, chunk_size=None):
+    """Delete a user with their reviews and comments in chunks.
+
+    Comments by the user are taken off the comment counts of their
+    reviews, reviews by the user off the ratings of their titles, in
+    the transaction of each chunk. Returns the number of deleted rows,
+    0 if there was no such user.
+    """
+    if not User.objects.filter(pk=pk).exists():
+        return 0
+    deleted = delete_in_chunks(
+        Comment.objects.filter(author_id=pk), ('id', 'review'),
+        remove_comments, chunk_size)
+    deleted += delete_reviews(Review.objects.filter(author_id=pk),
+                              chunk_size)
+    bump_version(Title, Review, Comment)
+    return deleted + User.objects.filter(pk=pk).delete()[0]
+
+
+# What goes with a title or a user, see is_large()
+DEPENDENTS = {
+    Title: lambda pk: (Review.objects.filter(title_id=pk),
+                       Comment.objects.filter(review__title_id=pk)),
+    User: lambda pk: (Review.objects.filter(author_id=pk),
+                      Comment.objects.filter(author_id=pk),
+                      Comment.objects.filter(review__author_id=pk)),
+}
+
+DELETERS = {
+    Title: delete_title,
+    User: delete_user,
+}
+
+
+def is_large(model, pk, threshold=None):
+    """Whether deleting ``model`` ``pk`` takes more than ``threshold`` rows.
+
+    Every count stops at the threshold, so a huge title or user costs
+    no more to check than one just over the limit.
+    """
+    left = threshold or settings.DELETE_ASYNC_THRESHOLD
+    for queryset in DEPENDENTS[model](pk):
+        left -= queryset.order_by()[:left + 1].count()
+        if left < 0:
+            return True
+    return False
@@ -0,0 +1,117 @@
+import csv
+import json
+from collections import namedtuple
+
+from django.core.serializers.json import DjangoJSONEncoder
+from reviews.models import Comment, Review, Title
+
+CHUNK_SIZE = 2000
+FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+Export = namedtuple('Export', 'fields rows')
+
+
+def title_rows():
+    """Yield titles with their genre slugs, ordered by id.
+
+    Titles and genre links are read by two server-side cursors in the
+    same order and merged, so neither side is ever held in memory.
+    """
+    links = (Title.genre.through.objects
+             .order_by('title_id', 'genre__slug')
+             .values_list('title_id', 'genre__slug')
+             .iterator(chunk_size=CHUNK_SIZE))
+    link = next(links, None)
+    titles = Title.objects.order_by('pk').values_list(
+        'pk', 'name', 'year', 'description', 'category__slug', 'rating',
+        'rating_count')
+    for (pk, name, year, description, category, rating,
+         rating_count) in titles.iterator(chunk_size=CHUNK_SIZE):
+        genre = []
+        while link is not None and link[0] <= pk:
+            if link[0] == pk:
+                genre.append(link[1])
+            link = next(links, None)
+        yield {'id': pk, 'name': name, 'year': year,
+               'description': description, 'category': category,
+               'genre': genre, 'rating': rating,
+               'rating_count': rating_count}
+
+
+def value_rows(queryset, fields):
+    for row in queryset.values_list(*fields.values()).iterator(
+            chunk_size=CHUNK_SIZE):
+        yield dict(zip(fields, row))
+
+
+REVIEW_FIELDS = {
+    'id': 'pk',
+    'title_id': 'title_id',
+    'author': 'author__username',
+    'text': 'text',
+    'score': 'score',
+    'pub_date': 'pub_date',
+}
+
+COMMENT_FIELDS = {
+    'id': 'pk',
+    'review_id': 'review_id',
+    'title_id': 'review__title_id',
+    'author': 'author__username',
+    'text': 'text',
+    'pub_date': 'pub_date',
+}
+
+EXPORTS = {
+    'titles': Export(
+        ('id', 'name', 'year', 'description', 'category', 'genre',
+         'rating', 'rating_count'),
+        title_rows),
+    'reviews': Export(
+        tuple(REVIEW_FIELDS),
+        lambda: value_rows(Review.objects.order_by('pk'), REVIEW_FIELDS)),
+    'comments': Export(
+        tuple(COMMENT_FIELDS),
+        lambda: value_rows(Comment.objects.order_by('pk'), COMMENT_FIELDS)),
+}
+
+
+class Echo:
+    """File-like object whose ``write()`` returns what it was given."""
+
+    def write(self, value):
+        return value
+
+
+def to_ndjson(fields, rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder,
+                         ensure_ascii=False) + '\n'
+
+
+def to_csv(fields, rows):
+    writer = csv.writer(Echo())
+    # same date format as the NDJSON export and the API
+    encoder = DjangoJSONEncoder()
+    yield writer.writerow(fields)
+    for row in rows:
+        if isinstance(row.get('genre'), list):
+            row['genre'] = ','.join(row['genre'])
+        yield writer.writerow(
+            [encoder.default(value) if hasattr(value, 'isoformat') else value
+             for value in row.values()])
+
+
+WRITERS = {
+    'ndjson': to_ndjson,
+    'csv': to_csv,
+}
+
+
+def export(table, file_format):
+    """Return a generator of text chunks with ``table`` in ``file_format``."""
+    fields, rows = EXPORTS[table]
+    return WRITERS[file_format](fields, rows())
@@ -0,0 +1,10 @@
+from django.apps import apps
+from jobs.queue import job
+from reviews.deletion import DELETERS
+
+
+@job('bulk_delete')
+def bulk_delete(model, pk):
+    # Deleting what is left is idempotent, so a retry picks up where
+    # a failed attempt stopped.
+    DELETERS[apps.get_model(model)](pk)
@@ -0,0 +1,99 @@
+import math
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.test import Client
+
+
+def percentile(ordered, percent):
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return None
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def latency_summary(latencies):
+    """Mean, p50, p95, p99 and max of ``latencies`` in milliseconds."""
+    ordered = sorted(latencies)
+    if not ordered:
+        return {}
+    return {
+        'mean': round(sum(ordered) / len(ordered) * 1000, 3),
+        'p50': round(percentile(ordered, 50) * 1000, 3),
+        'p95': round(percentile(ordered, 95) * 1000, 3),
+        'p99': round(percentile(ordered, 99) * 1000, 3),
+        'max': round(ordered[-1] * 1000, 3),
+    }
+
+
+class LocalClient:
+    """Runs requests in this process through Django's test client."""
+
+    def __init__(self):
+        host = settings.ALLOWED_HOSTS[0] if settings.ALLOWED_HOSTS else ''
+        self.host = 'localhost' if host in ('', '*') else host.lstrip('.')
+
+    def request(self, method, path, token=None, body='', content_type=''):
+        headers = {'HTTP_HOST': self.host}
+        if token:
+            headers['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+        return Client().generic(
+            method, path, body or '',
+            content_type=content_type or 'application/octet-stream',
+            **headers).status_code
+
+    def get(self, path, token=None):
+        return self.request('GET', path, token)
+
+
+class WsgiClient(LocalClient):
+    """Runs GET requests in this process through the WSGI handler.
+
+    Unlike the test client it keeps Django's connection handling on
+    ``request_started`` and ``request_finished``, as under gunicorn.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.handler = WSGIHandler()
+
+    def request(self, method, path, token=None, body='', content_type=''):
+        path, _, query = path.partition('?')
+        environ = {'REQUEST_METHOD': method, 'PATH_INFO': path,
+                   'QUERY_STRING': query, 'HTTP_HOST': self.host}
+        if token:
+            environ['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+        setup_testing_defaults(environ)
+        statuses = []
+        response = self.handler(
+            environ, lambda status, headers: statuses.append(status))
+        try:
+            for _ in response:
+                pass
+        finally:
+            response.close()
+        return int(statuses[0].split()[0])
+
+
+class RemoteClient:
+    """Runs requests against a running server over HTTP."""
+
+    def __init__(self, base_url):
+        import requests  # only needed with --base-url
+        self.base_url = base_url.rstrip('/')
+        self.session = requests.Session()
+
+    def request(self, method, path, token=None, body='', content_type=''):
+        headers = {}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        if content_type:
+            headers['Content-Type'] = content_type
+        return self.session.request(
+            method, self.base_url + path, data=(body or '').encode(),
+            headers=headers).status_code
+
+    def get(self, path, token=None):
+        return self.request('GET', path, token)
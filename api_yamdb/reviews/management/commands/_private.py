@@ -0,0 +1,192 @@
+import csv
+import io
+import time
+from contextlib import contextmanager
+from itertools import islice
+
+from django.core.management import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from reviews.versions import bump_version
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def read_rows(path):
+    """Stream the rows of a csv file, skipping the header."""
+    with open(path, 'rt', newline='') as f:
+        reader = csv.reader(f, dialect='excel', delimiter=',')
+        next(reader, None)  # skip the header
+        yield from reader
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+@contextmanager
+def keep_auto_now_add(model):
+    """Let explicit values of ``auto_now_add`` fields reach the database."""
+    fields = [field for field in model._meta.concrete_fields
+              if getattr(field, 'auto_now_add', False)]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class CsvImporter:
+    """Streaming csv loader shared by the ``load_*`` commands.
+
+    Rows are read lazily and written in chunks: foreign keys of a chunk
+    are checked with one ``SELECT`` per referenced model, then the chunk
+    is inserted with PostgreSQL ``COPY`` or, on other backends, with
+    ``bulk_create``. Sequences are reset once the file is loaded.
+    """
+
+    def __init__(self, model, fields, foreign_keys=None,
+                 chunk_size=DEFAULT_CHUNK_SIZE, use_copy=True,
+                 using=DEFAULT_DB_ALIAS, stdout=None, verbosity=1):
+        self.model = model
+        self.fields = fields
+        self.foreign_keys = foreign_keys or {}
+        self.chunk_size = chunk_size
+        self.using = using
+        self.connection = connections[using]
+        self.use_copy = use_copy and self.connection.vendor == 'postgresql'
+        self.stdout = stdout
+        self.verbosity = verbosity
+
+    @property
+    def label(self):
+        return self.model._meta.db_table
+
+    def log(self, message, level=1):
+        if self.stdout is not None and self.verbosity >= level:
+            self.stdout.write(message)
+
+    def check_foreign_keys(self, objects):
+        for attname, related_model in self.foreign_keys.items():
+            wanted = {getattr(obj, attname) for obj in objects}
+            wanted.discard(None)
+            found = set(related_model._default_manager.using(self.using)
+                        .filter(pk__in=wanted)
+                        .values_list('pk', flat=True))
+            missing = wanted - found
+            if missing:
+                raise CommandError(
+                    f'{self.label}: {related_model.__name__} with ids '
+                    f'{sorted(missing)[:10]} does not exist')
+
+    def build(self, row):
+        obj = self.model(**dict(zip(self.fields, row)))
+        for field in obj._meta.concrete_fields:
+            value = getattr(obj, field.attname)
+            if value is not None and not isinstance(value, str):
+                continue
+            if value == '' and field.null:
+                value = None
+            setattr(obj, field.attname, field.to_python(value))
+        return obj
+
+    def copy(self, objects):
+        fields = self.model._meta.concrete_fields
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for obj in objects:
+            row = []
+            for field in fields:
+                value = field.get_db_prep_save(
+                    field.pre_save(obj, add=True), self.connection)
+                row.append('\\N' if value is None else value)
+            writer.writerow(row)
+        buffer.seek(0)
+        columns = ', '.join(
+            self.connection.ops.quote_name(field.column) for field in fields)
+        with self.connection.cursor() as cursor:
+            cursor.copy_expert(
+                f'COPY {self.connection.ops.quote_name(self.label)} '
+                f"({columns}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+                buffer)
+
+    def insert(self, objects):
+        if self.use_copy:
+            self.copy(objects)
+        else:
+            self.model._default_manager.using(self.using).bulk_create(
+                objects)
+
+    def reset_sequences(self):
+        statements = self.connection.ops.sequence_reset_sql(
+            no_style(), [self.model])
+        with self.connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+    def load(self, path):
+        """Load ``path`` and return ``(rows, seconds)``."""
+        return self.load_rows(read_rows(path))
+
+    def load_rows(self, rows):
+        """Load an iterable of ``fields`` tuples; see ``load()``."""
+        started = time.monotonic()
+        total = 0
+        with keep_auto_now_add(self.model):
+            for chunk in chunked(rows, self.chunk_size):
+                objects = [self.build(row) for row in chunk]
+                with transaction.atomic(using=self.using):
+                    self.check_foreign_keys(objects)
+                    self.insert(objects)
+                total += len(objects)
+                elapsed = time.monotonic() - started
+                self.log(f'{self.label}: {total} rows, '
+                         f'{total / elapsed:.0f} rows/s', level=2)
+        self.reset_sequences()
+        bump_version(self.model)
+        elapsed = time.monotonic() - started
+        self.log(f'{self.label}: loaded {total} rows in {elapsed:.2f}s '
+                 f'({total / elapsed if elapsed else total:.0f} rows/s)')
+        return total, elapsed
+
+
+class CsvImportCommand(BaseCommand):
+    """Base for the ``load_*`` commands.
+
+    Subclasses declare the target ``model``, the csv column order in
+    ``fields`` and the referenced models in ``foreign_keys``.
+    """
+    model = None
+    fields = ()
+    foreign_keys = {}
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', type=str, required=True)
+        parser.add_argument('--chunk-size', type=int,
+                            default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument('--no-copy', action='store_true',
+                            help='Use bulk_create even on PostgreSQL')
+
+    def get_importer(self, model, fields, foreign_keys, **kwargs):
+        return CsvImporter(
+            model, fields, foreign_keys,
+            chunk_size=kwargs['chunk_size'],
+            use_copy=not kwargs['no_copy'],
+            stdout=self.stdout,
+            verbosity=kwargs['verbosity'])
+
+    def handle(self, *args, **kwargs):
+        self.get_importer(
+            self.model, self.fields, self.foreign_keys, **kwargs
+        ).load(kwargs['path'])
+        self.after_import(**kwargs)
+
+    def after_import(self, **kwargs):
+        pass
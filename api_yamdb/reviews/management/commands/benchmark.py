@@ -0,0 +1,210 @@
+import json
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+from reviews.models import Comment, Genre, Review, Title, User
+
+from ._http import LocalClient, RemoteClient, latency_summary
+from .seed_dataset import WORDS
+
+ANONYMOUS = 'anonymous'
+USER = 'user'
+ADMIN = 'admin'
+ANYONE = (ANONYMOUS, USER)
+
+Route = namedtuple('Route', 'name path audiences')
+
+# Read routes of api/urls.py; writes would change the dataset under
+# measurement and the export route is a bulk download.
+ROUTES = (
+    Route('categories-list', '/api/v1/categories/', ANYONE),
+    Route('genres-list', '/api/v1/genres/', ANYONE),
+    Route('titles-list', '/api/v1/titles/', ANYONE),
+    Route('titles-filter', '/api/v1/titles/?genre={genre}&year={year}',
+          ANYONE),
+    Route('titles-search', '/api/v1/titles/?search={word}', ANYONE),
+    Route('titles-detail', '/api/v1/titles/{title}/', ANYONE),
+    Route('reviews-list', '/api/v1/titles/{title}/reviews/', ANYONE),
+    Route('reviews-detail', '/api/v1/titles/{title}/reviews/{review}/',
+          ANYONE),
+    Route('comments-list',
+          '/api/v1/titles/{title}/reviews/{review}/comments/', ANYONE),
+    Route('comments-detail',
+          '/api/v1/titles/{title}/reviews/{review}/comments/{comment}/',
+          ANYONE),
+    Route('users-me', '/api/v1/users/me/', (USER,)),
+    Route('users-list', '/api/v1/users/', (ADMIN,)),
+    Route('users-detail', '/api/v1/users/{username}/', (ADMIN,)),
+)
+
+
+def summarize(route, audience, latencies, errors, wall):
+    return {
+        'route': route,
+        'audience': audience,
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput_rps': (round(len(latencies) / wall, 2) if wall
+                           else None),
+        'latency_ms': latency_summary(latencies),
+    }
+
+
+def find_regressions(results, baseline, tolerance):
+    """Return results whose p95 exceeds the baseline by over ``tolerance``."""
+    previous = {(item['route'], item['audience']): item
+                for item in baseline['results']}
+    regressions = []
+    for result in results:
+        before = previous.get((result['route'], result['audience']))
+        if before is None:
+            continue
+        old, new = before['latency_ms']['p95'], result['latency_ms']['p95']
+        if new > old * (1 + tolerance):
+            regressions.append({'route': result['route'],
+                                'audience': result['audience'],
+                                'p95_before': old, 'p95_after': new})
+    return regressions
+
+
+class Command(BaseCommand):
+    help = ('Measure throughput and latency percentiles of the API read '
+            'routes and write them as JSON')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200,
+                            help='Measured requests per route and audience')
+        parser.add_argument('--warmup', type=int, default=10)
+        parser.add_argument('--concurrency', type=int, default=1)
+        parser.add_argument('--base-url',
+                            help='Benchmark a running server instead of '
+                                 'calling the views in this process')
+        parser.add_argument('--routes', nargs='*',
+                            help='Names of the routes to run, all if '
+                                 'omitted')
+        parser.add_argument('--sample', type=int, default=100,
+                            help='Number of random rows to build paths from')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='File for the JSON report, '
+                                             'stdout if omitted')
+        parser.add_argument('--compare',
+                            help='Previous JSON report to check against')
+        parser.add_argument('--tolerance', type=float, default=0.2,
+                            help='Allowed p95 growth over --compare')
+
+    def get_samples(self, count, rng):
+        """Pick random comments with their review, title and author."""
+        bounds = Comment.objects.order_by('pk').values_list('pk', flat=True)
+        first, last = bounds.first(), bounds.last()
+        if first is None:
+            raise CommandError('No comments to benchmark, run seed_dataset '
+                               'first')
+        genres = list(Genre.objects.values_list('slug', flat=True)[:1000])
+        samples = []
+        for _ in range(count):
+            row = Comment.objects.filter(
+                pk__gte=rng.randint(first, last)
+            ).order_by('pk').values(
+                'pk', 'review_id', 'review__title_id', 'review__title__year',
+                'author__username').first()
+            samples.append({
+                'comment': row['pk'],
+                'review': row['review_id'],
+                'title': row['review__title_id'],
+                'year': row['review__title__year'],
+                'username': row['author__username'],
+                'genre': rng.choice(genres),
+                'word': rng.choice(WORDS),
+            })
+        return samples
+
+    def get_tokens(self):
+        tokens = {ANONYMOUS: None}
+        for audience, role in ((USER, User.USER), (ADMIN, User.ADMIN)):
+            user, _ = User.objects.get_or_create(
+                username=f'bench-{audience}',
+                defaults={'email': f'bench-{audience}@yamdb.fake',
+                          'role': role})
+            tokens[audience] = str(RefreshToken.for_user(user).access_token)
+        return tokens
+
+    def measure(self, client, paths, token, concurrency):
+        def call(path):
+            started = time.perf_counter()
+            status = client.get(path, token)
+            return time.perf_counter() - started, status >= 400
+
+        started = time.perf_counter()
+        if concurrency > 1:
+            with ThreadPoolExecutor(concurrency) as executor:
+                outcomes = list(executor.map(call, paths))
+        else:
+            outcomes = [call(path) for path in paths]
+        wall = time.perf_counter() - started
+        latencies = [latency for latency, _ in outcomes]
+        errors = sum(failed for _, failed in outcomes)
+        return latencies, errors, wall
+
+    def handle(self, *args, **kwargs):
+        rng = random.Random(kwargs['seed'])
+        routes = [route for route in ROUTES
+                  if not kwargs['routes'] or route.name in kwargs['routes']]
+        if not routes:
+            raise CommandError('No such routes')
+        samples = self.get_samples(kwargs['sample'], rng)
+        tokens = self.get_tokens()
+        client = (RemoteClient(kwargs['base_url']) if kwargs['base_url']
+                  else LocalClient())
+
+        results = []
+        for route in routes:
+            for audience in route.audiences:
+                paths = [route.path.format(**rng.choice(samples))
+                         for _ in range(kwargs['warmup']
+                                        + kwargs['requests'])]
+                self.measure(client, paths[:kwargs['warmup']],
+                             tokens[audience], kwargs['concurrency'])
+                result = summarize(route.name, audience, *self.measure(
+                    client, paths[kwargs['warmup']:], tokens[audience],
+                    kwargs['concurrency']))
+                results.append(result)
+                self.stderr.write(
+                    f"{route.name:<16} {audience:<9} "
+                    f"{result['throughput_rps']:>9} rps  "
+                    f"p50 {result['latency_ms']['p50']:>8} ms  "
+                    f"p95 {result['latency_ms']['p95']:>8} ms  "
+                    f"p99 {result['latency_ms']['p99']:>8} ms  "
+                    f"errors {result['errors']}")
+
+        report = {
+            'created': timezone.now().isoformat(),
+            'target': kwargs['base_url'] or 'in-process',
+            'database': connection.vendor,
+            'concurrency': kwargs['concurrency'],
+            'dataset': {model._meta.model_name: model.objects.count()
+                        for model in (Title, Review, Comment, User)},
+            'results': results,
+        }
+        if kwargs['compare']:
+            with open(kwargs['compare'], encoding='utf-8') as f:
+                report['regressions'] = find_regressions(
+                    results, json.load(f), kwargs['tolerance'])
+
+        output = json.dumps(report, ensure_ascii=False, indent=2)
+        if kwargs['output']:
+            with open(kwargs['output'], 'w', encoding='utf-8') as f:
+                f.write(output + '\n')
+        else:
+            self.stdout.write(output)
+
+        if report.get('regressions'):
+            raise CommandError(
+                f"p95 regressed on {len(report['regressions'])} routes: "
+                + ', '.join(f"{item['route']} ({item['audience']})"
+                            for item in report['regressions']))
@@ -0,0 +1,93 @@
+import json
+import time
+
+from api.rows import (FastJSONRenderer, ReviewRowsMixin, TitleGenres,
+                      TitleRowsMixin, review_row, title_row)
+from api.serializers import ReviewSerializer, TitleReadSerializer
+from django.core.management import BaseCommand, CommandError
+from django.db.models import Count
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from reviews.models import Review, Title
+
+
+class Command(BaseCommand):
+    help = ('Time building and rendering the title and review lists '
+            'with the serializers and with the .values() rows of '
+            'api/rows.py')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=100,
+                            help='Rows per list')
+        parser.add_argument('--repeat', type=int, default=50)
+        parser.add_argument('--output', help='File for the JSON report, '
+                                             'stdout if omitted')
+
+    def serializer_titles(self, limit):
+        titles = (Title.objects.select_related('category')
+                  .prefetch_related('genre').order_by('name', 'pk')[:limit])
+        return JSONRenderer().render(
+            TitleReadSerializer(titles, many=True).data)
+
+    def fast_titles(self, limit):
+        rows = Title.objects.order_by('name', 'pk').values(
+            *TitleRowsMixin.values_fields, genres=TitleGenres())[:limit]
+        return FastJSONRenderer().render([title_row(row) for row in rows])
+
+    def serializer_reviews(self, limit):
+        reviews = Review.objects.filter(title_id=self.title_id).select_related(
+            'author').order_by('-pub_date', '-pk')[:limit]
+        return JSONRenderer().render(
+            ReviewSerializer(reviews, many=True).data)
+
+    def fast_reviews(self, limit):
+        rows = Review.objects.filter(title_id=self.title_id).order_by(
+            '-pub_date', '-pk').values(*ReviewRowsMixin.values_fields)[:limit]
+        return FastJSONRenderer().render([review_row(row) for row in rows])
+
+    def time(self, build, limit, repeat):
+        build(limit)
+        started = time.perf_counter()
+        for _ in range(repeat):
+            content = build(limit)
+        return (time.perf_counter() - started) / repeat * 1000, content
+
+    def handle(self, *args, **kwargs):
+        busiest = Title.objects.annotate(
+            reviews_number=Count('reviews')).order_by(
+                '-reviews_number').values_list('pk', flat=True).first()
+        if busiest is None:
+            raise CommandError('No titles, run seed_dataset first')
+        self.title_id = busiest
+
+        results = []
+        for name, serializer, fast in (
+                ('titles', self.serializer_titles, self.fast_titles),
+                ('reviews', self.serializer_reviews, self.fast_reviews)):
+            slow_ms, expected = self.time(
+                serializer, kwargs['limit'], kwargs['repeat'])
+            fast_ms, content = self.time(
+                fast, kwargs['limit'], kwargs['repeat'])
+            results.append({
+                'list': name,
+                'rows': len(json.loads(content)),
+                'serializer_ms': round(slow_ms, 3),
+                'values_ms': round(fast_ms, 3),
+                'speedup': round(slow_ms / fast_ms, 2) if fast_ms else None,
+                'identical': content == expected,
+            })
+            self.stderr.write(
+                f'{name:<8} serializer {slow_ms:8.3f} ms  '
+                f'values {fast_ms:8.3f} ms  x{results[-1]["speedup"]}')
+
+        report = json.dumps({
+            'created': timezone.now().isoformat(),
+            'limit': kwargs['limit'],
+            'repeat': kwargs['repeat'],
+            'results': results,
+        }, ensure_ascii=False, indent=2)
+        if kwargs['output']:
+            with open(kwargs['output'], 'w', encoding='utf-8') as f:
+                f.write(report + '\n')
+        else:
+            self.stdout.write(report)
@@ -0,0 +1,152 @@
+import json
+import os
+import socket
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+from django.utils import timezone
+
+from ._http import RemoteClient, latency_summary
+
+
+def tree_rss(pid):
+    """Resident memory in bytes of a process and all its descendants."""
+    total = 0
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    total += int(line.split()[1]) * 1024
+        with open(f'/proc/{pid}/task/{pid}/children') as f:
+            children = f.read().split()
+    except FileNotFoundError:
+        return total
+    return total + sum(tree_rss(int(child)) for child in children)
+
+
+def wait_for_port(port, process, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            return False
+        try:
+            socket.create_connection(('127.0.0.1', port), 0.5).close()
+            return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+class Command(BaseCommand):
+    help = ('Start the project under gunicorn sync workers and under '
+            'uvicorn (ASGI) workers and compare latency, throughput and '
+            'memory at growing concurrency')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/api/v1/titles/')
+        parser.add_argument('--concurrency', type=int, nargs='+',
+                            default=[1, 8, 32, 128])
+        parser.add_argument('--requests', type=int, default=500,
+                            help='Requests per concurrency level')
+        parser.add_argument('--sync-workers', type=int, default=4)
+        parser.add_argument('--asgi-workers', type=int, default=1)
+        parser.add_argument('--max-p95', type=float, default=500,
+                            help='p95 in ms a level must stay under to '
+                                 'count as sustained')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--output', help='File for the JSON report, '
+                                             'stdout if omitted')
+
+    def get_setups(self, kwargs):
+        return (
+            ('gunicorn-sync', ['api_yamdb.wsgi:application',
+                               '--workers', str(kwargs['sync_workers'])]),
+            ('uvicorn-asgi', ['api_yamdb.asgi:application',
+                              '--workers', str(kwargs['asgi_workers']),
+                              '--worker-class',
+                              'uvicorn.workers.UvicornWorker']),
+        )
+
+    def load(self, base_url, path, concurrency, count):
+        local = threading.local()
+
+        def call(_):
+            if not hasattr(local, 'client'):
+                local.client = RemoteClient(base_url)
+            started = time.perf_counter()
+            try:
+                failed = local.client.get(path) >= 400
+            except OSError:
+                failed = True
+            return time.perf_counter() - started, failed
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as executor:
+            outcomes = list(executor.map(call, range(count)))
+        wall = time.perf_counter() - started
+        latencies = [latency for latency, _ in outcomes]
+        return {
+            'concurrency': concurrency,
+            'errors': sum(failed for _, failed in outcomes),
+            'throughput_rps': round(count / wall, 2),
+            'latency_ms': latency_summary(latencies),
+        }
+
+    def serve(self, name, argv, kwargs):
+        port = kwargs['port']
+        env = dict(os.environ)
+        # gunicorn.conf.py would wipe the metrics of a running server.
+        env.pop('PROMETHEUS_MULTIPROC_DIR', None)
+        process = subprocess.Popen(
+            ['gunicorn', *argv, '--bind', f'127.0.0.1:{port}'],
+            cwd=settings.BASE_DIR, env=env,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            if not wait_for_port(port, process, timeout=30):
+                raise CommandError(f'{name} did not start on port {port}')
+            base_url = f'http://127.0.0.1:{port}'
+            self.load(base_url, kwargs['path'], 1, 20)
+            levels = []
+            for concurrency in kwargs['concurrency']:
+                level = self.load(base_url, kwargs['path'], concurrency,
+                                  kwargs['requests'])
+                levels.append(level)
+                self.stderr.write(
+                    f"{name:<14} c={concurrency:<4} "
+                    f"{level['throughput_rps']:>9} rps  "
+                    f"p95 {level['latency_ms']['p95']:>9} ms  "
+                    f"errors {level['errors']}")
+            rss = tree_rss(process.pid)
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+        sustained = [level['concurrency'] for level in levels
+                     if not level['errors']
+                     and level['latency_ms']['p95'] <= kwargs['max_p95']]
+        return {
+            'setup': name,
+            'command': ' '.join(['gunicorn', *argv]),
+            'rss_mb': round(rss / 2 ** 20, 1),
+            'max_sustained_concurrency': max(sustained, default=0),
+            'levels': levels,
+        }
+
+    def handle(self, *args, **kwargs):
+        results = [self.serve(name, argv, kwargs)
+                   for name, argv in self.get_setups(kwargs)]
+        report = json.dumps({
+            'created': timezone.now().isoformat(),
+            'path': kwargs['path'],
+            'max_p95_ms': kwargs['max_p95'],
+            'results': results,
+        }, ensure_ascii=False, indent=2)
+        if kwargs['output']:
+            with open(kwargs['output'], 'w', encoding='utf-8') as f:
+                f.write(report + '\n')
+        else:
+            self.stdout.write(report)
@@ -0,0 +1,23 @@
+from django.core.management import BaseCommand
+from reviews.export import EXPORTS, WRITERS, export
+
+
+class Command(BaseCommand):
+    help = 'Stream a table of the catalog as NDJSON or CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument('table', choices=sorted(EXPORTS))
+        parser.add_argument('--format', dest='file_format',
+                            choices=sorted(WRITERS), default='ndjson')
+        parser.add_argument('--output', help='File to write, stdout if '
+                                             'omitted')
+
+    def handle(self, *args, **kwargs):
+        chunks = export(kwargs['table'], kwargs['file_format'])
+        if kwargs['output'] is None:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+        with open(kwargs['output'], 'w', encoding='utf-8',
+                  newline='') as output:
+            output.writelines(chunks)
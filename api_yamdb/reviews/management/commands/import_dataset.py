@@ -0,0 +1,161 @@
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import (FIRST_COMPLETED, Executor, Future,
+                                ProcessPoolExecutor, wait)
+from multiprocessing import get_context
+
+import django
+from django.core.management import BaseCommand, CommandError, call_command
+from django.db import connection, connections
+from reviews.search import update_search_vectors
+
+from . import (load_category, load_comment, load_genre, load_review,
+               load_title, load_user)
+from ._private import DEFAULT_CHUNK_SIZE, CsvImporter
+
+Table = namedtuple(
+    'Table', 'filename model fields foreign_keys depends_on')
+
+TABLES = {
+    'category': Table(
+        'category.csv', load_category.Command.model,
+        load_category.Command.fields, load_category.Command.foreign_keys,
+        ()),
+    'genre': Table(
+        'genre.csv', load_genre.Command.model,
+        load_genre.Command.fields, load_genre.Command.foreign_keys,
+        ()),
+    'users': Table(
+        'users.csv', load_user.Command.model,
+        load_user.Command.fields, load_user.Command.foreign_keys,
+        ()),
+    'titles': Table(
+        'titles.csv', load_title.Command.model,
+        load_title.Command.fields, load_title.Command.foreign_keys,
+        ('category',)),
+    'genre_title': Table(
+        'genre_title.csv', load_title.Command.genre_model,
+        load_title.Command.genre_fields,
+        load_title.Command.genre_foreign_keys,
+        ('titles', 'genre')),
+    'review': Table(
+        'review.csv', load_review.Command.model,
+        load_review.Command.fields, load_review.Command.foreign_keys,
+        ('titles', 'users')),
+    'comments': Table(
+        'comments.csv', load_comment.Command.model,
+        load_comment.Command.fields, load_comment.Command.foreign_keys,
+        ('review', 'users')),
+}
+
+
+def load_table(name, path, chunk_size, use_copy):
+    table = TABLES[name]
+    rows, seconds = CsvImporter(
+        table.model, table.fields, table.foreign_keys,
+        chunk_size=chunk_size, use_copy=use_copy).load(path)
+    return name, rows, seconds
+
+
+class InlineExecutor(Executor):
+    """Runs every submitted call immediately in the current process."""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
+
+
+class Command(BaseCommand):
+    help = ('Load a directory of csv files, running independent tables '
+            'in parallel worker processes')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dir', type=str, required=True)
+        parser.add_argument('--workers', type=int,
+                            default=min(3, os.cpu_count() or 1))
+        parser.add_argument('--chunk-size', type=int,
+                            default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument('--no-copy', action='store_true',
+                            help='Use bulk_create even on PostgreSQL')
+
+    def get_executor(self, workers):
+        # SQLite serializes writers, so extra processes only add locking.
+        if workers <= 1 or connection.vendor == 'sqlite':
+            return InlineExecutor()
+        # Workers open their own connections; release ours while they run.
+        connections.close_all()
+        return ProcessPoolExecutor(
+            max_workers=workers, mp_context=get_context('spawn'),
+            initializer=django.setup)
+
+    def find_files(self, directory):
+        pending, missing = {}, set()
+        for name, table in TABLES.items():
+            path = os.path.join(directory, table.filename)
+            if os.path.exists(path):
+                pending[name] = path
+            else:
+                self.stderr.write(f'{table.filename} not found, skipping')
+                missing.add(name)
+        return pending, missing
+
+    def run(self, executor, pending, done, chunk_size, use_copy):
+        stats = []
+        running = {}
+        while pending or running:
+            for name in [name for name in pending
+                         if set(TABLES[name].depends_on) <= done]:
+                future = executor.submit(
+                    load_table, name, pending.pop(name),
+                    chunk_size, use_copy)
+                running[future] = name
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    stats.append(future.result())
+                except Exception as exc:
+                    for other in running:
+                        other.cancel()
+                    raise CommandError(f'{name}: {exc}') from exc
+                done.add(name)
+                self.report(*stats[-1])
+        return stats
+
+    def handle(self, *args, **kwargs):
+        directory = kwargs['dir']
+        if not os.path.isdir(directory):
+            raise CommandError(f'{directory} is not a directory')
+        pending, done = self.find_files(directory)
+
+        started = time.monotonic()
+        with self.get_executor(kwargs['workers']) as executor:
+            stats = self.run(executor, pending, done,
+                             kwargs['chunk_size'], not kwargs['no_copy'])
+
+        # Bulk inserts bypass the title, review and comment signals.
+        loaded = {name for name, _, _ in stats}
+        if 'titles' in loaded:
+            update_search_vectors()
+        if 'review' in loaded:
+            call_command('rebuild_histograms', stdout=self.stdout)
+        if 'comments' in loaded:
+            call_command('rebuild_counters', '--models', 'reviews',
+                         stdout=self.stdout)
+
+        elapsed = time.monotonic() - started
+        total = sum(rows for _, rows, _ in stats)
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {total} rows from {len(stats)} files in '
+            f'{elapsed:.2f}s'))
+
+    def report(self, name, rows, seconds):
+        rate = rows / seconds if seconds else rows
+        self.stdout.write(
+            f'{name:<12} {rows:>10} rows {seconds:>9.2f}s '
+            f'{rate:>10.0f} rows/s')
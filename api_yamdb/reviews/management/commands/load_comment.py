@@ -1,29 +1,18 @@
-import csv
-
-from django.core.management import BaseCommand
+from django.core.management import call_command
 from reviews.models.comment import Comment
 from reviews.models.review import Review
 from reviews.models.user import User
 
+from ._private import CsvImportCommand
 
-class Command(BaseCommand):
-    help = 'Load a comments csv file into the database'
 
-    def add_arguments(self, parser):
-        parser.add_argument('--path', type=str)
+class Command(CsvImportCommand):
+    help = 'Load a comments csv file into the database'
+    model = Comment
+    fields = ('id', 'review_id', 'text', 'author_id', 'pub_date')
+    foreign_keys = {'review_id': Review, 'author_id': User}
 
-    def handle(self, *args, **kwargs):
-        path = kwargs['path']
-        with open(path, 'rt') as f:
-            reader = csv.reader(f, dialect='excel', delimiter=',')
-            next(reader, None)  # skip the header
-            for row in reader:
-                review = Review.objects.get(pk=row[1])
-                author = User.objects.get(pk=row[3])
-                Comment.objects.create(
-                    id=row[0],
-                    review=review,
-                    text=row[2],
-                    author=author,
-                    pub_date=row[4]
-                )
+    def after_import(self, **kwargs):
+        # Bulk inserts bypass the comment signals.
+        call_command('rebuild_counters', '--models', 'reviews',
+                     verbosity=kwargs['verbosity'], stdout=self.stdout)
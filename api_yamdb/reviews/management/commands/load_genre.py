@@ -1,23 +1,9 @@
-import csv
-
-from django.core.management import BaseCommand
 from reviews.models.genre import Genre
 
+from ._private import CsvImportCommand
 
-class Command(BaseCommand):
-    help = 'Load a genre csv file into the database'
-
-    def add_arguments(self, parser):
-        parser.add_argument('--path', type=str)
 
-    def handle(self, *args, **kwargs):
-        path = kwargs['path']
-        with open(path, 'rt') as f:
-            reader = csv.reader(f, dialect='excel', delimiter=',')
-            next(reader, None)  # skip the header
-            for row in reader:
-                Genre.objects.create(
-                    id=row[0],
-                    name=row[1],
-                    slug=row[2]
-                )
+class Command(CsvImportCommand):
+    help = 'Load a genre csv file into the database'
+    model = Genre
+    fields = ('id', 'name', 'slug')
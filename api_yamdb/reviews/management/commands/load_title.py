@@ -1,36 +1,30 @@
-import csv
-
-from django.core.management import BaseCommand
 from reviews.models.category import Category
+from reviews.models.genre import Genre
 from reviews.models.title import Title
+from reviews.search import update_search_vectors
+
+from ._private import CsvImportCommand
 
 
-class Command(BaseCommand):
+class Command(CsvImportCommand):
     help = 'Load a title csv file into the database'
+    model = Title
+    fields = ('id', 'name', 'year', 'category_id')
+    foreign_keys = {'category_id': Category}
+    genre_model = Title.genre.through
+    genre_fields = ('id', 'title_id', 'genre_id')
+    genre_foreign_keys = {'title_id': Title, 'genre_id': Genre}
 
     def add_arguments(self, parser):
-        parser.add_argument('--path', type=str)
+        super().add_arguments(parser)
         parser.add_argument('--path2', type=str)
 
-    def handle(self, *args, **kwargs):
-        path = kwargs['path']
-        path2 = kwargs['path2']
-        with open(path, 'rt') as f:
-            reader = csv.reader(f, dialect='excel', delimiter=',')
-            next(reader, None)  # skip the header
-            for row in reader:
-                category = Category.objects.get(pk=row[3])
-                Title.objects.create(
-                    id=row[0],
-                    name=row[1],
-                    year=row[2],
-                    category=category
-                )
-
-        with open(path2, 'rt') as f:
-            reader = csv.reader(f, dialect='excel', delimiter=',')
-            next(reader, None)  # skip the header
-
-            for row in reader:
-                title = Title.objects.get(pk=row[1])
-                title.genre.add(row[2])
+    def after_import(self, **kwargs):
+        # Bulk inserts bypass the title signals.
+        update_search_vectors()
+        if not kwargs['path2']:
+            return
+        self.get_importer(
+            self.genre_model, self.genre_fields, self.genre_foreign_keys,
+            **kwargs
+        ).load(kwargs['path2'])
@@ -1,26 +1,9 @@
-import csv
-
-from django.core.management import BaseCommand
 from reviews.models.user import User
 
+from ._private import CsvImportCommand
 
-class Command(BaseCommand):
-    help = 'Load a users csv file into the database'
-
-    def add_arguments(self, parser):
-        parser.add_argument('--path', type=str)
 
-    def handle(self, *args, **kwargs):
-        path = kwargs['path']
-        with open(path, 'rt') as f:
-            reader = csv.reader(f, dialect='excel', delimiter=',')
-            next(reader, None)  # skip the header
-            for row in reader:
-                User.objects.create(
-                    id=row[0],
-                    username=row[1],
-                    email=row[2],
-                    role=row[3],
-                    first_name=row[4],
-                    last_name=row[5]
-                )
+class Command(CsvImportCommand):
+    help = 'Load a users csv file into the database'
+    model = User
+    fields = ('id', 'username', 'email', 'role', 'first_name', 'last_name')
@@ -0,0 +1,39 @@
+from django.core.management import BaseCommand
+from django.db import transaction
+from reviews.counters import rebuild_review_range
+from reviews.models.review import Review
+from reviews.models.title import Title
+from reviews.ratings import rebuild_title_range
+from reviews.versions import bump_version
+
+# What each counter is recomputed by, in id ranges of its model.
+# reviews_count of a title is its rating_count: one score per review.
+COUNTERS = {
+    'titles': (Title, rebuild_title_range),
+    'reviews': (Review, rebuild_review_range),
+}
+
+
+class Command(BaseCommand):
+    help = ('Recompute the stored reviews_count of titles (with their '
+            'ratings) and comments_count of reviews in grouped passes')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--models', nargs='+', choices=list(COUNTERS),
+                            default=list(COUNTERS),
+                            help='Counters to rebuild, all by default')
+        parser.add_argument('--batch-size', type=int, default=10000,
+                            help='Rows per UPDATE and transaction')
+
+    def handle(self, *args, **kwargs):
+        batch_size = kwargs['batch_size']
+        for name in kwargs['models']:
+            model, rebuild_range = COUNTERS[name]
+            last_id = model.objects.order_by('-pk').values_list(
+                'pk', flat=True).first() or 0
+            updated = 0
+            for start in range(0, last_id, batch_size):
+                with transaction.atomic():
+                    updated += rebuild_range(start, start + batch_size)
+            bump_version(model)
+            self.stdout.write(f'Rebuilt counters of {updated} {name}')
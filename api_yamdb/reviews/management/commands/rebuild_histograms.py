@@ -0,0 +1,26 @@
+from django.core.management import BaseCommand
+from django.db import transaction
+from reviews.models.title import Title
+from reviews.ratings import rebuild_title_range
+from reviews.versions import bump_version
+
+
+class Command(BaseCommand):
+    help = ('Recompute the score histograms and rating aggregates of all '
+            'titles in one grouped pass over the reviews table')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10000,
+                            help='Titles per UPDATE and transaction')
+
+    def handle(self, *args, **kwargs):
+        batch_size = kwargs['batch_size']
+        last_id = Title.objects.order_by('-pk').values_list(
+            'pk', flat=True).first() or 0
+        updated = 0
+        for start in range(0, last_id, batch_size):
+            with transaction.atomic():
+                updated += rebuild_title_range(start, start + batch_size)
+        bump_version(Title)
+        self.stdout.write(
+            f'Rebuilt ratings and score histograms for {updated} titles')
@@ -0,0 +1,6 @@
+from .rebuild_histograms import Command as RebuildHistogramsCommand
+
+
+class Command(RebuildHistogramsCommand):
+    help = ('Recompute the stored rating aggregates of all titles, '
+            'together with their score histograms')
@@ -0,0 +1,211 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from api.metrics import view_name
+from django.core.management import BaseCommand, CommandError
+from django.urls import Resolver404, resolve
+from rest_framework_simplejwt.tokens import RefreshToken
+from reviews.models import User
+
+from ._http import LocalClient, RemoteClient, latency_summary
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def read_capture(path):
+    """Yield the captured requests of a JSONL file.
+
+    Lines that are not JSON objects with a method and a path are skipped,
+    so a capture may be mixed with other JSONL records.
+    """
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if (isinstance(record, dict) and record.get('method')
+                    and record.get('path')):
+                yield record
+
+
+def resolve_view(method, path):
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return 'unmatched'
+    return view_name(match.func, method)
+
+
+class Profiles:
+    """One ``cProfile.Profile`` per view and thread, merged on demand."""
+
+    def __init__(self):
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.all = []
+
+    def get(self, view):
+        profiles = getattr(self.local, 'profiles', None)
+        if profiles is None:
+            profiles = self.local.profiles = {}
+            with self.lock:
+                self.all.append(profiles)
+        if view not in profiles:
+            profiles[view] = cProfile.Profile()
+        return profiles[view]
+
+    def stats(self, view):
+        parts = [profiles[view] for profiles in self.all if view in profiles]
+        stats = pstats.Stats(parts[0])
+        for part in parts[1:]:
+            stats.add(part)
+        return stats
+
+
+class Command(BaseCommand):
+    help = ('Replay a traffic capture in this process or against a '
+            'running server, with a latency report and a cProfile dump '
+            'per view')
+
+    def add_arguments(self, parser):
+        parser.add_argument('capture', help='JSONL file written by '
+                                            'TrafficCaptureMiddleware')
+        parser.add_argument('--base-url',
+                            help='Replay against a running server; '
+                                 'disables profiling')
+        parser.add_argument('--concurrency', type=int, default=1)
+        parser.add_argument('--limit', type=int,
+                            help='Replay only the first N requests')
+        parser.add_argument('--include-writes', action='store_true',
+                            help='Also replay POST, PATCH, PUT and DELETE')
+        parser.add_argument('--profile-dir', default='profiles',
+                            help='Where <view>.prof and <view>.txt go')
+        parser.add_argument('--no-profile', action='store_true')
+        parser.add_argument('--report',
+                            help='File for the JSON report, stdout if '
+                                 'omitted')
+
+    def load(self, path, limit, include_writes):
+        if not os.path.exists(path):
+            raise CommandError(f'{path} does not exist')
+        records = []
+        skipped = 0
+        for record in read_capture(path):
+            if not include_writes and record['method'] not in SAFE_METHODS:
+                skipped += 1
+                continue
+            records.append(record)
+            if limit and len(records) >= limit:
+                break
+        return records, skipped
+
+    def get_token(self, user_id):
+        # Tokens are minted with this project's signing key, so a live
+        # target must share it.
+        if user_id not in self.tokens:
+            self.tokens[user_id] = str(
+                RefreshToken.for_user(User(pk=user_id)).access_token)
+        return self.tokens[user_id]
+
+    def replay(self, record):
+        view = resolve_view(record['method'], record['path'])
+        path = record['path']
+        if record.get('query'):
+            path = f"{path}?{record['query']}"
+        token = None
+        if record.get('user_id') is not None:
+            token = self.get_token(record['user_id'])
+
+        profile = self.profiles.get(view) if self.profiles else None
+        if profile is not None:
+            profile.enable()
+        started = time.perf_counter()
+        try:
+            status = self.client.request(
+                record['method'], path, token, record.get('body', ''),
+                record.get('content_type', ''))
+        finally:
+            elapsed = time.perf_counter() - started
+            if profile is not None:
+                profile.disable()
+        return view, elapsed, status, record.get('status')
+
+    def write_profile(self, view, directory):
+        stats = self.profiles.stats(view)
+        base = os.path.join(directory, view)
+        stats.dump_stats(base + '.prof')
+        summary = io.StringIO()
+        stats.stream = summary
+        stats.sort_stats('cumulative').print_stats(30)
+        with open(base + '.txt', 'w', encoding='utf-8') as f:
+            f.write(summary.getvalue())
+        return base + '.prof'
+
+    def handle(self, *args, **kwargs):
+        records, skipped = self.load(
+            kwargs['capture'], kwargs['limit'], kwargs['include_writes'])
+        if kwargs['base_url']:
+            self.client = RemoteClient(kwargs['base_url'])
+        else:
+            self.client = LocalClient()
+        self.profiles = None
+        if not (kwargs['base_url'] or kwargs['no_profile']):
+            self.profiles = Profiles()
+        self.tokens = {}
+        for user_id in {record.get('user_id') for record in records}:
+            if user_id is not None:
+                self.get_token(user_id)
+
+        started = time.perf_counter()
+        if kwargs['concurrency'] > 1:
+            with ThreadPoolExecutor(kwargs['concurrency']) as executor:
+                outcomes = list(executor.map(self.replay, records))
+        else:
+            outcomes = [self.replay(record) for record in records]
+        wall = time.perf_counter() - started
+
+        by_view = defaultdict(list)
+        for view, elapsed, status, captured in outcomes:
+            by_view[view].append((elapsed, status, captured))
+        if self.profiles:
+            os.makedirs(kwargs['profile_dir'], exist_ok=True)
+
+        views = []
+        for view, rows in by_view.items():
+            latencies = [elapsed for elapsed, _, _ in rows]
+            views.append({
+                'view': view,
+                'requests': len(rows),
+                'errors': sum(status >= 500 for _, status, _ in rows),
+                'status_changed': sum(
+                    captured is not None and status != captured
+                    for _, status, captured in rows),
+                'total_ms': round(sum(latencies) * 1000, 3),
+                'latency_ms': latency_summary(latencies),
+                'profile': (self.write_profile(view, kwargs['profile_dir'])
+                            if self.profiles else None),
+            })
+        views.sort(key=lambda item: -item['total_ms'])
+
+        report = json.dumps({
+            'capture': kwargs['capture'],
+            'target': kwargs['base_url'] or 'in-process',
+            'replayed': len(records),
+            'skipped_writes': skipped,
+            'concurrency': kwargs['concurrency'],
+            'wall_seconds': round(wall, 3),
+            'views': views,
+        }, ensure_ascii=False, indent=2)
+        if kwargs['report']:
+            with open(kwargs['report'], 'w', encoding='utf-8') as f:
+                f.write(report + '\n')
+        else:
+            self.stdout.write(report)
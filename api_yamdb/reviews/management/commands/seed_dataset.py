@@ -0,0 +1,120 @@
+import time
+from datetime import timedelta
+
+from django.core.management import BaseCommand, CommandError, call_command
+from django.db.models import Max
+from django.utils import timezone
+from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.search import update_search_vectors
+
+from ._private import DEFAULT_CHUNK_SIZE, CsvImporter
+
+GENRES_PER_TITLE = 2
+
+WORDS = ('война', 'мир', 'ночь', 'город', 'море', 'звезда', 'дорога',
+         'сердце', 'тень', 'огонь', 'остров', 'зима', 'песня', 'время',
+         'king', 'dark', 'river', 'story', 'night', 'road', 'star', 'fire')
+
+
+def next_id(model):
+    last = model._default_manager.aggregate(last=Max('pk'))['last']
+    return (last or 0) + 1
+
+
+class Command(BaseCommand):
+    help = ('Fill the database with a synthetic dataset for benchmarks; '
+            'rows are appended after the existing ones')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--genres', type=int, default=50)
+        parser.add_argument('--titles', type=int, default=100000)
+        parser.add_argument('--reviews', type=int, default=1000000)
+        parser.add_argument('--comments', type=int, default=2000000)
+        parser.add_argument('--chunk-size', type=int,
+                            default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument('--no-copy', action='store_true',
+                            help='Use bulk_create even on PostgreSQL')
+
+    def check_sizes(self, users, categories, genres, titles, reviews,
+                    comments):
+        if titles and (not categories or genres < GENRES_PER_TITLE):
+            raise CommandError(
+                f'Titles need a category and {GENRES_PER_TITLE} genres')
+        # Review i goes to title i % titles by author i // titles, which
+        # stays within the only_one_author constraint up to this size.
+        if reviews > titles * users:
+            raise CommandError(
+                f'At most --titles * --users = {titles * users} reviews '
+                f'fit the one review per author and title constraint')
+        if comments and not (reviews and users):
+            raise CommandError('Comments need new reviews and users')
+
+    def load(self, model, fields, rows, **kwargs):
+        CsvImporter(
+            model, fields, chunk_size=kwargs['chunk_size'],
+            use_copy=not kwargs['no_copy'], stdout=self.stdout,
+            verbosity=kwargs['verbosity']).load_rows(rows)
+
+    def handle(self, *args, **kwargs):
+        users, categories, genres, titles, reviews, comments = (
+            kwargs[name] for name in ('users', 'categories', 'genres',
+                                      'titles', 'reviews', 'comments'))
+        self.check_sizes(users, categories, genres, titles, reviews,
+                         comments)
+        started = time.monotonic()
+        now = timezone.now()
+        user0, category0, genre0, title0, review0, comment0, link0 = (
+            next_id(model) for model in (
+                User, Category, Genre, Title, Review, Comment,
+                Title.genre.through))
+
+        self.load(User, ('id', 'username', 'email', 'role'), (
+            (pk, f'bench{pk}', f'bench{pk}@yamdb.fake', User.USER)
+            for pk in range(user0, user0 + users)), **kwargs)
+        self.load(Category, ('id', 'name', 'slug'), (
+            (pk, f'Категория {pk}', f'bench-category-{pk}')
+            for pk in range(category0, category0 + categories)), **kwargs)
+        self.load(Genre, ('id', 'name', 'slug'), (
+            (pk, f'Жанр {pk}', f'bench-genre-{pk}')
+            for pk in range(genre0, genre0 + genres)), **kwargs)
+        self.load(
+            Title, ('id', 'name', 'year', 'description', 'category_id'), (
+                (title0 + i,
+                 f'{WORDS[i % len(WORDS)]} {WORDS[i * 7 % len(WORDS)]} '
+                 f'{title0 + i}',
+                 1900 + i % 120,
+                 ' '.join(WORDS[(i + k) % len(WORDS)] for k in range(12)),
+                 category0 + i % categories)
+                for i in range(titles)), **kwargs)
+        self.load(Title.genre.through, ('id', 'title_id', 'genre_id'), (
+            (link0 + i * GENRES_PER_TITLE + k, title0 + i,
+             genre0 + (i + k) % genres)
+            for i in range(titles) for k in range(GENRES_PER_TITLE)),
+            **kwargs)
+        self.load(
+            Review,
+            ('id', 'title_id', 'author_id', 'text', 'score', 'pub_date'), (
+                (review0 + i, title0 + i % titles,
+                 user0 + i // titles, f'Отзыв {review0 + i}',
+                 i * 7 % 10 + 1, now - timedelta(minutes=i))
+                for i in range(reviews)), **kwargs)
+        self.load(
+            Comment, ('id', 'review_id', 'author_id', 'text', 'pub_date'), (
+                (comment0 + i, review0 + i % reviews,
+                 user0 + i * 7 % users, f'Комментарий {comment0 + i}',
+                 now - timedelta(seconds=i))
+                for i in range(comments)), **kwargs)
+
+        # Bulk inserts bypass the title, review and comment signals.
+        if titles:
+            update_search_vectors(Title.objects.filter(pk__gte=title0))
+        if reviews:
+            call_command('rebuild_histograms', stdout=self.stdout)
+        if comments:
+            call_command('rebuild_counters', '--models', 'reviews',
+                         stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {users} users, {titles} titles, {reviews} reviews and '
+            f'{comments} comments in {time.monotonic() - started:.2f}s'))
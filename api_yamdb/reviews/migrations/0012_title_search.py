@@ -0,0 +1,47 @@
+# Generated by Django 2.2.16 on 2026-10-18 18:33
+
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+POSTGRES_INDEXES = (
+    'CREATE INDEX reviews_title_search_vector_idx '
+    'ON reviews_title USING gin (search_vector)',
+    # lets TitleFilter's name__istartswith use an index
+    'CREATE INDEX reviews_title_name_prefix_idx '
+    'ON reviews_title (UPPER(name) varchar_pattern_ops)',
+)
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for sql in POSTGRES_INDEXES:
+        schema_editor.execute(sql)
+    Title = apps.get_model('reviews', 'Title')
+    Title.objects.update(search_vector=(
+        SearchVector('name', weight='A', config='simple')
+        + SearchVector('description', weight='B', config='simple')))
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS reviews_title_name_prefix_idx')
+    schema_editor.execute('DROP INDEX IF EXISTS reviews_title_search_vector_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_modified'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True, verbose_name='Поисковый вектор'),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 2.2.16 on 2026-10-18 19:00
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+
+
+def fill_weighted_ratings(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    weight = settings.RATING_PRIOR_WEIGHT
+    Title.objects.filter(rating_count__gt=0).update(weighted_rating=(
+        (Cast(F('rating_sum'), FloatField())
+         + weight * settings.RATING_PRIOR_MEAN)
+        / (Cast(F('rating_count'), FloatField()) + weight)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0013_title_score_histogram'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='weighted_rating',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Взвешенный рейтинг'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['-weighted_rating', 'id'], name='reviews_tit_weighte_530226_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', '-weighted_rating'], name='reviews_tit_categor_ae9435_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['year', '-weighted_rating'], name='reviews_tit_year_72a4c5_idx'),
+        ),
+        migrations.RunPython(fill_weighted_ratings,
+                             migrations.RunPython.noop),
+    ]
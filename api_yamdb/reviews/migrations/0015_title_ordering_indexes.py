@@ -0,0 +1,57 @@
+# Generated by Django 2.2.16 on 2026-10-18 19:02
+
+from django.db import migrations, models
+
+# ?ordering=-rating sorts unrated titles last, which a backward scan of
+# (rating, id) cannot give on PostgreSQL (DESC means NULLS FIRST there)
+RATING_DESC_INDEX = 'reviews_title_rating_desc_idx'
+
+
+def create_rating_desc_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        f'CREATE INDEX {RATING_DESC_INDEX} '
+        'ON reviews_title (rating DESC NULLS LAST, id DESC)')
+
+
+def drop_rating_desc_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f'DROP INDEX IF EXISTS {RATING_DESC_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0014_title_weighted_rating'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='title',
+            name='reviews_tit_name_2b1433_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='title',
+            name='reviews_tit_year_a04313_idx',
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['name', 'id'], name='reviews_tit_name_fb27bb_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['year', 'id'], name='reviews_tit_year_4911bd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['rating', 'id'], name='reviews_tit_rating_b4cc0e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['rating_count', 'id'], name='reviews_tit_rating__c3dc77_idx'),
+        ),
+        migrations.RunPython(create_rating_desc_index,
+                             drop_rating_desc_index),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from reviews.models.review import Review
 from reviews.models.user import User
 
@@ -18,14 +18,35 @@ class Comment(models.Model):
         auto_now_add=True,
         verbose_name='Дата и время создания комментария')
 
+    modified = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата и время изменения комментария')
+
     review = models.ForeignKey(
         Review,
         on_delete=models.CASCADE,
         related_name='comments',
         verbose_name='Отзыв')
 
+    # review_id as last read from or written to the database; used by the
+    # comment signals to move the counter when a comment changes review.
+    loaded_review_id = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.loaded_review_id = instance.__dict__.get('review_id')
+        return instance
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+
     def __str__(self):
         return self.text[:20]
 
     class Meta:
         ordering = ['-pub_date']
+        indexes = [
+            models.Index(fields=['review', '-pub_date']),
+        ]
@@ -1,5 +1,5 @@
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
 from reviews.models.title import Title
 from reviews.models.user import User
 
@@ -26,6 +26,10 @@ class Review(models.Model):
         auto_now_add=True,
         verbose_name='Дата и время создание отзыва')
 
+    modified = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата и время изменения отзыва')
+
     score = models.PositiveSmallIntegerField(
         verbose_name='Оценка',
         validators=[check_score])
@@ -36,11 +40,35 @@ class Review(models.Model):
         related_name='reviews',
         verbose_name='Произведение')
 
+    # Kept in step with the comments by the comment signals
+    comments_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев')
+
+    # (title_id, score) as last read from or written to the database;
+    # used by the rating signals to compute deltas on edit and delete.
+    loaded_rating = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'title_id' in instance.__dict__ and 'score' in instance.__dict__:
+            instance.loaded_rating = (instance.title_id, instance.score)
+        return instance
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+
     def __str__(self):
         return self.text[:20]
 
     class Meta:
         ordering = ['-pub_date']
+        indexes = [
+            models.Index(fields=['title', '-pub_date']),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['author', 'title'],
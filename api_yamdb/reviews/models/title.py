@@ -1,7 +1,25 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from reviews.models.category import Category
 from reviews.models.genre import Genre
 
+# Scores allowed by check_score, one histogram bucket each
+SCORES = range(1, 11)
+
+
+def score_bucket(score):
+    return f'score_{score}'
+
+
+SCORE_BUCKETS = tuple(score_bucket(score) for score in SCORES)
+
+
+def score_count_field(score):
+    return models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=f'Количество оценок {score}')
+
 
 class Title(models.Model):
 
@@ -31,12 +49,64 @@ class Title(models.Model):
         related_name='titles',
         verbose_name='Категория')
 
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Сумма оценок')
+
+    rating_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок')
+
+    rating = models.FloatField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name='Рейтинг')
+
+    # Bayesian average with the prior from settings, see reviews/ratings.py
+    weighted_rating = models.FloatField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name='Взвешенный рейтинг')
+
+    # Score histogram, kept in step with the reviews like rating_sum
+    score_1 = score_count_field(1)
+    score_2 = score_count_field(2)
+    score_3 = score_count_field(3)
+    score_4 = score_count_field(4)
+    score_5 = score_count_field(5)
+    score_6 = score_count_field(6)
+    score_7 = score_count_field(7)
+    score_8 = score_count_field(8)
+    score_9 = score_count_field(9)
+    score_10 = score_count_field(10)
+
+    modified = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата и время изменения произведения')
+
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        verbose_name='Поисковый вектор')
+
     def __str__(self):
         return self.name
 
     class Meta:
         ordering = ['name']
         indexes = [
-            models.Index(fields=['name']),
-            models.Index(fields=['year']),
+            # ?ordering= on the title list, see TitleFilter; PostgreSQL
+            # also gets (rating DESC NULLS LAST, id DESC), migration 0015
+            models.Index(fields=['name', 'id']),
+            models.Index(fields=['year', 'id']),
+            models.Index(fields=['rating', 'id']),
+            models.Index(fields=['rating_count', 'id']),
+            # top-N by weighted rating, overall and per filter
+            models.Index(fields=['-weighted_rating', 'id']),
+            models.Index(fields=['category', '-weighted_rating']),
+            models.Index(fields=['year', '-weighted_rating']),
         ]
@@ -0,0 +1,217 @@
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import (Avg, Case, Count, F, FloatField,
+                              IntegerField, OuterRef, Subquery, Sum, Value,
+                              When)
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
+from reviews.models.review import Review
+from reviews.models.title import SCORES, Title, score_bucket
+from reviews.versions import bump_version
+
+# One pass over the reviews of a range of titles: the histogram and the
+# rating aggregates of every title, zeros for titles without reviews.
+# The weighted rating is computed as in weighted_rating().
+REBUILD_SQL = '''
+UPDATE {title} SET {buckets},
+    rating_count = scores.total,
+    rating_sum = scores.total_score,
+    rating = CASE WHEN scores.total = 0 THEN NULL
+        ELSE CAST(scores.total_score AS DOUBLE PRECISION) / scores.total END,
+    weighted_rating = CASE WHEN scores.total = 0 THEN NULL
+        ELSE (CAST(scores.total_score AS DOUBLE PRECISION) + %s)
+            / (scores.total + %s) END,
+    modified = %s
+FROM (
+    SELECT t.id, {counts}, COUNT(r.id) AS total,
+        COALESCE(SUM(r.score), 0) AS total_score
+    FROM {title} t LEFT JOIN {review} r ON r.{title_id} = t.id
+    WHERE t.id > %s AND t.id <= %s
+    GROUP BY t.id
+) AS scores
+WHERE {title}.id = scores.id
+'''
+
+
+def weighted_rating(rating_sum, rating_count):
+    """Bayesian average of the scores and the prior from settings.
+
+    As if every title also had ``RATING_PRIOR_WEIGHT`` scores of
+    ``RATING_PRIOR_MEAN``: a single 10 ranks below a hundred 9s.
+    """
+    weight = settings.RATING_PRIOR_WEIGHT
+    return ((Cast(rating_sum, FloatField())
+             + weight * settings.RATING_PRIOR_MEAN)
+            / (Cast(rating_count, FloatField()) + weight))
+
+
+def apply_rating_delta(title_id, added=None, removed=None):
+    """Add and/or remove one score of a title in one UPDATE.
+
+    Moves the rating aggregates and the histogram buckets. Every
+    right-hand side references the values the row had before the
+    statement, so concurrent writers never lose each other's deltas.
+    The title is marked as modified even when nothing else changes.
+    """
+    score_delta = (added or 0) - (removed or 0)
+    count_delta = (added is not None) - (removed is not None)
+    count = F('rating_count') + count_delta
+    buckets = {}
+    if added != removed:
+        if added is not None:
+            buckets[score_bucket(added)] = F(score_bucket(added)) + 1
+        if removed is not None:
+            buckets[score_bucket(removed)] = F(score_bucket(removed)) - 1
+    Title.objects.filter(pk=title_id).update(
+        modified=timezone.now(),
+        rating_sum=F('rating_sum') + score_delta,
+        rating_count=count,
+        rating=Case(
+            When(rating_count=-count_delta, then=Value(None)),
+            default=(Cast(F('rating_sum') + score_delta, FloatField())
+                     / count),
+            output_field=FloatField()),
+        weighted_rating=Case(
+            When(rating_count=-count_delta, then=Value(None)),
+            default=weighted_rating(F('rating_sum') + score_delta, count),
+            output_field=FloatField()),
+        **buckets)
+
+
+def per_title(deltas):
+    """``CASE`` giving each title of ``{title_id: delta}`` its delta.
+
+    Titles with the same delta share one ``WHEN``, so the statement
+    stays short when many titles change by the same amount.
+    """
+    by_delta = defaultdict(list)
+    for title_id, delta in deltas.items():
+        by_delta[delta].append(title_id)
+    return Case(*(When(pk__in=title_ids, then=Value(delta))
+                  for delta, title_ids in by_delta.items()),
+                default=Value(0), output_field=IntegerField())
+
+
+def remove_scores(scores):
+    """Take ``(title_id, score)`` pairs off their titles in one UPDATE.
+
+    The set-based counterpart of ``apply_rating_delta(removed=...)`` for
+    bulk deletes, with the same concurrency guarantees.
+    """
+    removed = defaultdict(Counter)
+    for title_id, score in scores:
+        removed[title_id][score] += 1
+    if not removed:
+        return
+    count_delta = per_title({title_id: sum(counts.values())
+                             for title_id, counts in removed.items()})
+    count = F('rating_count') - count_delta
+    rating_sum = F('rating_sum') - per_title({
+        title_id: sum(score * number for score, number in counts.items())
+        for title_id, counts in removed.items()})
+    buckets = {
+        score_bucket(score): F(score_bucket(score)) - per_title({
+            title_id: counts[score]
+            for title_id, counts in removed.items() if score in counts})
+        for score in SCORES
+        if any(score in counts for counts in removed.values())}
+    Title.objects.filter(pk__in=removed).update(
+        modified=timezone.now(),
+        rating_sum=rating_sum,
+        rating_count=count,
+        rating=Case(
+            When(rating_count=count_delta, then=Value(None)),
+            default=Cast(rating_sum, FloatField()) / count,
+            output_field=FloatField()),
+        weighted_rating=Case(
+            When(rating_count=count_delta, then=Value(None)),
+            default=weighted_rating(rating_sum, count),
+            output_field=FloatField()),
+        **buckets)
+
+
+def rebuild_ratings(queryset=None):
+    """Recompute the stored rating aggregates from the reviews table.
+
+    Runs a single set-based UPDATE over ``queryset`` (all titles by
+    default) and returns the number of updated rows. Meant for a few
+    titles; ``rebuild_title_range`` suits the whole table.
+    """
+    if queryset is None:
+        queryset = Title.objects.all()
+    reviews = (Review.objects.filter(title=OuterRef('pk'))
+               .order_by().values('title'))
+    updated = queryset.update(
+        modified=timezone.now(),
+        rating_sum=Coalesce(
+            Subquery(reviews.annotate(s=Sum('score')).values('s')), 0),
+        rating_count=Coalesce(
+            Subquery(reviews.annotate(c=Count('pk')).values('c')), 0),
+        rating=Subquery(
+            reviews.annotate(a=Avg('score')).values('a'),
+            output_field=FloatField()),
+        **{score_bucket(score): Coalesce(Subquery(
+            reviews.filter(score=score).annotate(c=Count('pk')).values('c')),
+            0) for score in SCORES})
+    queryset.update(weighted_rating=Case(
+        When(rating_count=0, then=Value(None)),
+        default=weighted_rating(F('rating_sum'), F('rating_count')),
+        output_field=FloatField()))
+    bump_version(Title)
+    return updated
+
+
+def rebuild_title_range(after_id, last_id):
+    """Recompute histograms and ratings of ``after_id < pk <= last_id``.
+
+    Counts the scores of the range with one grouped scan of its reviews
+    and writes every title once, see ``REBUILD_SQL``. Returns the number
+    of updated titles; bump the Title version when done.
+    """
+    quote = connection.ops.quote_name
+    sql = REBUILD_SQL.format(
+        title=quote(Title._meta.db_table),
+        review=quote(Review._meta.db_table),
+        title_id=Review._meta.get_field('title').column,
+        buckets=', '.join(f'{score_bucket(score)} = scores.s{score}'
+                          for score in SCORES),
+        counts=', '.join(f'COUNT(CASE WHEN r.score = {score} THEN 1 END) '
+                         f'AS s{score}' for score in SCORES))
+    with connection.cursor() as cursor:
+        weight = settings.RATING_PRIOR_WEIGHT
+        cursor.execute(sql, [weight * settings.RATING_PRIOR_MEAN, weight,
+                             timezone.now(), after_id, last_id])
+        return cursor.rowcount
+
+
+def get_score_stats(title):
+    """Histogram, count, mean and median of the scores of ``title``."""
+    histogram = {score: getattr(title, score_bucket(score))
+                 for score in SCORES}
+    count = sum(histogram.values())
+    return {
+        'count': count,
+        'mean': (round(sum(score * number
+                           for score, number in histogram.items()) / count,
+                       2) if count else None),
+        'median': histogram_median(histogram, count),
+        'histogram': {str(score): number
+                      for score, number in histogram.items()},
+    }
+
+
+def histogram_median(histogram, count):
+    """Median of ``count`` scores given as ``{score: number}``."""
+    if not count:
+        return None
+
+    def score_at(position):
+        seen = 0
+        for score, number in sorted(histogram.items()):
+            seen += number
+            if seen >= position:
+                return score
+
+    return (score_at((count + 1) // 2) + score_at(count // 2 + 1)) / 2
@@ -0,0 +1,178 @@
+import re
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                            SearchVector)
+from django.db import connection
+from django.db.models import Case, F, FloatField, Value, When
+from reviews.models.title import Title
+
+SEARCH_CONFIG = 'simple'
+MAX_RESULTS = 1000
+NAME_WEIGHT = 2
+DESCRIPTION_WEIGHT = 1
+
+TOKEN_RE = re.compile(r'\w+')
+
+
+def tokenize(text):
+    return TOKEN_RE.findall((text or '').lower())
+
+
+def uses_postgres():
+    return connection.vendor == 'postgresql'
+
+
+def title_search_vector():
+    return (SearchVector('name', weight='A', config=SEARCH_CONFIG)
+            + SearchVector('description', weight='B', config=SEARCH_CONFIG))
+
+
+def update_search_vectors(queryset=None):
+    """Recompute ``Title.search_vector``; a no-op outside PostgreSQL."""
+    if not uses_postgres():
+        return 0
+    if queryset is None:
+        queryset = Title.objects.all()
+    return queryset.update(search_vector=title_search_vector())
+
+
+class InvertedIndex:
+    """In-process prefix index over title names and descriptions.
+
+    Used where the database has no full-text search. The index is built
+    lazily and catches up with writes from other processes through
+    ``Title.modified`` before every search; titles deleted elsewhere
+    drop out when the results are intersected with the queryset.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.postings = defaultdict(dict)
+            self.documents = {}
+            self.tokens = []
+            self.synced_at = None
+            self.dirty = False
+
+    # add() and drop() expect self.lock to be held, see sync() and remove()
+
+    def add(self, pk, name, description):
+        self.drop(pk)
+        weights = {}
+        for token in tokenize(description):
+            weights[token] = DESCRIPTION_WEIGHT
+        for token in tokenize(name):
+            weights[token] = NAME_WEIGHT
+        for token, weight in weights.items():
+            self.postings[token][pk] = weight
+        self.documents[pk] = tuple(weights)
+        self.dirty = True
+
+    def drop(self, pk):
+        for token in self.documents.pop(pk, ()):
+            self.postings[token].pop(pk, None)
+
+    def remove(self, pk):
+        """Forget a deleted title; safe to call while others search."""
+        with self.lock:
+            self.drop(pk)
+
+    def sync(self):
+        titles = Title.objects.order_by()
+        if self.synced_at is not None:
+            titles = titles.filter(modified__gte=self.synced_at)
+        for pk, name, description, modified in titles.values_list(
+                'pk', 'name', 'description', 'modified').iterator():
+            self.add(pk, name, description)
+            if self.synced_at is None or modified > self.synced_at:
+                self.synced_at = modified
+
+    def matches(self, prefix):
+        if self.dirty:
+            self.tokens = sorted(t for t, docs in self.postings.items()
+                                 if docs)
+            self.dirty = False
+        scores = {}
+        start = bisect_left(self.tokens, prefix)
+        for token in self.tokens[start:]:
+            if not token.startswith(prefix):
+                break
+            # exact token matches outrank prefix matches
+            bonus = 0.5 if token == prefix else 0
+            for pk, weight in self.postings[token].items():
+                scores[pk] = max(scores.get(pk, 0), weight + bonus)
+        return scores
+
+    def search(self, text):
+        """Return ``{pk: score}`` of titles matching every query token."""
+        tokens = tokenize(text)
+        if not tokens:
+            return {}
+        with self.lock:
+            self.sync()
+            result = None
+            for token in tokens:
+                scores = self.matches(token)
+                if result is None:
+                    result = scores
+                else:
+                    result = {pk: result[pk] + score
+                              for pk, score in scores.items()
+                              if pk in result}
+                if not result:
+                    return {}
+            return result
+
+
+index = InvertedIndex()
+
+
+def match_ranked(queryset, ranked):
+    """Keep the best ``MAX_RESULTS`` of ``ranked`` pks that ``queryset`` has.
+
+    The cap comes after the intersection: the queryset may be filtered
+    by category, genre or year, or the index may still list deleted
+    titles, and capping first would drop matching titles silently.
+    Pks are checked ``MAX_RESULTS`` at a time, best first.
+    """
+    matched = []
+    for start in range(0, len(ranked), MAX_RESULTS):
+        chunk = ranked[start:start + MAX_RESULTS]
+        present = set(queryset.order_by().filter(pk__in=chunk).values_list(
+            'pk', flat=True))
+        matched.extend(pk for pk in chunk if pk in present)
+        if len(matched) >= MAX_RESULTS:
+            break
+    return matched[:MAX_RESULTS]
+
+
+def search_titles(queryset, text):
+    """Filter ``queryset`` to titles matching ``text``, best first."""
+    tokens = tokenize(text)
+    if not tokens:
+        return queryset
+    if uses_postgres():
+        query = SearchQuery(' & '.join(f'{token}:*' for token in tokens),
+                            config=SEARCH_CONFIG, search_type='raw')
+        return queryset.filter(search_vector=query).annotate(
+            search_rank=SearchRank(F('search_vector'), query)
+        ).order_by('-search_rank', 'name')
+
+    scores = index.search(text)
+    ranked = match_ranked(
+        queryset, sorted(scores, key=lambda pk: -scores[pk]))
+    by_score = defaultdict(list)
+    for pk in ranked:
+        by_score[scores[pk]].append(pk)
+    return queryset.filter(pk__in=ranked).annotate(
+        search_rank=Case(
+            *[When(pk__in=pks, then=Value(score))
+              for score, pks in by_score.items()],
+            default=Value(0), output_field=FloatField())
+    ).order_by('-search_rank', 'name')
@@ -0,0 +1,111 @@
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from reviews.models.category import Category
+from reviews.models.comment import Comment
+from reviews.models.genre import Genre
+from reviews.models.review import Review
+from reviews.models.title import Title
+from reviews.ratings import apply_rating_delta, rebuild_ratings
+from reviews.search import index, update_search_vectors
+from reviews.versions import bump_version
+
+# Models whose cached representations go stale when the key model is
+# written; reviews change the stored rating of their title and comments
+# the stored comment count of their review.
+VERSION_DEPENDENTS = {
+    Category: (Category,),
+    Genre: (Genre,),
+    Title: (Title,),
+    Review: (Review, Title),
+    Comment: (Comment, Review),
+}
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        apply_rating_delta(instance.title_id, added=instance.score)
+    elif instance.loaded_rating is None:
+        rebuild_ratings(Title.objects.filter(pk=instance.title_id))
+    else:
+        old_title_id, old_score = instance.loaded_rating
+        if old_title_id != instance.title_id:
+            apply_rating_delta(old_title_id, removed=old_score)
+            apply_rating_delta(instance.title_id, added=instance.score)
+        else:
+            apply_rating_delta(instance.title_id, added=instance.score,
+                               removed=old_score)
+    instance.loaded_rating = (instance.title_id, instance.score)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    title_id, score = instance.loaded_rating or (instance.title_id,
+                                                 instance.score)
+    apply_rating_delta(title_id, removed=score)
+
+
+def model_written(sender, raw=False, **kwargs):
+    if not raw:
+        bump_version(*VERSION_DEPENDENTS[sender])
+
+
+for model in VERSION_DEPENDENTS:
+    post_save.connect(model_written, sender=model)
+    post_delete.connect(model_written, sender=model)
+
+
+@receiver(post_save, sender=Title)
+def title_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        update_search_vectors(Title.objects.filter(pk=instance.pk))
+
+
+@receiver(post_delete, sender=Title)
+def title_deleted(sender, instance, **kwargs):
+    index.remove(instance.pk)
+
+
+def touch_review(review_id, delta=0):
+    Review.objects.filter(pk=review_id).update(
+        modified=timezone.now(),
+        comments_count=F('comments_count') + delta)
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old_review_id = instance.loaded_review_id
+    if created:
+        touch_review(instance.review_id, 1)
+    elif old_review_id not in (None, instance.review_id):
+        touch_review(old_review_id, -1)
+        touch_review(instance.review_id, 1)
+    else:
+        touch_review(instance.review_id)
+    instance.loaded_review_id = instance.review_id
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    touch_review(instance.loaded_review_id or instance.review_id, -1)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    if not action.startswith('post_'):
+        return
+    bump_version(Title)
+    if not reverse:
+        titles = Title.objects.filter(pk=instance.pk)
+    elif pk_set:
+        titles = Title.objects.filter(pk__in=pk_set)
+    else:
+        return
+    titles.update(modified=timezone.now())
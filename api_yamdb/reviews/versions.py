@@ -0,0 +1,51 @@
+import time
+
+from django.core.cache import cache
+
+VERSION_KEY = 'model-version:{}'
+INSTANCE_VERSION_KEY = 'instance-version:{}:{}'
+
+
+def _key(model):
+    return VERSION_KEY.format(model._meta.label_lower)
+
+
+def _instance_key(model, pk):
+    return INSTANCE_VERSION_KEY.format(model._meta.label_lower, pk)
+
+
+def _new_version():
+    # Nanosecond timestamps never repeat a value a cache entry could
+    # have been stored under, even after the version key was evicted.
+    return time.time_ns()
+
+
+def _get_or_init(keys):
+    stored = cache.get_many(keys)
+    for key in keys:
+        if key not in stored:
+            version = _new_version()
+            if not cache.add(key, version, timeout=None):
+                version = cache.get(key, version)
+            stored[key] = version
+    return tuple(stored[key] for key in keys)
+
+
+def get_versions(*models):
+    """Return the current version of every model, in the given order."""
+    return _get_or_init([_key(model) for model in models])
+
+
+def bump_version(*models):
+    """Mark every cached representation of ``models`` as outdated."""
+    version = _new_version()
+    cache.set_many({_key(model): version for model in models}, timeout=None)
+
+
+def get_instance_version(model, pk):
+    """Return the current version of a single row of ``model``."""
+    return _get_or_init([_instance_key(model, pk)])[0]
+
+
+def bump_instance_version(model, pk):
+    cache.set(_instance_key(model, pk), _new_version(), timeout=None)
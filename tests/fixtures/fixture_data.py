@@ -0,0 +1,67 @@
+import itertools
+
+import pytest
+from api.authentication import user_cache
+from django.core.cache import cache
+from reviews.models import Category, Comment, Genre, Review, Title, User
+
+_sequence = itertools.count()
+
+
+def make_titles(count, genres=2):
+    """Create ``count`` titles, each with its own category and genres."""
+    titles = []
+    for _ in range(count):
+        n = next(_sequence)
+        category = Category.objects.create(name=f'Cat {n}', slug=f'cat-{n}')
+        title = Title.objects.create(
+            name=f'Title {n}', year=2000, category=category)
+        title.genre.set([
+            Genre.objects.create(name=f'Genre {n}-{i}', slug=f'gen-{n}-{i}')
+            for i in range(genres)])
+        titles.append(title)
+    return titles
+
+
+def make_reviews(title, count, comments=0):
+    """Add ``count`` reviews by new authors, each with ``comments``."""
+    reviews = []
+    for _ in range(count):
+        n = next(_sequence)
+        author = User.objects.create(
+            username=f'author{n}', email=f'author{n}@yamdb.fake')
+        review = Review.objects.create(
+            title=title, author=author, text=f'Review {n}', score=n % 10 + 1)
+        for _ in range(comments):
+            Comment.objects.create(
+                review=review, author=author, text=f'Comment {n}')
+        reviews.append(review)
+    return reviews
+
+
+def make_comments(review, count):
+    """Add ``count`` comments to ``review``, each by a new author."""
+    comments = []
+    for _ in range(count):
+        n = next(_sequence)
+        author = User.objects.create(
+            username=f'author{n}', email=f'author{n}@yamdb.fake')
+        comments.append(Comment.objects.create(
+            review=review, author=author, text=f'Comment {n}'))
+    return comments
+
+
+@pytest.fixture
+def title():
+    return make_titles(1)[0]
+
+
+@pytest.fixture
+def review(title):
+    return make_reviews(title, 1)[0]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    user_cache.clear()
@@ -0,0 +1,46 @@
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def _describe(context):
+    return '\n'.join(
+        f'{i}. {query["sql"]}'
+        for i, query in enumerate(context.captured_queries, start=1))
+
+
+@contextmanager
+def query_budget(budget, using=DEFAULT_DB_ALIAS, label='block'):
+    """Fail if the wrapped block runs more than ``budget`` queries."""
+    with CaptureQueriesContext(connections[using]) as context:
+        yield context
+    if len(context) > budget:
+        raise QueryBudgetExceeded(
+            f'{label} ran {len(context)} queries, budget is {budget}:\n'
+            f'{_describe(context)}')
+
+
+def assert_query_budget(request, grow, budget, steps=2,
+                        using=DEFAULT_DB_ALIAS, label='endpoint'):
+    """Check that ``request`` stays within ``budget`` as data grows.
+
+    ``request`` is called once per step and ``grow`` adds data between
+    the calls; the query count must not exceed ``budget`` and must not
+    change between steps, which is what an N+1 looks like.
+    """
+    counts = []
+    for step in range(steps + 1):
+        if step:
+            grow(step)
+        with query_budget(budget, using=using, label=label) as context:
+            request()
+        counts.append(len(context))
+    if len(set(counts)) != 1:
+        raise QueryBudgetExceeded(
+            f'{label} query count grows with data: {counts}')
+    return counts[0]
@@ -0,0 +1,87 @@
+import asyncio
+import json
+import os
+import threading
+
+import pytest
+from api.asgi import ASGIHandler
+from django.core.wsgi import get_wsgi_application
+from reviews.management.commands.benchmark_serving import tree_rss
+
+
+def call(application, method, path, body=b'', headers=()):
+    """Run one request through the ASGI application."""
+    messages = []
+    incoming = [{'type': 'http.request', 'body': body}]
+
+    async def receive():
+        return incoming.pop(0)
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {'type': 'http', 'method': method, 'path': path,
+             'query_string': b'', 'headers': [
+                 (b'host', b'localhost'), *headers],
+             'server': ('localhost', 80)}
+    asyncio.run(application(scope, receive, send))
+    start, *chunks = messages
+    return start['status'], b''.join(chunk['body'] for chunk in chunks)
+
+
+@pytest.fixture
+def application(settings):
+    settings.ALLOWED_HOSTS = ['localhost']
+    threads = []
+    wsgi_application = get_wsgi_application()
+
+    def recording(environ, start_response):
+        threads.append(threading.current_thread().name)
+        return wsgi_application(environ, start_response)
+
+    handler = ASGIHandler(recording)
+    handler.threads = threads
+    yield handler
+    handler.read_pool.shutdown()
+    handler.pool.shutdown()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestASGI:
+
+    def test_public_read(self, application, client, title):
+        status, body = call(application, 'GET', '/api/v1/titles/')
+        assert status == 200
+        expected = client.get('/api/v1/titles/', HTTP_HOST='localhost')
+        assert json.loads(body) == expected.json()
+        assert application.threads[0].startswith('asgi-read'), (
+            'Проверьте, что публичное чтение идёт в отдельный пул потоков'
+        )
+
+    def test_write_uses_shared_pool(self, application):
+        status, body = call(
+            application, 'POST', '/api/v1/auth/signup/',
+            body=b'{"username": "x"}',
+            headers=[(b'content-type', b'application/json')])
+        assert status == 400
+        assert 'email' in json.loads(body)
+        assert not application.threads[0].startswith('asgi-read')
+
+    def test_lifespan(self, application):
+        incoming = [{'type': 'lifespan.startup'},
+                    {'type': 'lifespan.shutdown'}]
+        sent = []
+
+        async def receive():
+            return incoming.pop(0)
+
+        async def send(message):
+            sent.append(message['type'])
+
+        asyncio.run(application({'type': 'lifespan'}, receive, send))
+        assert sent == ['lifespan.startup.complete',
+                        'lifespan.shutdown.complete']
+
+
+def test_tree_rss():
+    assert tree_rss(os.getpid()) > 0
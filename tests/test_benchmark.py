@@ -0,0 +1,61 @@
+import io
+import json
+
+import pytest
+from django.core.management import CommandError, call_command
+from reviews.models import Comment, Review, Title, User
+
+
+@pytest.mark.django_db
+class TestBenchmark:
+
+    @pytest.fixture
+    def dataset(self):
+        call_command('seed_dataset', '--users', '5', '--categories', '2',
+                     '--genres', '3', '--titles', '20', '--reviews', '60',
+                     '--comments', '90', verbosity=0)
+
+    def test_seed_dataset(self, dataset):
+        assert (Title.objects.count(), Review.objects.count(),
+                Comment.objects.count(), User.objects.count()) == (
+                    20, 60, 90, 5)
+        title = Title.objects.first()
+        scores = list(title.reviews.values_list('score', flat=True))
+        assert title.rating_count == len(scores) == 3
+        assert title.rating == sum(scores) / len(scores)
+        assert title.genre.count() == 2
+
+    def test_seed_dataset_is_appended(self, dataset):
+        call_command('seed_dataset', '--users', '1', '--categories', '1',
+                     '--genres', '2', '--titles', '1', '--reviews', '1',
+                     '--comments', '1', verbosity=0)
+        assert Title.objects.count() == 21
+
+    def test_seed_dataset_checks_sizes(self):
+        with pytest.raises(CommandError):
+            call_command('seed_dataset', '--users', '2', '--titles', '3',
+                         '--reviews', '7', '--comments', '0')
+
+    def test_report_and_compare(self, dataset, tmp_path):
+        output = tmp_path / 'run.json'
+        call_command('benchmark', '--requests', '3', '--warmup', '0',
+                     '--sample', '5', '--routes', 'titles-list', 'users-me',
+                     '--output', str(output), stderr=io.StringIO())
+        report = json.loads(output.read_text())
+        assert [(item['route'], item['audience'])
+                for item in report['results']] == [
+            ('titles-list', 'anonymous'), ('titles-list', 'user'),
+            ('users-me', 'user')]
+        assert all(item['errors'] == 0 for item in report['results'])
+        assert set(report['results'][0]['latency_ms']) == {
+            'mean', 'p50', 'p95', 'p99', 'max'}
+
+        for item in report['results']:
+            item['latency_ms']['p95'] = 0.001
+        output.write_text(json.dumps(report))
+        with pytest.raises(CommandError, match='p95 regressed on 3 routes'):
+            call_command('benchmark', '--requests', '3', '--warmup', '0',
+                         '--sample', '5', '--routes', 'titles-list',
+                         'users-me', '--compare', str(output),
+                         '--output', str(tmp_path / 'next.json'),
+                         stderr=io.StringIO())
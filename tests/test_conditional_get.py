@@ -0,0 +1,64 @@
+import pytest
+from reviews.models import Category, Comment
+
+from .fixtures.fixture_data import make_reviews
+from .query_budget import query_budget
+
+
+def revalidate(client, url, response):
+    return client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+
+    def test_title_detail(self, guest_client, title):
+        url = f'/api/v1/titles/{title.id}/'
+        response = guest_client.get(url)
+        assert response.status_code == 200
+        assert response.has_header('Last-Modified')
+        with query_budget(1, label='304 for title detail'):
+            not_modified = revalidate(guest_client, url, response)
+        assert not_modified.status_code == 304
+        assert not_modified['ETag'] == response['ETag']
+
+        Category.objects.filter(pk=title.category_id).get().save()
+        assert revalidate(guest_client, url, response).status_code == 200, (
+            'Проверьте, что изменение категории меняет ETag произведения'
+        )
+
+    def test_review_list_changes_with_reviews(self, guest_client, title):
+        review = make_reviews(title, 2)[0]
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        response = guest_client.get(url)
+        assert revalidate(guest_client, url, response).status_code == 304
+
+        review.text = 'Новый текст'
+        review.save()
+        response = revalidate(guest_client, url, response)
+        assert response.status_code == 200
+
+        review.delete()
+        assert revalidate(guest_client, url, response).status_code == 200
+
+    def test_comment_list_changes_with_comments(self, user_client, review):
+        url = (f'/api/v1/titles/{review.title_id}/reviews/'
+               f'{review.id}/comments/')
+        response = user_client.get(url)
+        assert revalidate(user_client, url, response).status_code == 304
+        Comment.objects.create(review=review, author=review.author, text='!')
+        assert revalidate(user_client, url, response).status_code == 200
+
+    def test_missing_resource(self, guest_client):
+        assert guest_client.get('/api/v1/titles/100500/').status_code == 404
+        assert guest_client.get(
+            '/api/v1/titles/100500/reviews/').status_code == 404
+
+    def test_non_numeric_id(self, guest_client, review):
+        title_url = f'/api/v1/titles/{review.title_id}/'
+        for url in ('/api/v1/titles/abc/',
+                    f'{title_url}reviews/abc/',
+                    f'{title_url}reviews/{review.id}/comments/abc/'):
+            assert guest_client.get(url).status_code == 404, (
+                f'Проверьте, что {url} отвечает 404, а не 500'
+            )
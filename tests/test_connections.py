@@ -0,0 +1,96 @@
+import io
+import json
+import time
+
+import pytest
+from api.connections import check_connections
+from api_yamdb.postgresql_pool.base import ConnectionPool, Database
+from django.core.management import call_command
+from django.db import connection
+from psycopg2 import extensions
+
+
+class FakeConnection:
+    """Stands in for a raw psycopg2 connection in the pool tests."""
+
+    def __init__(self, alive=True):
+        self.closed = 0
+        self.alive = alive
+
+    def get_transaction_status(self):
+        return extensions.TRANSACTION_STATUS_IDLE
+
+    def cursor(self):
+        if not self.alive:
+            raise Database.OperationalError('server closed the connection')
+        return io.StringIO()
+
+    def close(self):
+        self.closed = 1
+
+
+@pytest.mark.django_db
+class TestHealthCheck:
+
+    @pytest.fixture
+    def dead(self, monkeypatch):
+        connection.ensure_connection()
+        closed = []
+        monkeypatch.setattr(connection, 'is_usable', lambda: False)
+        monkeypatch.setattr(connection, 'close', lambda: closed.append(1))
+        return closed
+
+    def test_idle_dead_connection_is_closed(self, dead, settings):
+        settings.CONN_HEALTH_CHECK_IDLE = 10
+        connection.released_at = time.monotonic() - 60
+        check_connections()
+        assert dead == [1], (
+            'Проверьте, что мёртвое соединение закрывается до запроса'
+        )
+
+    def test_recently_used_connection_is_not_pinged(self, dead, settings):
+        settings.CONN_HEALTH_CHECK_IDLE = 10
+        connection.released_at = time.monotonic()
+        check_connections()
+        assert dead == []
+
+
+class TestConnectionPool:
+
+    def test_size_is_bounded(self):
+        pool = ConnectionPool(size=1, timeout=0.01, max_lifetime=60,
+                              check_idle=10)
+        raw = pool.acquire(FakeConnection)
+        with pytest.raises(Database.OperationalError):
+            pool.acquire(FakeConnection)
+        pool.release(raw)
+        assert pool.acquire(FakeConnection) is raw, (
+            'Проверьте, что возвращённое соединение используется повторно'
+        )
+
+    def test_dead_and_old_connections_are_replaced(self):
+        pool = ConnectionPool(size=2, timeout=0.01, max_lifetime=60,
+                              check_idle=0)
+        dead = pool.acquire(lambda: FakeConnection(alive=False))
+        pool.release(dead)
+        fresh = pool.acquire(FakeConnection)
+        assert fresh is not dead and dead.closed
+
+        pool.max_lifetime = 0
+        pool.release(fresh)
+        assert fresh.closed and not pool.idle
+
+
+@pytest.mark.django_db(transaction=True)
+def test_benchmark_connections(tmp_path, title):
+    output = tmp_path / 'connections.json'
+    call_command('benchmark_connections', '--requests', '3', '--warmup',
+                 '1', '--output', str(output), stderr=io.StringIO())
+    report = json.loads(output.read_text())
+    assert [item['mode'] for item in report['results']] == [
+        'per-request', 'persistent', 'persistent-checked']
+    assert all(item['errors'] == 0 for item in report['results'])
+    assert report['results'][1]['connections_opened'] == 0, (
+        'Проверьте, что постоянное соединение не открывается заново'
+    )
+    assert 'saved_ms' in report
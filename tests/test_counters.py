@@ -0,0 +1,77 @@
+import io
+
+import pytest
+from django.core.management import call_command
+from reviews.models import Comment, Review, Title
+
+from .fixtures.fixture_data import make_reviews, make_titles
+
+
+def counts(*instances):
+    return [type(instance).objects.values_list(
+        'rating_count' if isinstance(instance, Title) else 'comments_count',
+        flat=True).get(pk=instance.pk) for instance in instances]
+
+
+@pytest.mark.django_db
+class TestCounters:
+
+    def test_follow_writes(self, title):
+        first, second = make_reviews(title, 2, comments=2)
+        assert counts(title, first, second) == [2, 2, 2]
+        first.comments.first().delete()
+        assert counts(first) == [1]
+        comment = Comment.objects.get(pk=second.comments.first().pk)
+        comment.review = first
+        comment.save()
+        assert counts(first, second) == [2, 1], (
+            'Проверьте, что счётчик переносится вместе с комментарием'
+        )
+        second.delete()
+        assert counts(title) == [1]
+
+    def test_follow_cascades(self):
+        title, other = make_titles(2)
+        review, = make_reviews(title, 1, comments=1)
+        kept, = make_reviews(other, 1, comments=1)
+        Comment.objects.create(review=kept, author=review.author, text='t')
+        assert counts(other, kept) == [1, 2]
+        make_reviews(other, 1)[0].author.delete()
+        review.author.delete()
+        assert counts(other, kept) == [1, 1], (
+            'Проверьте, что удаление пользователя уменьшает счётчики'
+        )
+        title.delete()
+        assert not Comment.objects.filter(review=review).exists()
+        assert counts(other, kept) == [1, 1]
+
+    def test_in_payloads(self, guest_client, title):
+        review, = make_reviews(title, 1, comments=3)
+        item = guest_client.get('/api/v1/titles/').data['results'][0]
+        assert item['reviews_count'] == 1
+        item = guest_client.get(f'/api/v1/titles/{title.id}/').data
+        assert item['reviews_count'] == 1
+        item = guest_client.get(
+            f'/api/v1/titles/{title.id}/reviews/').data['results'][0]
+        assert item['comments_count'] == 3
+        Comment.objects.filter(pk=review.comments.first().pk).delete()
+        item = guest_client.get(
+            f'/api/v1/titles/{title.id}/reviews/').data['results'][0]
+        assert item['comments_count'] == 2, (
+            'Проверьте, что кэш списка отзывов сбрасывается комментариями'
+        )
+
+    def test_rebuild_counters(self, title):
+        review, = make_reviews(title, 1, comments=2)
+        Review.objects.update(comments_count=7)
+        Title.objects.update(rating_count=0)
+        out = io.StringIO()
+        call_command('rebuild_counters', stdout=out)
+        assert counts(title, review) == [1, 2]
+        assert 'Rebuilt counters of 1 reviews' in out.getvalue()
+        out = io.StringIO()
+        call_command('rebuild_counters', '--models', 'reviews',
+                     stdout=out)
+        assert 'Rebuilt counters of 0 reviews' in out.getvalue(), (
+            'Проверьте, что верные счётчики не перезаписываются'
+        )
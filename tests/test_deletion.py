@@ -0,0 +1,131 @@
+import pytest
+from django.core.management import call_command
+from jobs.models import Job
+from reviews.deletion import delete_rows, delete_title, delete_user
+from reviews.models import Comment, Review, Title, User
+from reviews.models.title import SCORE_BUCKETS
+from reviews.ratings import rebuild_ratings
+
+from .fixtures.fixture_data import make_reviews, make_titles
+from .query_budget import query_budget
+
+
+@pytest.mark.django_db
+class TestBulkDeletion:
+
+    @pytest.fixture
+    def busy(self):
+        """Two titles; the author of the first review is everywhere."""
+        title, other = make_titles(2)
+        first, second = make_reviews(title, 2, comments=2)
+        author = first.author
+        kept, = make_reviews(other, 1, comments=1)
+        Review.objects.create(title=other, author=author, text='t', score=4)
+        Comment.objects.create(review=kept, author=author, text='t')
+        Comment.objects.create(review=second, author=author, text='t')
+        return title, other, author, second, kept
+
+    def test_delete_user_keeps_counters(self, busy):
+        title, other, author, second, kept = busy
+        assert delete_user(author.pk, chunk_size=1) == 7
+        assert not User.objects.filter(pk=author.pk).exists()
+        assert not Review.objects.filter(author=author).exists()
+        assert not Comment.objects.filter(author=author).exists()
+        kept.refresh_from_db()
+        second.refresh_from_db()
+        assert (kept.comments_count, second.comments_count) == (1, 2), (
+            'Проверьте, что удаление комментариев пользователя '
+            'уменьшает счётчики отзывов'
+        )
+        other.refresh_from_db()
+        title.refresh_from_db()
+        assert (other.rating_count, other.rating_sum) == (1, kept.score)
+        assert (title.rating_count, title.rating) == (1, second.score)
+        assert title.weighted_rating is not None
+
+    def test_delete_title(self, busy):
+        title, other, author, _, kept = busy
+        assert delete_title(title.pk, chunk_size=2) == 10
+        assert not Title.objects.filter(pk=title.pk).exists()
+        assert not Review.objects.filter(title_id=title.pk).exists()
+        assert Comment.objects.count() == 2
+        assert delete_title(title.pk) == 0
+
+    def test_does_not_load_dependents(self, busy):
+        title = busy[0]
+        make_reviews(title, 20, comments=1)
+        with query_budget(14, label='delete_title'):
+            delete_title(title.pk, chunk_size=100)
+
+    def test_ratings_match_a_rebuild(self, busy):
+        author = busy[2]
+        for title in make_titles(5):
+            Review.objects.create(title=title, author=author, text='t',
+                                  score=title.pk % 10 + 1)
+            make_reviews(title, 2)
+        delete_user(author.pk)
+        fields = ('rating_sum', 'rating_count', 'rating', 'weighted_rating',
+                  *SCORE_BUCKETS)
+        kept = list(Title.objects.order_by('pk').values_list(*fields))
+        rebuild_ratings()
+        assert kept == list(
+            Title.objects.order_by('pk').values_list(*fields)), (
+            'Проверьте, что удаление пачкой оставляет рейтинги верными'
+        )
+
+    def test_one_rating_update_per_chunk(self, busy):
+        author = busy[2]
+        for title in make_titles(12):
+            Review.objects.create(title=title, author=author, text='t',
+                                  score=title.pk % 10 + 1)
+        with query_budget(23, label='delete_user'):
+            delete_user(author.pk, chunk_size=100)
+
+    def test_rows_deleted_elsewhere_are_not_counted(self, busy):
+        review = Review.objects.filter(author=busy[2]).first()
+        Comment.objects.filter(review=review).delete()
+        assert len(delete_rows(Review, [review.pk], ('id', 'score'))) == 1
+        assert delete_rows(Review, [review.pk], ('id', 'score')) == [], (
+            'Проверьте, что счётчики правятся только по удалённым строкам'
+        )
+
+    def test_small_delete_is_immediate(self, admin_client, busy):
+        title = busy[0]
+        response = admin_client.delete(f'/api/v1/titles/{title.id}/')
+        assert response.status_code == 204
+        assert not Title.objects.filter(pk=title.pk).exists()
+        response = admin_client.delete(
+            f'/api/v1/users/{busy[2].username}/')
+        assert response.status_code == 204
+        assert not Job.objects.exists()
+
+    def test_large_delete_is_a_job(self, admin_client, settings, busy):
+        settings.DELETE_ASYNC_THRESHOLD = 3
+        title, _, author, _, _ = busy
+        response = admin_client.delete(f'/api/v1/users/{author.username}/')
+        assert response.status_code == 202, (
+            'Проверьте, что большое удаление уходит в фоновую задачу'
+        )
+        assert User.objects.filter(pk=author.pk).exists()
+        status_url = response['Location']
+        assert response.data['status'] == Job.PENDING
+        assert admin_client.get(status_url).data['status'] == Job.PENDING
+
+        call_command('run_worker', '--once')
+        assert admin_client.get(status_url).data['status'] == Job.DONE
+        assert not User.objects.filter(pk=author.pk).exists()
+        title.refresh_from_db()
+        assert title.rating_count == 1
+
+    def test_job_status_is_for_admins(self, user_client, admin_client,
+                                      settings, busy):
+        settings.DELETE_ASYNC_THRESHOLD = 1
+        response = admin_client.delete(f'/api/v1/titles/{busy[0].id}/')
+        assert response.status_code == 202
+        assert user_client.get(response['Location']).status_code == 403
+
+    def test_collector_mode(self, admin_client, settings, busy):
+        settings.BULK_DELETE = False
+        response = admin_client.delete(f'/api/v1/titles/{busy[0].id}/')
+        assert response.status_code == 204
+        assert Comment.objects.count() == 2
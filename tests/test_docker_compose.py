@@ -27,3 +27,12 @@ class TestDockerfileCompose:
         assert re.search(r'image:\s+([a-zA-Z0-9]+)\/([a-zA-Z0-9_\.])+(\:[a-zA-Z0-9_-]+)?', docker_compose), (
             'Проверьте, что добавили сборку контейнера из образа на вашем DockerHub в файл docker-compose.yaml'
         )
+
+    def test_worker_shares_the_cache(self):
+        with open(os.path.join(infra_dir_path, 'docker-compose.yaml')) as f:
+            docker_compose = f.read()
+        mounts = re.findall(r'-\s+(\w+):/var/tmp/yamdb_cache/?', docker_compose)
+        assert len(mounts) == 2 and len(set(mounts)) == 1, (
+            'Проверьте, что web и worker используют общий том для кэша: '
+            'фоновые задачи сбрасывают в нём версии моделей и пользователей'
+        )
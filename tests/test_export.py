@@ -0,0 +1,56 @@
+import csv
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+
+from .fixtures.fixture_data import make_reviews, make_titles
+
+
+def content(response):
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+class TestExport:
+
+    def test_titles_ndjson(self, admin_client):
+        first, second = make_titles(2)
+        second.genre.clear()
+        make_reviews(first, 2)
+        response = admin_client.get('/api/v1/export/titles.ndjson')
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'application/x-ndjson'
+        rows = [json.loads(line) for line in content(response).splitlines()]
+        assert [row['id'] for row in rows] == [first.id, second.id]
+        assert rows[0]['genre'] == sorted(
+            first.genre.values_list('slug', flat=True))
+        assert rows[0]['category'] == first.category.slug
+        first.refresh_from_db()
+        assert rows[0]['rating'] == first.rating
+        assert rows[1]['genre'] == []
+
+    def test_comments_csv(self, admin_client, title):
+        review = make_reviews(title, 1, comments=2)[0]
+        response = admin_client.get('/api/v1/export/comments.csv')
+        assert response.status_code == 200
+        rows = list(csv.DictReader(io.StringIO(content(response))))
+        assert len(rows) == 2
+        assert rows[0]['review_id'] == str(review.id)
+        assert rows[0]['title_id'] == str(title.id)
+        assert rows[0]['author'] == review.author.username
+
+    def test_admin_only(self, guest_client, user_client):
+        url = '/api/v1/export/reviews.ndjson'
+        assert guest_client.get(url).status_code == 401
+        assert user_client.get(url).status_code == 403
+
+    def test_command(self, tmp_path, title):
+        make_reviews(title, 3)
+        output = tmp_path / 'reviews.csv'
+        call_command('export_data', 'reviews', '--format', 'csv',
+                     '--output', str(output))
+        with open(output, encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        assert [int(row['title_id']) for row in rows] == [title.id] * 3
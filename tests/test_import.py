@@ -0,0 +1,88 @@
+import pytest
+from django.core.management import CommandError, call_command
+from reviews.models import Category, Comment, Genre, Review, Title, User
+
+
+def write_csv(tmp_path, name, header, rows):
+    path = tmp_path / name
+    lines = [header] + [','.join(map(str, row)) for row in rows]
+    path.write_text('\n'.join(lines) + '\n')
+    return str(path)
+
+
+@pytest.mark.django_db
+class TestCsvImport:
+
+    def test_load_dataset(self, tmp_path):
+        call_command('load_category', path=write_csv(
+            tmp_path, 'category.csv', 'id,name,slug',
+            [(1, 'Фильм', 'movie'), (2, 'Книга', 'book')]))
+        call_command('load_genre', path=write_csv(
+            tmp_path, 'genre.csv', 'id,name,slug',
+            [(1, 'Драма', 'drama'), (2, 'Комедия', 'comedy')]))
+        call_command('load_user', path=write_csv(
+            tmp_path, 'users.csv',
+            'id,username,email,role,first_name,last_name',
+            [(i, f'user{i}', f'user{i}@yamdb.fake', 'user', '', '')
+             for i in range(1, 8)]))
+        call_command(
+            'load_title', chunk_size=2,
+            path=write_csv(tmp_path, 'titles.csv', 'id,name,year,category',
+                           [(i, f'Title {i}', 1990 + i, 1 + i % 2)
+                            for i in range(1, 6)]),
+            path2=write_csv(tmp_path, 'genre_title.csv',
+                            'id,title_id,genre_id',
+                            [(1, 1, 1), (2, 1, 2), (3, 2, 2)]))
+        call_command('load_review', chunk_size=3, path=write_csv(
+            tmp_path, 'review.csv',
+            'id,title_id,text,author,score,pub_date',
+            [(i, 1, f'text {i}', i, i, '2019-09-24T21:08:21.567Z')
+             for i in range(1, 6)]))
+        call_command('load_comment', path=write_csv(
+            tmp_path, 'comments.csv', 'id,review_id,text,author,pub_date',
+            [(1, 1, 'comment', 2, '2019-09-24T21:08:21.567Z')]))
+
+        assert Category.objects.count() == 2
+        assert Genre.objects.count() == 2
+        assert User.objects.count() == 7
+        genres = Title.objects.get(pk=1).genre.order_by('slug')
+        assert list(genres.values_list('slug', flat=True)) == [
+            'comedy', 'drama']
+        assert Review.objects.count() == 5
+        assert Comment.objects.get().pub_date.year == 2019, (
+            'Проверьте, что дата публикации берётся из csv файла'
+        )
+        title = Title.objects.get(pk=1)
+        assert (title.rating_sum, title.rating_count) == (15, 5)
+        # sequences are reset past the imported ids
+        assert Category.objects.create(name='Музыка', slug='music').pk == 3
+
+    def test_import_dataset(self, tmp_path):
+        write_csv(tmp_path, 'category.csv', 'id,name,slug',
+                  [(1, 'Фильм', 'movie')])
+        write_csv(tmp_path, 'genre.csv', 'id,name,slug',
+                  [(1, 'Драма', 'drama')])
+        write_csv(tmp_path, 'users.csv',
+                  'id,username,email,role,first_name,last_name',
+                  [(1, 'user1', 'user1@yamdb.fake', 'user', '', '')])
+        write_csv(tmp_path, 'titles.csv', 'id,name,year,category',
+                  [(1, 'Title', 2000, 1)])
+        write_csv(tmp_path, 'genre_title.csv', 'id,title_id,genre_id',
+                  [(1, 1, 1)])
+        write_csv(tmp_path, 'review.csv',
+                  'id,title_id,text,author,score,pub_date',
+                  [(1, 1, 'text', 1, 7, '2019-09-24T21:08:21.567Z')])
+
+        call_command('import_dataset', dir=str(tmp_path))
+
+        title = Title.objects.get()
+        assert title.genre.get().slug == 'drama'
+        assert title.rating == 7
+        assert not Comment.objects.exists()
+
+    def test_missing_foreign_key(self, tmp_path):
+        with pytest.raises(CommandError):
+            call_command('load_title', path=write_csv(
+                tmp_path, 'titles.csv', 'id,name,year,category',
+                [(1, 'Title', 2000, 42)]))
+        assert not Title.objects.exists()
@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+from jobs.models import Job
+from jobs.queue import (claim, enqueue, execute, job, registry,
+                        run_pending)
+
+
+@pytest.fixture
+def flaky():
+    calls = []
+
+    @job('flaky', max_attempts=2)
+    def handler(fail):
+        calls.append(fail)
+        if fail:
+            raise RuntimeError('boom')
+
+    yield calls
+    registry.pop('flaky')
+
+
+@pytest.mark.django_db
+class TestJobs:
+
+    @pytest.fixture(autouse=True)
+    def locmem_email(self, settings):
+        settings.EMAIL_BACKEND = (
+            'django.core.mail.backends.locmem.EmailBackend')
+
+    def test_signup_enqueues_email(self, client):
+        response = client.post('/api/v1/auth/signup/', data={
+            'username': 'newbie', 'email': 'newbie@ya.ru'})
+        assert response.status_code == 200
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что письмо отправляется не в запросе, а в фоне'
+        )
+        assert Job.objects.filter(
+            name='send_confirmation_email', status=Job.PENDING).count() == 1
+
+        call_command('run_worker', '--once')
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == ['newbie@ya.ru']
+        assert 'newbie' in mail.outbox[0].body
+        assert Job.objects.get().status == Job.DONE
+
+    def test_emails_are_sent_in_batches(self):
+        for i in range(3):
+            enqueue('send_confirmation_email',
+                    username=f'user{i}', email=f'u{i}@ya.ru', code='x')
+        assert run_pending() == 3
+        assert len(mail.outbox) == 3
+        assert not Job.objects.exclude(status=Job.DONE).exists()
+
+    def test_retry_with_backoff(self, flaky):
+        enqueue('flaky', fail=True)
+        enqueue('flaky', fail=False)
+        assert run_pending() == 2
+        assert sorted(flaky) == [False, True]
+
+        failed = Job.objects.get(status=Job.PENDING)
+        assert failed.attempts == 1
+        assert 'boom' in failed.last_error
+        assert failed.run_at > timezone.now()
+        assert Job.objects.filter(status=Job.DONE).count() == 1
+        assert run_pending() == 0, 'Повтор не должен запускаться до run_at'
+
+        Job.objects.update(run_at=timezone.now())
+        assert run_pending() == 1
+        failed.refresh_from_db()
+        assert failed.status == Job.FAILED
+        assert failed.attempts == 2
+
+    def test_expired_lease_is_reclaimed(self, flaky):
+        stuck = enqueue('flaky', fail=False)
+        Job.objects.filter(pk=stuck.pk).update(
+            status=Job.RUNNING, attempts=1,
+            locked_until=timezone.now() - timedelta(seconds=1))
+        assert run_pending() == 1
+        stuck.refresh_from_db()
+        assert stuck.status == Job.DONE
+        assert stuck.attempts == 2
+
+    def test_expired_lease_on_last_attempt_fails(self, flaky):
+        stuck = enqueue('flaky', fail=False)
+        Job.objects.filter(pk=stuck.pk).update(
+            status=Job.RUNNING, attempts=2,
+            locked_until=timezone.now() - timedelta(seconds=1))
+        assert run_pending() == 0
+        stuck.refresh_from_db()
+        assert stuck.status == Job.FAILED, (
+            'Проверьте, что задача, убивающая обработчик, не повторяется '
+            'бесконечно'
+        )
+        assert flaky == []
+
+    def test_reclaimed_job_is_not_run_twice(self, flaky):
+        enqueue('flaky', fail=False)
+        claimed, = claim(10)
+        # another worker took the job over after the lease ran out
+        Job.objects.update(attempts=claimed.attempts + 1)
+        execute(registry['flaky'], [claimed])
+        assert flaky == []
+        assert Job.objects.get().status == Job.RUNNING
@@ -0,0 +1,86 @@
+import io
+
+import pytest
+from django.core.management import call_command
+from reviews.models import Review, Title, User
+
+from .fixtures.fixture_data import make_reviews, make_titles
+from .query_budget import assert_query_budget
+
+URL = '/api/v1/titles/leaderboard/'
+
+
+def rate(title, *scores):
+    for score in scores:
+        n = User.objects.count()
+        author = User.objects.create(username=f'voter{n}',
+                                     email=f'voter{n}@yamdb.fake')
+        Review.objects.create(title=title, author=author, text='t',
+                              score=score)
+
+
+def ranked(client, query=''):
+    response = client.get(URL + query)
+    assert response.status_code == 200
+    return [row['id'] for row in response.json()]
+
+
+@pytest.mark.django_db
+class TestLeaderboard:
+
+    @pytest.fixture
+    def titles(self, settings):
+        settings.RATING_PRIOR_MEAN = 5
+        settings.RATING_PRIOR_WEIGHT = 2
+        one_ten, many_nines, mediocre, unrated = make_titles(4)
+        rate(one_ten, 10)
+        rate(many_nines, 9, 9, 9, 9, 9, 9)
+        rate(mediocre, 6, 5)
+        return one_ten, many_nines, mediocre, unrated
+
+    def test_ranks_by_weighted_rating(self, guest_client, titles):
+        one_ten, many_nines, mediocre, _ = titles
+        assert ranked(guest_client) == [
+            many_nines.id, one_ten.id, mediocre.id], (
+            'Проверьте, что одна оценка 10 не обгоняет много оценок 9, '
+            'а произведения без оценок не попадают в рейтинг'
+        )
+        first = guest_client.get(URL).json()[0]
+        assert first['weighted_rating'] == round((54 + 10) / 8, 2)
+        assert first['rating_count'] == 6
+        assert ranked(guest_client, '?limit=1') == [many_nines.id]
+        assert guest_client.get(URL + '?limit=0').status_code == 400
+
+    def test_follows_review_writes(self, guest_client, titles):
+        one_ten, many_nines, _, unrated = titles
+        rate(unrated, 10, 10, 10, 10, 10, 10)
+        assert ranked(guest_client, '?limit=1') == [unrated.id]
+        Review.objects.filter(title=unrated).delete()
+        unrated.refresh_from_db()
+        assert unrated.weighted_rating is None
+        assert ranked(guest_client, '?limit=1') == [many_nines.id]
+
+    def test_filters(self, guest_client, titles):
+        one_ten, many_nines, mediocre, _ = titles
+        Title.objects.filter(pk=mediocre.pk).update(year=1990)
+        genre = one_ten.genre.first().slug
+        assert ranked(guest_client, f'?genre={genre}') == [one_ten.id]
+        assert ranked(guest_client,
+                      f'?category={many_nines.category.slug}') == [
+            many_nines.id]
+        assert ranked(guest_client, '?year=1990') == [mediocre.id]
+
+    def test_rebuild_keeps_weighted_rating(self, titles):
+        one_ten = titles[0]
+        Title.objects.update(weighted_rating=None)
+        call_command('rebuild_histograms', stdout=io.StringIO())
+        one_ten.refresh_from_db()
+        assert one_ten.weighted_rating == pytest.approx((10 + 10) / 3)
+
+    def test_query_budget(self, guest_client):
+        make_reviews(make_titles(1)[0], 2)
+        assert_query_budget(
+            lambda: guest_client.get(URL),
+            grow=lambda step: make_reviews(make_titles(3)[0], 2),
+            budget=1,
+            label=f'GET {URL}')
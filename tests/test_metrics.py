@@ -0,0 +1,47 @@
+import pytest
+from prometheus_client import REGISTRY
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.django_db
+class TestMetrics:
+
+    def test_request_is_recorded_per_action(self, guest_client, title):
+        labels = {'view': 'TitleViewSet.retrieve', 'method': 'GET',
+                  'status': '200'}
+        before = sample('yamdb_http_request_duration_seconds_count',
+                        **labels)
+        queries = sample('yamdb_http_db_queries_sum', **labels)
+        guest_client.get(f'/api/v1/titles/{title.id}/')
+        assert sample('yamdb_http_request_duration_seconds_count',
+                      **labels) == before + 1
+        assert sample('yamdb_http_db_queries_sum', **labels) > queries
+        assert sample('yamdb_http_response_size_bytes_count',
+                      **labels) >= 1
+
+    def test_unmatched_and_function_views(self, guest_client):
+        guest_client.get('/api/v1/no-such-page/')
+        assert sample('yamdb_http_request_duration_seconds_count',
+                      view='unmatched', method='GET', status='404') >= 1
+        guest_client.post('/api/v1/auth/token/', data={})
+        assert sample('yamdb_http_request_duration_seconds_count',
+                      view='obtain_token', method='POST', status='400') >= 1
+
+    def test_user_cache_lookups(self, user_client):
+        hits = sample('yamdb_user_cache_lookups_total', result='hit')
+        user_client.get('/api/v1/users/me/')
+        user_client.get('/api/v1/users/me/')
+        assert sample('yamdb_user_cache_lookups_total',
+                      result='hit') == hits + 1
+
+    def test_metrics_endpoint(self, guest_client):
+        guest_client.get('/api/v1/categories/')
+        response = guest_client.get('/metrics')
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain')
+        assert (b'yamdb_http_request_duration_seconds_bucket{'
+                b'le="0.005",method="GET",status="200",'
+                b'view="CategoryViewSet.list"}') in response.content
@@ -0,0 +1,82 @@
+import pytest
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+from reviews.models import Comment, Review
+
+DUPLICATE_REVIEW = ('Пользователь может создать только один отзыв '
+                    'для каждого произведения')
+
+
+def post(client, url, data):
+    """POST and return the response with the statements it ran.
+
+    Savepoints come from the test transaction wrapping Review.save()'s
+    atomic block and are not round-trips in production.
+    """
+    with CaptureQueriesContext(connection) as context:
+        response = client.post(url, data=data)
+    statements = [query['sql'] for query in context.captured_queries
+                  if 'SAVEPOINT' not in query['sql']]
+    return response, statements
+
+
+@pytest.mark.django_db
+class TestNestedWrites:
+
+    @pytest.fixture(autouse=True)
+    def cached_user(self, user_client):
+        user_client.get('/api/v1/users/me/')
+
+    def test_create_review(self, user_client, title):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        response, statements = post(
+            user_client, url, {'text': 'Отзыв', 'score': 5})
+        assert response.status_code == 201
+        # title lookup, insert, rating update
+        assert len(statements) == 3, '\n'.join(statements)
+
+    def test_duplicate_review(self, user_client, title):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        user_client.post(url, data={'text': 'Отзыв', 'score': 5})
+        response, statements = post(
+            user_client, url, {'text': 'Ещё один', 'score': 1})
+        assert response.status_code == 400
+        assert response.data == {'detail': DUPLICATE_REVIEW}
+        # title lookup, insert; without PostgreSQL's constraint name
+        # also the check that the review exists
+        assert len(statements) == (
+            2 if connection.vendor == 'postgresql' else 3), (
+            '\n'.join(statements))
+        title.refresh_from_db()
+        assert (title.rating_count, title.rating) == (1, 5)
+
+    def test_other_integrity_errors_are_not_duplicates(
+            self, user_client, title, monkeypatch):
+        def fail(*args, **kwargs):
+            raise IntegrityError('FOREIGN KEY constraint failed')
+
+        monkeypatch.setattr(Review, 'save', fail)
+        with pytest.raises(IntegrityError):
+            user_client.post(f'/api/v1/titles/{title.id}/reviews/',
+                             data={'text': 'Отзыв', 'score': 5})
+
+    def test_review_of_missing_title(self, user_client):
+        response, _ = post(
+            user_client, '/api/v1/titles/0/reviews/',
+            {'text': 'Отзыв', 'score': 5})
+        assert response.status_code == 404
+        assert not Review.objects.exists()
+
+    def test_create_comment(self, user_client, review):
+        url = (f'/api/v1/titles/{review.title_id}/reviews/'
+               f'{review.id}/comments/')
+        response, statements = post(user_client, url, {'text': 'Коммент'})
+        assert response.status_code == 201
+        # review lookup, insert, review.modified update
+        assert len(statements) == 3, '\n'.join(statements)
+
+    def test_comment_under_wrong_title(self, user_client, review):
+        url = f'/api/v1/titles/0/reviews/{review.id}/comments/'
+        response, _ = post(user_client, url, {'text': 'Коммент'})
+        assert response.status_code == 404
+        assert not Comment.objects.exists()
@@ -0,0 +1,53 @@
+import pytest
+from reviews.models import Review
+
+from .fixtures.fixture_data import make_reviews
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+
+    def walk(self, client, url):
+        ids, pages = [], 0
+        while url:
+            response = client.get(url)
+            assert response.status_code == 200
+            assert 'count' not in response.data
+            ids.extend(item['id'] for item in response.data['results'])
+            url = response.data['next']
+            pages += 1
+        return ids, pages
+
+    def test_walks_all_reviews_in_order(self, guest_client, title):
+        make_reviews(title, 23)
+        # Collapse timestamps so that only the id breaks ties.
+        Review.objects.filter(pk__lte=Review.objects.order_by('pk')[10].pk
+                              ).update(pub_date='2021-01-01T00:00:00Z')
+        expected = list(Review.objects.order_by('-pub_date', '-pk')
+                        .values_list('pk', flat=True))
+        ids, pages = self.walk(
+            guest_client,
+            f'/api/v1/titles/{title.id}/reviews/?pagination=cursor')
+        assert ids == expected
+        assert pages == 3
+
+    def test_previous_link(self, guest_client, title):
+        make_reviews(title, 15)
+        url = f'/api/v1/titles/{title.id}/reviews/?pagination=cursor'
+        first = guest_client.get(url).data
+        assert first['previous'] is None
+        second = guest_client.get(first['next']).data
+        back = guest_client.get(second['previous']).data
+        assert back['results'] == first['results']
+
+    def test_page_number_still_default(self, guest_client, title):
+        make_reviews(title, 12)
+        response = guest_client.get(
+            f'/api/v1/titles/{title.id}/reviews/?page=2')
+        assert response.data['count'] == 12
+        assert len(response.data['results']) == 2
+
+    def test_invalid_cursor(self, guest_client, title):
+        response = guest_client.get(
+            f'/api/v1/titles/{title.id}/reviews/?cursor=broken')
+        assert response.status_code == 404
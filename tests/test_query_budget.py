@@ -0,0 +1,43 @@
+import pytest
+
+from .fixtures.fixture_data import make_comments, make_reviews, make_titles
+from .query_budget import assert_query_budget
+
+
+@pytest.mark.django_db
+class TestQueryBudget:
+    """Listing endpoints must run a constant number of queries."""
+
+    def test_title_list(self, guest_client):
+        make_titles(3)
+        assert_query_budget(
+            lambda: guest_client.get('/api/v1/titles/'),
+            grow=lambda step: make_titles(5),
+            budget=2,
+            label='GET /api/v1/titles/')
+
+    def test_title_detail(self, guest_client, title):
+        assert_query_budget(
+            lambda: guest_client.get(f'/api/v1/titles/{title.id}/'),
+            grow=lambda step: title.genre.add(*make_titles(1)[0].genre.all()),
+            budget=3,
+            label='GET /api/v1/titles/{id}/')
+
+    def test_review_list(self, guest_client, title):
+        make_reviews(title, 2)
+        assert_query_budget(
+            lambda: guest_client.get(f'/api/v1/titles/{title.id}/reviews/'),
+            grow=lambda step: make_reviews(title, 4),
+            budget=3,
+            label='GET /api/v1/titles/{id}/reviews/')
+
+    def test_comment_list(self, user_client, review):
+        url = (f'/api/v1/titles/{review.title_id}/reviews/'
+               f'{review.id}/comments/')
+        make_comments(review, 2)
+        user_client.get(url)  # the requesting user is cached from now on
+        assert_query_budget(
+            lambda: user_client.get(url),
+            grow=lambda step: make_comments(review, 3),
+            budget=3,
+            label=f'GET {url}')
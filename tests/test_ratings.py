@@ -0,0 +1,120 @@
+import io
+
+import pytest
+from django.core.management import call_command
+from reviews.models import Review, Title, User
+from reviews.models.title import SCORE_BUCKETS
+from reviews.ratings import histogram_median
+
+
+@pytest.fixture
+def authors():
+    return [User.objects.create(username=f'user{i}', email=f'u{i}@ya.ru')
+            for i in range(3)]
+
+
+def refreshed(title):
+    title.refresh_from_db()
+    return title.rating_sum, title.rating_count, title.rating
+
+
+def histogram(title):
+    title.refresh_from_db()
+    return {score: count for score, count in enumerate(
+        (getattr(title, bucket) for bucket in SCORE_BUCKETS), start=1)
+        if count}
+
+
+@pytest.mark.django_db
+class TestStoredRating:
+
+    def test_create_update_delete(self, title, authors):
+        first = Review.objects.create(
+            title=title, author=authors[0], text='a', score=4)
+        Review.objects.create(
+            title=title, author=authors[1], text='b', score=9)
+        assert refreshed(title) == (13, 2, 6.5), (
+            'Проверьте, что рейтинг пересчитывается при создании отзыва'
+        )
+
+        first = Review.objects.get(pk=first.pk)
+        first.score = 10
+        first.save()
+        assert refreshed(title) == (19, 2, 9.5), (
+            'Проверьте, что рейтинг пересчитывается при изменении оценки'
+        )
+
+        first.delete()
+        assert refreshed(title) == (9, 1, 9.0)
+
+        Review.objects.all().delete()
+        assert refreshed(title) == (0, 0, None), (
+            'Проверьте, что рейтинг сбрасывается после удаления всех отзывов'
+        )
+
+    def test_cascade_from_author(self, title, authors):
+        for score, author in zip((2, 6, 7), authors):
+            Review.objects.create(
+                title=title, author=author, text='t', score=score)
+        authors[2].delete()
+        assert refreshed(title) == (8, 2, 4.0)
+
+    def test_rebuild_command(self, title, authors):
+        for score, author in zip((1, 2, 6), authors):
+            Review.objects.create(
+                title=title, author=author, text='t', score=score)
+        Title.objects.update(rating_sum=0, rating_count=0, rating=None)
+        call_command('rebuild_ratings', batch_size=1)
+        assert refreshed(title) == (9, 3, 3.0)
+
+
+@pytest.mark.django_db
+class TestScoreHistogram:
+
+    def test_follows_review_writes(self, title, authors):
+        first = Review.objects.create(
+            title=title, author=authors[0], text='a', score=4)
+        Review.objects.create(
+            title=title, author=authors[1], text='b', score=4)
+        assert histogram(title) == {4: 2}
+
+        first = Review.objects.get(pk=first.pk)
+        first.score = 9
+        first.save()
+        assert histogram(title) == {4: 1, 9: 1}, (
+            'Проверьте, что гистограмма обновляется при изменении оценки'
+        )
+        first.delete()
+        assert histogram(title) == {4: 1}
+
+    def test_stats_endpoint(self, guest_client, title, authors):
+        for score, author in zip((2, 9, 10), authors):
+            Review.objects.create(
+                title=title, author=author, text='t', score=score)
+        response = guest_client.get(f'/api/v1/titles/{title.id}/stats/')
+        assert response.status_code == 200
+        assert response.json() == {
+            'count': 3, 'mean': 7.0, 'median': 9.0,
+            'histogram': {str(score): int(score in (2, 9, 10))
+                          for score in range(1, 11)}}
+        assert guest_client.get(
+            '/api/v1/titles/0/stats/').status_code == 404
+        assert guest_client.get(
+            '/api/v1/titles/abc/stats/').status_code == 404
+
+    def test_median(self):
+        assert histogram_median({1: 1, 2: 1}, 2) == 1.5
+        assert histogram_median({3: 2, 8: 1}, 3) == 3
+        assert histogram_median({}, 0) is None
+
+    def test_rebuild_command(self, title, authors):
+        empty = Title.objects.create(name='Пусто', year=2000, score_5=3,
+                                     rating_count=3)
+        for score, author in zip((1, 1, 6), authors):
+            Review.objects.create(
+                title=title, author=author, text='t', score=score)
+        Title.objects.update(**{bucket: 0 for bucket in SCORE_BUCKETS})
+        call_command('rebuild_histograms', batch_size=1, stdout=io.StringIO())
+        assert histogram(title) == {1: 2, 6: 1}
+        assert refreshed(title) == (8, 3, 8 / 3)
+        assert histogram(empty) == {} and refreshed(empty) == (0, 0, None)
@@ -0,0 +1,74 @@
+import io
+import json
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from rest_framework.renderers import JSONRenderer
+from reviews.models import Title
+
+from .fixtures.fixture_data import make_reviews, make_titles
+
+
+@pytest.fixture
+def catalogue():
+    titles = make_titles(11)
+    titles[0].description = 'Описание\u2028с "кавычками"'
+    titles[0].save()
+    Title.objects.create(name='Без категории', year=1999)
+    make_reviews(titles[0], 3, comments=1)
+    return titles
+
+
+def both_paths(client, settings, url):
+    """Return the fast response and the serializer response data."""
+    cache.clear()
+    settings.FAST_READ_PATH = True
+    fast = client.get(url)
+    cache.clear()
+    settings.FAST_READ_PATH = False
+    slow = client.get(url)
+    assert fast.status_code == slow.status_code == 200
+    return fast.content, slow
+
+
+@pytest.mark.django_db
+class TestReadPath:
+
+    @pytest.mark.parametrize('query', [
+        '', '?page=2', '?year=2000', '?name=title', '?search=Описание'])
+    def test_title_list_is_byte_identical(self, guest_client, settings,
+                                          catalogue, query):
+        content, slow = both_paths(guest_client, settings,
+                                   f'/api/v1/titles/{query}')
+        assert content == JSONRenderer().render(slow.data), (
+            'Проверьте, что быстрый путь отдаёт те же байты, '
+            'что и сериализатор'
+        )
+        assert content == slow.content
+
+    def test_title_list_with_genre_filter(self, guest_client, settings,
+                                          catalogue):
+        slug = catalogue[1].genre.first().slug
+        content, slow = both_paths(guest_client, settings,
+                                   f'/api/v1/titles/?genre={slug}')
+        assert content == JSONRenderer().render(slow.data)
+        assert [genre['slug'] for genre in json.loads(content)[
+            'results'][0]['genre']] == sorted(
+                catalogue[1].genre.values_list('slug', flat=True))
+
+    @pytest.mark.parametrize('query', ['', '?pagination=cursor'])
+    def test_review_list_is_byte_identical(self, guest_client, settings,
+                                           catalogue, query):
+        url = f'/api/v1/titles/{catalogue[0].id}/reviews/{query}'
+        content, slow = both_paths(guest_client, settings, url)
+        assert content == JSONRenderer().render(slow.data)
+
+    def test_benchmark_read_path(self, catalogue, tmp_path):
+        output = tmp_path / 'read-path.json'
+        call_command('benchmark_read_path', '--repeat', '2',
+                     '--output', str(output), stderr=io.StringIO())
+        report = json.loads(output.read_text())
+        assert {item['list'] for item in report['results']} == {
+            'titles', 'reviews'}
+        assert all(item['identical'] for item in report['results'])
@@ -0,0 +1,84 @@
+import pytest
+from api.replicas import ReplicaRouter, health
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+from .fixtures.fixture_data import make_reviews
+
+REPLICA = 'replica1'
+
+
+@pytest.fixture
+def replica(settings):
+    """A second connection to the test database, acting as a replica."""
+    connections.databases[REPLICA] = dict(
+        connections['default'].settings_dict)
+    settings.DATABASE_REPLICAS = [REPLICA]
+    settings.REPLICA_MAX_LAG = 0
+    health.reset()
+    yield connections[REPLICA]
+    connections[REPLICA].close()
+    if hasattr(connections._connections, REPLICA):
+        delattr(connections._connections, REPLICA)
+    del connections.databases[REPLICA]
+    health.reset()
+
+
+def served_by(client, method, url, **kwargs):
+    with CaptureQueriesContext(connections['default']) as primary, \
+            CaptureQueriesContext(connections[REPLICA]) as replica:
+        response = getattr(client, method)(url, **kwargs)
+    return response, len(primary), len(replica)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestReplicaRouting:
+
+    def test_reads_go_to_replica(self, replica, guest_client, title):
+        make_reviews(title, 2)
+        response, primary, replica_queries = served_by(
+            guest_client, 'get', f'/api/v1/titles/{title.id}/reviews/')
+        assert response.status_code == 200
+        assert len(response.data['results']) == 2
+        assert primary == 0 and replica_queries > 0
+
+    def test_author_is_pinned_after_write(self, replica, user_client,
+                                          guest_client, title):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        response, _, replica_queries = served_by(
+            user_client, 'post', url, data={'text': 'Отзыв', 'score': 5})
+        assert response.status_code == 201
+        assert replica_queries == 0, 'Запись должна идти в основную базу'
+
+        response, primary, replica_queries = served_by(
+            user_client, 'get', url)
+        assert len(response.data['results']) == 1
+        assert replica_queries == 0 and primary > 0, (
+            'Проверьте, что автор читает свои записи из основной базы'
+        )
+        _, primary, replica_queries = served_by(
+            guest_client, 'get', f'/api/v1/titles/{title.id}/')
+        assert replica_queries > 0
+
+    def test_recent_writes_skip_lagging_replicas(self, replica, settings,
+                                                 guest_client, title):
+        settings.REPLICA_MAX_LAG = 60
+        response, primary, _ = served_by(
+            guest_client, 'get', f'/api/v1/titles/{title.id}/')
+        assert response.status_code == 200
+        assert primary > 0, (
+            'Ответ, который попадёт в кеш, должен строиться по основной '
+            'базе, пока реплика может отставать'
+        )
+
+    def test_fallback_to_primary(self, replica, guest_client, title,
+                                 tmp_path):
+        replica.settings_dict['NAME'] = str(tmp_path / 'missing' / 'db')
+        response = guest_client.get(f'/api/v1/titles/{title.id}/reviews/')
+        assert response.status_code == 200
+        assert health.checked[REPLICA][1] is False
+
+    def test_no_migrations_on_replicas(self, replica):
+        router = ReplicaRouter()
+        assert router.allow_migrate(REPLICA, 'reviews') is False
+        assert router.allow_migrate('default', 'reviews') is True
@@ -0,0 +1,64 @@
+import pytest
+from django.core.cache import cache
+from reviews.models import Category
+
+from .query_budget import query_budget
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+
+    def test_hit_skips_database(self, guest_client, title):
+        url = f'/api/v1/titles/{title.id}/'
+        assert guest_client.get(url)['X-Cache'] == 'MISS'
+        # Only the conditional GET validator lookup is left.
+        with query_budget(1, label='cached GET'):
+            response = guest_client.get(url)
+        assert response['X-Cache'] == 'HIT'
+        assert response.data['name'] == title.name
+
+    def test_query_params_are_part_of_key(self, guest_client):
+        Category.objects.create(name='Книга', slug='book')
+        guest_client.get('/api/v1/categories/')
+        response = guest_client.get('/api/v1/categories/?search=Фильм')
+        assert response['X-Cache'] == 'MISS'
+        assert response.data['count'] == 0
+
+    def test_write_invalidates(self, user_client, title):
+        url = f'/api/v1/titles/{title.id}/'
+        assert user_client.get(url).data['rating'] is None
+        response = user_client.post(
+            f'/api/v1/titles/{title.id}/reviews/',
+            data={'text': 'Отзыв', 'score': 8})
+        assert response.status_code == 201
+        response = user_client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.data['rating'] == 8
+
+    def test_role_is_part_of_key(self, guest_client, admin_client, title):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        guest_client.get(url)
+        assert admin_client.get(url)['X-Cache'] == 'MISS'
+        assert admin_client.get(url)['X-Cache'] == 'HIT'
+
+    def test_stale_while_revalidate(self, guest_client, title, settings,
+                                    monkeypatch):
+        settings.RESPONSE_CACHE_TIMEOUT = 0
+        settings.RESPONSE_CACHE_STALE_TIMEOUT = 60
+        url = f'/api/v1/titles/{title.id}/'
+        guest_client.get(url)
+        # The first reader after expiry takes the refresh lock and
+        # rebuilds the entry.
+        assert guest_client.get(url)['X-Cache'] == 'MISS'
+        # While another request holds the lock, readers get the stale copy.
+        monkeypatch.setattr('api.cache.cache.add', lambda *a, **kw: False)
+        with query_budget(1, label='stale GET'):
+            response = guest_client.get(url)
+        assert response['X-Cache'] == 'STALE'
+        assert response.data['id'] == title.id
+
+    def test_cache_is_sized_for_response_keys(self):
+        # a full cache culls random entries, pins and versions included
+        assert cache._max_entries >= 100000, (
+            'Проверьте, что у кэша задан MAX_ENTRIES с запасом'
+        )
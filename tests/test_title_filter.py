@@ -0,0 +1,48 @@
+import pytest
+from reviews.models import Category, Genre
+
+from .fixtures.fixture_data import make_titles
+from .query_budget import query_budget
+
+
+@pytest.mark.django_db
+class TestTitleFilter:
+
+    def names(self, response):
+        assert response.status_code == 200, response.data
+        return sorted(item['name'] for item in response.data['results'])
+
+    def test_filters(self, guest_client):
+        first, second = make_titles(2)
+        genre = first.genre.first()
+        second.genre.add(genre)
+        url = '/api/v1/titles/'
+
+        response = guest_client.get(url, {'category': first.category.slug})
+        assert self.names(response) == [first.name]
+        response = guest_client.get(url, {'genre': genre.slug})
+        assert self.names(response) == [first.name, second.name]
+        response = guest_client.get(url, {'name': first.name[:3]})
+        assert self.names(response) == [first.name, second.name]
+        response = guest_client.get(url, {'name': first.name})
+        assert self.names(response) == [first.name]
+
+    def test_unknown_slug_is_rejected(self, guest_client):
+        make_titles(1)
+        response = guest_client.get('/api/v1/titles/', {'category': 'nope'})
+        assert response.status_code == 400
+        assert 'category' in response.data
+        response = guest_client.get('/api/v1/titles/', {'genre': 'nope'})
+        assert response.status_code == 400
+        assert 'genre' in response.data
+
+    def test_choices_are_cached_and_invalidated(self, guest_client):
+        make_titles(1)
+        guest_client.get('/api/v1/titles/', {'category': 'music'})
+        with query_budget(3, label='filtered title list'):
+            guest_client.get('/api/v1/titles/?category=music&genre=x')
+        Category.objects.create(name='Музыка', slug='music')
+        Genre.objects.create(name='Рок', slug='rock')
+        response = guest_client.get(
+            '/api/v1/titles/', {'category': 'music', 'genre': 'rock'})
+        assert self.names(response) == []
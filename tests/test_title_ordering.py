@@ -0,0 +1,73 @@
+import pytest
+from django.core.cache import cache
+from reviews.models import Review, Title, User
+
+from .fixtures.fixture_data import make_titles
+
+URL = '/api/v1/titles/'
+
+
+def rate(title, *scores):
+    for score in scores:
+        n = User.objects.count()
+        author = User.objects.create(username=f'voter{n}',
+                                     email=f'voter{n}@yamdb.fake')
+        Review.objects.create(title=title, author=author, text='t',
+                              score=score)
+
+
+@pytest.fixture
+def titles():
+    low, high, many, unrated = make_titles(4)
+    rate(low, 2)
+    rate(high, 9)
+    rate(many, 5, 6, 7)
+    Title.objects.filter(pk=low.pk).update(year=2010)
+    Title.objects.filter(pk=unrated.pk).update(year=1990)
+    return low, high, many, unrated
+
+
+def ordered(client, query):
+    response = client.get(URL + query)
+    assert response.status_code == 200, response.data
+    return [item['id'] for item in response.data['results']]
+
+
+@pytest.mark.django_db
+class TestTitleOrdering:
+
+    @pytest.mark.parametrize('fast_path', [True, False])
+    def test_orderings(self, guest_client, settings, titles, fast_path):
+        settings.FAST_READ_PATH = fast_path
+        cache.clear()
+        low, high, many, unrated = [title.id for title in titles]
+        assert ordered(guest_client, '?ordering=rating') == [
+            low, many, high, unrated], (
+            'Проверьте, что произведения без оценок идут последними'
+        )
+        assert ordered(guest_client, '?ordering=-rating') == [
+            high, many, low, unrated]
+        assert ordered(guest_client, '?ordering=-review_count')[0] == many
+        assert ordered(guest_client, '?ordering=year') == [
+            unrated, high, many, low], (
+            'Проверьте, что при равных значениях порядок задаёт id'
+        )
+        assert ordered(guest_client, '?ordering=-year') == [
+            low, many, high, unrated], (
+            'Проверьте, что по убыванию id тоже идёт по убыванию'
+        )
+        assert ordered(guest_client, '?ordering=-name') == [
+            unrated, many, high, low]
+
+    def test_combines_with_filters(self, guest_client, titles):
+        low, high, many, _ = titles
+        assert ordered(guest_client, '?year=2000&ordering=-rating') == [
+            high.id, many.id]
+        genre = high.genre.first().slug
+        assert ordered(guest_client,
+                       f'?genre={genre}&ordering=review_count') == [high.id]
+
+    def test_unknown_field_is_rejected(self, guest_client, titles):
+        response = guest_client.get(URL + '?ordering=description')
+        assert response.status_code == 400
+        assert 'ordering' in response.data
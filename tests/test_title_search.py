@@ -0,0 +1,85 @@
+import threading
+
+import pytest
+from reviews.models import Title
+from reviews import search
+from reviews.search import index
+
+from .fixtures.fixture_data import make_titles
+
+
+@pytest.fixture(autouse=True)
+def fresh_index():
+    index.reset()
+
+
+@pytest.mark.django_db
+class TestTitleSearch:
+
+    def search(self, client, **params):
+        response = client.get('/api/v1/titles/', params)
+        assert response.status_code == 200, response.data
+        return [item['name'] for item in response.data['results']]
+
+    def test_ranked_prefix_search(self, guest_client):
+        Title.objects.create(name='Побег из Шоушенка', year=1994,
+                             description='Тюремная драма')
+        Title.objects.create(name='Зелёная миля', year=1999,
+                             description='Драма о побеге надежды')
+        Title.objects.create(name='Крёстный отец', year=1972)
+
+        assert self.search(guest_client, search='побе') == [
+            'Побег из Шоушенка', 'Зелёная миля'], (
+            'Совпадения в названии должны идти раньше совпадений в описании'
+        )
+        assert self.search(guest_client, search='драма тюрем') == [
+            'Побег из Шоушенка']
+        assert self.search(guest_client, search='вестерн') == []
+
+    def test_index_follows_writes(self, guest_client):
+        title = Title.objects.create(name='Старое имя', year=2000)
+        assert self.search(guest_client, search='стар') == ['Старое имя']
+        title.name = 'Новое имя'
+        title.save()
+        assert self.search(guest_client, search='стар') == []
+        assert self.search(guest_client, search='нов') == ['Новое имя']
+        title.delete()
+        assert self.search(guest_client, search='нов') == []
+
+    def test_combines_with_filters(self, guest_client):
+        first, second = make_titles(2)
+        Title.objects.filter(pk=second.pk).update(year=1990)
+        assert self.search(guest_client, search='title') == [
+            first.name, second.name]
+        assert self.search(guest_client, search='title', year=1990) == [
+            second.name]
+        assert self.search(guest_client, search='title',
+                           category=first.category.slug) == [first.name]
+
+    def test_cap_applies_after_filters(self, guest_client, monkeypatch):
+        monkeypatch.setattr(search, 'MAX_RESULTS', 2)
+        first, second, filtered = make_titles(3)
+        Title.objects.filter(pk=first.pk).update(name='Дюна')
+        Title.objects.filter(pk=second.pk).update(name='Дюна Дюна')
+        Title.objects.filter(pk=filtered.pk).update(
+            name='Замок', description='Дюна')
+        assert self.search(guest_client, search='дюна',
+                           category=filtered.category.slug) == ['Замок'], (
+            'Проверьте, что ограничение числа результатов применяется '
+            'после фильтров'
+        )
+        assert sorted(self.search(guest_client, search='дюна')) == [
+            'Дюна', 'Дюна Дюна']
+
+    def test_remove_waits_for_searches(self, guest_client):
+        title = Title.objects.create(name='Солярис', year=1972)
+        assert self.search(guest_client, search='соля') == ['Солярис']
+        with index.lock:
+            remover = threading.Thread(target=index.remove, args=(title.pk,))
+            remover.start()
+            remover.join(0.1)
+            assert remover.is_alive(), (
+                'Проверьте, что удаление из индекса ждёт идущий поиск'
+            )
+        remover.join()
+        assert title.pk not in index.documents
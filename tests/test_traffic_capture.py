@@ -0,0 +1,66 @@
+import json
+import pstats
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.fixture
+def capture(settings, tmp_path):
+    settings.TRAFFIC_CAPTURE_FILE = str(tmp_path / 'capture.jsonl')
+    settings.TRAFFIC_CAPTURE_RATE = 1
+    return tmp_path / 'capture.jsonl'
+
+
+def read(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+@pytest.mark.django_db
+class TestTrafficCapture:
+
+    def test_disabled_by_default(self, guest_client, tmp_path):
+        guest_client.get('/api/v1/titles/')
+        assert not list(tmp_path.iterdir())
+
+    def test_capture(self, capture, user, user_client, title):
+        user_client.get('/api/v1/titles/', {'year': 2000})
+        user_client.post(f'/api/v1/titles/{title.id}/reviews/',
+                         data={'text': 'Отзыв', 'score': 7}, format='json')
+        user_client.post('/api/v1/auth/token/', data={})
+        first, second = read(capture)
+        assert first['method'] == 'GET'
+        assert first['path'] == '/api/v1/titles/'
+        assert first['query'] == 'year=2000'
+        assert first['user_id'] == user.id
+        assert first['status'] == 200
+        assert second['method'] == 'POST'
+        assert json.loads(second['body']) == {'text': 'Отзыв', 'score': 7}
+        assert second['status'] == 201
+
+    def test_replay(self, capture, user_client, title, tmp_path):
+        user_client.get('/api/v1/titles/')
+        user_client.get(f'/api/v1/titles/{title.id}/')
+        user_client.get('/api/v1/users/me/')
+        user_client.post(f'/api/v1/titles/{title.id}/reviews/',
+                         data={'text': 'Отзыв', 'score': 7})
+        with open(capture, 'a') as f:
+            # a foreign JSONL line, like the entries of requests.jsonl
+            f.write('{"request_id": "x", "title": "t", "body": "b"}\n')
+
+        report_path = tmp_path / 'report.json'
+        call_command('replay_traffic', str(capture),
+                     '--profile-dir', str(tmp_path / 'profiles'),
+                     '--report', str(report_path))
+        report = json.loads(report_path.read_text())
+        assert report['replayed'] == 3
+        assert report['skipped_writes'] == 1
+        views = {item['view']: item for item in report['views']}
+        assert set(views) == {'TitleViewSet.list', 'TitleViewSet.retrieve',
+                              'UserViewSet.me'}
+        assert views['UserViewSet.me']['status_changed'] == 0, (
+            'Проверьте, что запрос воспроизводится от имени того же '
+            'пользователя'
+        )
+        stats = pstats.Stats(views['TitleViewSet.list']['profile'])
+        assert stats.total_calls > 0
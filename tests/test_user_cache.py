@@ -0,0 +1,80 @@
+import time
+
+import pytest
+from api.authentication import UserCache, user_cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from reviews.models import User
+
+
+def user_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    return response, [query['sql'] for query in context.captured_queries
+                      if 'FROM "reviews_user"' in query['sql']]
+
+
+class TestUserCache:
+
+    def test_lru_eviction(self):
+        cache = UserCache(maxsize=2, timeout=60)
+        cache.set(1, 'v', ('one',))
+        cache.set(2, 'v', ('two',))
+        assert cache.get(1, 'v') == ('one',)
+        cache.set(3, 'v', ('three',))
+        assert cache.get(2, 'v') is None, (
+            'Проверьте, что вытесняется давно не использованная запись'
+        )
+        assert cache.get(1, 'v') == ('one',)
+        assert cache.stats() == {'hits': 2, 'misses': 1, 'size': 2}
+
+    def test_ttl_and_version(self):
+        cache = UserCache(maxsize=2, timeout=0.01)
+        cache.set(1, 'v', ('one',))
+        assert cache.get(1, 'other') is None
+        time.sleep(0.02)
+        assert cache.get(1, 'v') is None
+
+
+@pytest.mark.django_db
+class TestCachedAuthentication:
+
+    def test_user_is_not_queried_twice(self, user_client):
+        url = '/api/v1/users/me/'
+        response, first = user_queries(user_client, url)
+        assert response.status_code == 200
+        assert len(first) == 1
+        response, second = user_queries(user_client, url)
+        assert response.status_code == 200
+        assert response.data['username'] == 'TestUser'
+        assert second == [], (
+            'Проверьте, что пользователь берётся из кеша'
+        )
+        assert user_cache.stats()['hits'] == 1
+
+    def test_role_change_by_admin(self, user, user_client, admin_client):
+        assert user_client.get('/api/v1/users/').status_code == 403
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'admin'})
+        assert response.status_code == 200
+        assert user_client.get('/api/v1/users/').status_code == 200, (
+            'Проверьте, что смена роли сразу сбрасывает кеш пользователя'
+        )
+
+    def test_profile_change_by_me(self, user_client):
+        url = '/api/v1/users/me/'
+        user_client.get(url)
+        response = user_client.patch(url, data={'bio': 'new bio'})
+        assert response.status_code == 200
+        assert user_client.get(url).data['bio'] == 'new bio'
+
+    def test_deactivated_user(self, user, user_client):
+        assert user_client.get('/api/v1/users/me/').status_code == 200
+        user.is_active = False
+        user.save()
+        assert user_client.get('/api/v1/users/me/').status_code == 401
+
+    def test_deleted_user(self, user, user_client):
+        user_client.get('/api/v1/users/me/')
+        User.objects.filter(pk=user.pk).get().delete()
+        assert user_client.get('/api/v1/users/me/').status_code == 401